@@ -0,0 +1,138 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Conversion benchmark.
+# Generates a synthetic catalog with a fixed seed, then runs the converter once per
+# output format and mode, reporting entries/sec, triples/sec, peak memory and output
+# size. Everything runs offline, so numbers from different commits can be compared
+# (use --json to keep them).
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import platform
+import subprocess
+import multiprocessing
+from os.path import dirname, realpath, relpath, join, getsize
+import rdflib
+from fzeri_synth import CatalogGenerator
+
+BASE_DIR = dirname(realpath(__file__))
+CONVERTER = join(BASE_DIR, "fzeri_schedaF_to_owl.py")
+
+MODES = {
+    'serial': [],
+    'stream': ['--stream'],
+    'jobs': ['--stream', '--jobs', str(multiprocessing.cpu_count())],
+    'single-entry': ['--stream', '--single-entry'],
+}
+
+
+def parse_options():
+    global options
+    parser = argparse.ArgumentParser(description='FZeri conversion benchmark.')
+    parser.add_argument('-n', '--entries', type=int, default=2000, help='Number of synthetic entries')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Seed of the synthetic catalog')
+    parser.add_argument('-f', '--formats', default="nt,turtle",
+                        help='Comma separated output formats to benchmark')
+    parser.add_argument('-m', '--modes', default="serial,stream,jobs",
+                        help='Comma separated modes to benchmark (%s)' % ",".join(sorted(MODES)))
+    parser.add_argument('-r', '--repeat', type=int, default=1, help='Runs per case, the fastest is kept')
+    parser.add_argument('--json', dest="json_file", help='Also write the results to this JSON file')
+    options = parser.parse_args()
+
+
+# Run the converter in a child process, returning wall time and peak RSS in kB
+def convert(args):
+    with open(os.devnull, 'w') as devnull:
+        start = time.time()
+        process = subprocess.Popen([sys.executable, CONVERTER] + args, stdout=devnull, stderr=devnull)
+        # wait4 gives the resource usage of this very child, pool workers included
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.time() - start
+    process.returncode = status
+    if status:
+        raise RuntimeError("conversion failed: %s" % " ".join(args))
+    return elapsed, usage.ru_maxrss
+
+
+def output_size(path):
+    if not os.path.isdir(path):
+        return getsize(path)
+    return sum(getsize(join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parse_options()
+    workdir = tempfile.mkdtemp(prefix="fzeri_benchmark")
+    try:
+        catalog = join(workdir, "catalog.xml")
+        with open(catalog, 'wb') as out:
+            CatalogGenerator(options.seed).write(out, options.entries)
+        # the converter writes relative to its own directory
+        output = relpath(join(workdir, "reference.nt"), BASE_DIR)
+        convert(['--stream', '-f', 'nt', '-o', output, catalog])
+        with open(join(workdir, "reference.nt")) as reference:
+            triples = sum(1 for _ in reference)
+        print "### %d entries, %d triples (%d bytes of XML)" % (options.entries, triples, getsize(catalog))
+        print "%-14s %-10s %9s %11s %12s %10s %12s" % ("mode", "format", "seconds", "entries/s", "triples/s",
+                                                     "peak MB", "output MB")
+        results = []
+        for mode in options.modes.split(","):
+            for fmt in options.formats.split(","):
+                target = join(workdir, "%s.%s" % (mode, fmt))
+                if mode == 'single-entry':
+                    os.mkdir(target)
+                runs = [convert(MODES[mode] + ['-f', fmt, '-o', relpath(target, BASE_DIR), catalog])
+                        for _ in range(options.repeat)]
+                seconds, rss = min(runs)
+                result = {
+                    'mode': mode,
+                    'format': fmt,
+                    'seconds': seconds,
+                    'entries_per_sec': options.entries / seconds,
+                    'triples_per_sec': triples / seconds,
+                    'peak_rss_kb': rss,
+                    'output_bytes': output_size(target),
+                }
+                results.append(result)
+                print "%-14s %-10s %9.2f %11.1f %12.1f %10.1f %12.1f" % (
+                    mode, fmt, seconds, result['entries_per_sec'], result['triples_per_sec'], rss / 1024.0,
+                    result['output_bytes'] / 1048576.0)
+                if os.path.isdir(target):
+                    shutil.rmtree(target)
+                else:
+                    os.unlink(target)
+        if options.json_file:
+            with open(options.json_file, 'w') as out:
+                json.dump({
+                    'revision': git_revision(),
+                    'python': platform.python_version(),
+                    'rdflib': rdflib.__version__,
+                    'entries': options.entries,
+                    'seed': options.seed,
+                    'triples': triples,
+                    'results': results,
+                }, out, indent=2)
+    finally:
+        shutil.rmtree(workdir)
+
+if __name__ == "__main__":
+    main()
+    sys.exit(0)
@@ -0,0 +1,89 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Progress report and checkpoints of the conversion of a source file.
+# With --file-jobs every source file is converted into its own part file; its
+# checkpoint records how many entries have been converted, the SERCD of the last
+# one and the length of the part file at that point, so that --resume can truncate
+# the part file and go on from the following entry.
+
+import os
+import json
+import time
+import tempfile
+
+# seconds between two progress lines of the same file
+PROGRESS_INTERVAL = 10
+
+
+def format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return "%d:%02d:%02d" % (hours, minutes, seconds)
+
+
+# Prints entries/sec and, when the source file is read incrementally (stream is
+# the file object being parsed), the estimated time left based on its position.
+class Progress:
+    def __init__(self, source_file, stream=None, entries=0):
+        self.source_file = source_file
+        self.stream = stream
+        self.size = os.path.getsize(source_file)
+        self.started = self.printed = time.time()
+        # entries converted by previous runs (--resume), not counted in the rate
+        self.skipped = self.entries = entries
+
+    def entry(self):
+        self.entries += 1
+        if time.time() - self.printed >= PROGRESS_INTERVAL:
+            self.report()
+
+    def rate(self):
+        elapsed = time.time() - self.started
+        return (self.entries - self.skipped) / elapsed if elapsed else 0.0
+
+    def report(self):
+        self.printed = time.time()
+        line = "### PROGRESS %s: %d entries, %.1f entries/s" % (self.source_file, self.entries, self.rate())
+        if self.stream is not None and self.size:
+            position = min(self.stream.tell(), self.size)
+            done = float(position) / self.size
+            elapsed = self.printed - self.started
+            if done:
+                line += ", %d%%, ETA %s" % (100 * done, format_seconds(elapsed * (1 - done) / done))
+        print line
+
+    def done(self):
+        print "### DONE %s: %d entries in %s, %.1f entries/s" % (
+            self.source_file, self.entries, format_seconds(time.time() - self.started), self.rate())
+
+
+# JSON checkpoint file, replaced atomically on every save
+class Checkpoint:
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path) as source:
+                return json.load(source)
+        except IOError:
+            return None
+
+    def save(self, state):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        with os.fdopen(fd, "w") as out:
+            json.dump(state, out)
+            out.flush()
+            os.fsync(out.fileno())
+        os.rename(temp_path, self.path)
+
+    def remove(self):
+        if os.path.isfile(self.path):
+            os.unlink(self.path)
@@ -0,0 +1,202 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Compressed catalog and output files.
+# Source files are recognized by their leading bytes and decompressed while they are
+# parsed; output files are compressed, while they are written, with the codec named
+# by their extension (.gz, .bz2, .xz, .zst). Both directions stream through one
+# (de)compressor object, so nothing is ever decompressed to disk and memory does not
+# depend on the file size. Concatenated streams (pigz, pbzip2) are read as one file.
+# xz needs the lzma module (backports.lzma on Python 2), zstd the zstandard one.
+
+import bz2
+import zlib
+try:
+    import lzma
+except ImportError:
+    try:
+        from backports import lzma
+    except ImportError:
+        lzma = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# compressed bytes read from a source file at once
+READ_SIZE = 1 << 16
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+class Codec:
+    def __init__(self, name, extension, magic, module, requires, compressor, decompressor):
+        self.name = name
+        self.extension = extension
+        self.magic = magic
+        self.module = module
+        # module to install when it is missing
+        self.requires = requires
+        self.compressor = compressor
+        self.decompressor = decompressor
+
+    def available(self):
+        return self.module is not None
+
+
+# gzip members are written without file name and timestamp, so that the same rows
+# always give the same bytes
+CODECS = dict((codec.name, codec) for codec in [
+    Codec('gzip', '.gz', '\x1f\x8b', zlib, 'zlib',
+          lambda: zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS),
+          lambda: zlib.decompressobj(16 + zlib.MAX_WBITS)),
+    Codec('bz2', '.bz2', 'BZh', bz2, 'bz2',
+          lambda: bz2.BZ2Compressor(9),
+          lambda: bz2.BZ2Decompressor()),
+    Codec('xz', '.xz', '\xfd7zXZ\x00', lzma, 'backports.lzma',
+          lambda: lzma.LZMACompressor(),
+          lambda: lzma.LZMADecompressor()),
+    Codec('zstd', '.zst', '\x28\xb5\x2f\xfd', zstandard, 'zstandard',
+          lambda: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj(),
+          lambda: zstandard.ZstdDecompressor().decompressobj()),
+])
+
+
+# Codec named by the extension of path, None for plain files
+def path_codec(path):
+    for codec in CODECS.itervalues():
+        if path.endswith(codec.extension):
+            return codec
+    return None
+
+
+# path without the extension of its codec
+def plain_path(path):
+    codec = path_codec(path)
+    return path[:-len(codec.extension)] if codec else path
+
+
+def check_codec(codec):
+    if not codec.available():
+        raise ValueError("%s files need the %s module" % (codec.name, codec.requires))
+    return codec
+
+
+# Decompresses a binary file object while it is read. tell() is the position in the
+# compressed file, which is what progress estimates compare with its size.
+class DecompressingReader:
+    def __init__(self, raw, codec):
+        self.raw = raw
+        self.codec = codec
+        self.decompressor = codec.decompressor()
+        self.buffer = ""
+        self.offset = 0
+        self.eof = False
+
+    def decompress(self, data):
+        chunks = []
+        while data:
+            try:
+                chunks.append(self.decompressor.decompress(data))
+            except EOFError:
+                # the previous stream ended right at the end of the last read
+                self.decompressor = self.codec.decompressor()
+                continue
+            data = getattr(self.decompressor, 'unused_data', "")
+            if data or getattr(self.decompressor, 'eof', False):
+                # another stream follows
+                self.decompressor = self.codec.decompressor()
+        return "".join(chunks)
+
+    # Refill the buffer, leaving it empty only at the end of the file
+    def fill(self):
+        self.buffer = ""
+        self.offset = 0
+        while not self.buffer and not self.eof:
+            data = self.raw.read(READ_SIZE)
+            if data:
+                self.buffer = self.decompress(data)
+            else:
+                self.eof = True
+                if hasattr(self.decompressor, 'flush'):
+                    self.buffer = self.decompressor.flush()
+
+    def read(self, size=-1):
+        if size < 0:
+            chunks = [self.buffer[self.offset:]]
+            self.fill()
+            while self.buffer:
+                chunks.append(self.buffer)
+                self.fill()
+            return "".join(chunks)
+        if self.offset >= len(self.buffer):
+            self.fill()
+        data = self.buffer[self.offset:self.offset + size]
+        self.offset += len(data)
+        return data
+
+    def tell(self):
+        return self.raw.tell()
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Compresses what is written into a binary file object
+class CompressingWriter:
+    def __init__(self, raw, codec):
+        self.raw = raw
+        self.compressor = codec.compressor()
+
+    def write(self, data):
+        data = self.compressor.compress(data)
+        if data:
+            self.raw.write(data)
+
+    # only the file is flushed: flushing the compressor would end its block early
+    def flush(self):
+        self.raw.flush()
+
+    def close(self):
+        self.raw.write(self.compressor.flush())
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# Open a source file for reading, decompressing it when it starts with the magic
+# bytes of a codec
+def open_input(path):
+    raw = open(path, 'rb')
+    head = raw.read(8)
+    raw.seek(0)
+    for codec in CODECS.itervalues():
+        if head.startswith(codec.magic):
+            return DecompressingReader(raw, check_codec(codec))
+    return raw
+
+
+# Wrap out, a binary file object written as path, in the compressor of its extension
+def compressing(out, path):
+    codec = path_codec(path)
+    return CompressingWriter(out, check_codec(codec)) if codec else out
+
+
+# Open an output file for writing, compressed as its extension says
+def open_output(path, buffering=-1):
+    return compressing(open(path, 'wb', buffering), path)
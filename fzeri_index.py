@@ -0,0 +1,247 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# SQLite index of the converted entries (--index).
+# Every entry is stored as its own compressed N-Triples rows, looked up by SERCD,
+# SERCDOA, INVN inventory numbers or ROFI negative ids, so that the subgraph of an
+# entry can be fetched without loading the whole converted catalog.
+# Shared vocabulary triples are stored once, by subject, and can be added to the
+# entry triples referencing them.
+# Rows about resources other than the entry itself (artworks, boxes...) may come
+# from several entries: the index counts the entries holding each of them, so that
+# a --patch only deletes such a row once no entry holds it any longer.
+
+import sys
+import zlib
+import sqlite3
+import argparse
+from hashlib import sha1
+from urllib import unquote_plus
+from rdflib import Graph, URIRef
+from fzeri_sink import serialize_rows
+from fzeri_parser_schedaF import FZERI_FENTRY, EntryURIs
+
+# lookup keys of an entry besides its SERCD
+KEY_KINDS = ('oaentry', 'inventory', 'negative')
+
+
+# Index record of a parsed entry out of its own triples, picklable so that --jobs
+# workers can hand it back to the main process
+def index_record(entry, triples):
+    keys = [('inventory', inventory_id) for inventory_id in entry.inventory_ids]
+    if entry.oaentry_id is not None:
+        keys.append(('oaentry', entry.oaentry_id))
+    if entry.negative_id is not None:
+        keys.append(('negative', unquote_plus(entry.negative_id)))
+    return entry.entry_id, keys, serialize_rows(triples, "nt", None)
+
+
+class EntryIndex:
+    # With create the index is emptied, otherwise entries are added to or replaced
+    # in the existing one (--incremental and --patch runs). Changes to the indexed
+    # rows are written to patch, a fzeri_patch.PatchWriter, if any.
+    def __init__(self, path, create=False, patch=None):
+        self.patch = patch
+        # entries added since the index was opened
+        self.seen = set()
+        # --jobs pools consume the entries from their task thread
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        if create:
+            self.db.executescript("DROP TABLE IF EXISTS entries; DROP TABLE IF EXISTS keys; "
+                                  "DROP TABLE IF EXISTS vocabulary; DROP TABLE IF EXISTS shared;")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (entry_id TEXT PRIMARY KEY, triples BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS keys (kind TEXT NOT NULL, value TEXT NOT NULL, entry_id TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS keys_value ON keys (kind, value);
+            CREATE INDEX IF NOT EXISTS keys_entry ON keys (entry_id);
+            CREATE TABLE IF NOT EXISTS vocabulary (subject TEXT PRIMARY KEY, triples BLOB NOT NULL);
+            CREATE TABLE IF NOT EXISTS shared (digest TEXT PRIMARY KEY, entries INTEGER NOT NULL);
+        """)
+
+    def add(self, record):
+        entry_id, keys, rows = record
+        self.replace_rows(entry_id, self.rows(entry_id), rows)
+        self.drop(entry_id)
+        self.seen.add(entry_id)
+        self.db.execute("INSERT INTO entries VALUES (?, ?)", (entry_id, buffer(zlib.compress(rows))))
+        self.db.executemany("INSERT INTO keys VALUES (?, ?, ?)",
+                            [(kind, value, entry_id) for kind, value in keys])
+
+    def delete(self, entry_id):
+        self.replace_rows(entry_id, self.rows(entry_id), None)
+        self.drop(entry_id)
+
+    # sha1 -> row of the rows of an entry about other resources
+    def shared_rows(self, entry_id, rows):
+        if not rows:
+            return {}
+        own = "<%s" % FZERI_FENTRY[entry_id]
+        return dict((sha1(row).hexdigest(), row) for row in rows.splitlines()
+                    if row and not row.startswith(own + ">") and not row.startswith(own + "/"))
+
+    # Count the shared rows an entry gains and loses, and write what changed to the patch
+    def replace_rows(self, entry_id, old_rows, new_rows):
+        old = self.shared_rows(entry_id, old_rows)
+        new = self.shared_rows(entry_id, new_rows)
+        lost = [digest for digest in old if digest not in new]
+        self.db.executemany("UPDATE shared SET entries = entries - 1 WHERE digest = ?", [(digest,) for digest in lost])
+        gained = [(digest,) for digest in new if digest not in old]
+        self.db.executemany("INSERT OR IGNORE INTO shared VALUES (?, 0)", gained)
+        self.db.executemany("UPDATE shared SET entries = entries + 1 WHERE digest = ?", gained)
+        if self.patch:
+            kept = set()
+            for digest in lost:
+                row = self.db.execute("SELECT entries FROM shared WHERE digest = ?", (digest,)).fetchone()
+                if row and row[0] > 0:
+                    kept.add(old[digest])
+            self.patch.change(old_rows, new_rows, kept=kept)
+
+    def drop(self, entry_id):
+        self.db.execute("DELETE FROM entries WHERE entry_id = ?", (entry_id,))
+        self.db.execute("DELETE FROM keys WHERE entry_id = ?", (entry_id,))
+
+    # Store the shared triples by subject. An --incremental run only meets the shared
+    # resources of the changed entries, so the rows of a subject are merged with the
+    # ones stored by previous runs, and nothing is deleted from them. With complete (a
+    # full run, which meets every shared resource of the catalog) the rows of each
+    # subject are replaced instead, and the subjects no entry uses any longer deleted.
+    def add_vocabulary(self, triples, complete=False):
+        subjects = {}
+        for triple in triples:
+            subjects.setdefault(triple[0], []).append(triple)
+        rows = []
+        for subject, subject_triples in sorted(subjects.iteritems()):
+            old_rows = self.vocabulary_rows(subject)
+            subject_rows = serialize_rows(subject_triples, "nt", None)
+            if old_rows and not complete:
+                subject_rows = "".join(sorted(set(old_rows.splitlines(True)) | set(subject_rows.splitlines(True))))
+            if self.patch:
+                self.patch.change(old_rows, subject_rows, delete=complete)
+            rows.append((subject, buffer(zlib.compress(subject_rows))))
+        self.db.executemany("INSERT OR REPLACE INTO vocabulary VALUES (?, ?)", rows)
+        if complete:
+            used = set(unicode(subject) for subject in subjects)
+            unused = [row[0] for row in self.db.execute("SELECT subject FROM vocabulary ORDER BY subject")
+                      if row[0] not in used]
+            for subject in unused:
+                if self.patch:
+                    self.patch.change(self.vocabulary_rows(subject), None)
+                self.db.execute("DELETE FROM vocabulary WHERE subject = ?", (subject,))
+
+    # SERCDs of the entries with the given key, kind being 'entry' or one of KEY_KINDS
+    def lookup(self, kind, value):
+        if kind == 'entry':
+            rows = self.db.execute("SELECT entry_id FROM entries WHERE entry_id = ?", (value,))
+        elif kind in KEY_KINDS:
+            rows = self.db.execute("SELECT DISTINCT entry_id FROM keys WHERE kind = ? AND value = ? "
+                                   "ORDER BY entry_id", (kind, value))
+        else:
+            raise ValueError("unknown key kind %s" % kind)
+        return [row[0] for row in rows]
+
+    # N-Triples rows of an entry, None if it is not indexed
+    def rows(self, entry_id):
+        row = self.db.execute("SELECT triples FROM entries WHERE entry_id = ?", (entry_id,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    # SERCDs of the indexed entries not added since the index was opened
+    def unseen(self):
+        return [row[0] for row in self.db.execute("SELECT entry_id FROM entries ORDER BY entry_id")
+                if row[0] not in self.seen]
+
+    def vocabulary_rows(self, subject):
+        row = self.db.execute("SELECT triples FROM vocabulary WHERE subject = ?", (subject,)).fetchone()
+        return zlib.decompress(row[0]) if row else None
+
+    # Graph of the given entries; with vocabulary the description of the shared
+    # resources they reference is added too, following the references between shared
+    # resources (box -> serie -> collection, artwork -> production -> author)
+    def graph(self, entry_ids, vocabulary=True, graph=None):
+        graph = Graph() if graph is None else graph
+        nodes = set()
+        for entry_id in entry_ids:
+            rows = self.rows(entry_id)
+            if rows:
+                graph.parse(data=rows, format="nt")
+            # the artwork is described by its schedaOA, which the entry rows do not reference
+            nodes.update(EntryURIs(entry_id, row[0]).artwork for row in self.db.execute(
+                "SELECT value FROM keys WHERE kind = 'oaentry' AND entry_id = ?", (entry_id,)))
+        if vocabulary:
+            nodes.update(node for node in graph.objects() if isinstance(node, URIRef))
+            seen = set()
+            while nodes:
+                node = nodes.pop()
+                seen.add(node)
+                rows = self.vocabulary_rows(node)
+                if rows:
+                    shared = Graph().parse(data=rows, format="nt")
+                    graph += shared
+                    nodes.update(node for node in shared.objects() if isinstance(node, URIRef) and node not in seen)
+        return graph
+
+    def close(self):
+        self.db.execute("DELETE FROM shared WHERE entries <= 0")
+        self.db.commit()
+        self.db.close()
+
+
+# Wraps the output sink of a serial run, indexing the triples of every entry
+class IndexingSink:
+    def __init__(self, sink, index):
+        self.sink = sink
+        self.index = index
+        self.chunk_format = sink.chunk_format
+        self.pending = set()
+
+    def add(self, triple):
+        self.sink.add(triple)
+        self.pending.add(triple)
+
+    def update(self, triples):
+        self.sink.update(triples)
+        self.pending.update(triples)
+
+    def commit(self, entry):
+        if entry.entry_id is not None:
+            self.index.add(index_record(entry, self.pending))
+        self.pending.clear()
+        self.sink.commit(entry)
+
+    def flush(self, context):
+        self.sink.flush(context)
+
+    def write(self, chunk):
+        self.sink.write(chunk)
+
+    def close(self):
+        self.sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch converted FZeri entries from an --index file.')
+    parser.add_argument('index_file', help='Index file path')
+    parser.add_argument('value', help='Value of the key to look up')
+    parser.add_argument('-k', '--key', dest="kind", default="entry", choices=('entry',) + KEY_KINDS,
+                        help='Key to look up: SERCD, SERCDOA, INVN or ROFI')
+    parser.add_argument('-f', '--format', dest="format", default="nt", help='Output format')
+    parser.add_argument('--ids', action="store_true", help='Only print the SERCD of the matching entries')
+    parser.add_argument('--no-vocabulary', dest="vocabulary", action="store_false",
+                        help='Leave out the description of the shared resources')
+    options = parser.parse_args()
+    index = EntryIndex(options.index_file)
+    entry_ids = index.lookup(options.kind, options.value.decode('utf-8'))
+    if options.ids:
+        for entry_id in entry_ids:
+            print entry_id.encode('utf-8')
+    else:
+        index.graph(entry_ids, options.vocabulary).serialize(sys.stdout, format=options.format)
+    index.close()
+
+if __name__ == "__main__":
+    main()
+    sys.exit(0)
@@ -0,0 +1,85 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# SQLite manifest of the entries converted by previous runs (--incremental).
+# It maps each SERCD to the digest of its SCHEDA XML, so that a run only converts
+# new and changed entries and can tell which ones vanished from the catalog.
+# The manifest also records a fingerprint of the converter (the code of the modules
+# the output depends on, and the output settings): when it changes every entry is
+# converted again.
+
+import sqlite3
+from hashlib import sha1
+from os.path import dirname, realpath, join
+
+# modules whose code shapes the converted output: parsing, unit and name tables,
+# serialization and compression
+CONVERTER_MODULES = ('fzeri_schedaF_to_owl.py', 'fzeri_parser_schedaF.py', 'fzeri_thes.py', 'fzeri_reconcile.py',
+                     'fzeri_sink.py', 'fzeri_packed.py', 'fzeri_compress.py')
+
+
+# Digest of the SCHEDA XML, ignoring the whitespace following the element
+def entry_digest(xmlentry, tostring):
+    tail, xmlentry.tail = xmlentry.tail, None
+    try:
+        return sha1(tostring(xmlentry)).hexdigest()
+    finally:
+        xmlentry.tail = tail
+
+
+# Fingerprint of the code of CONVERTER_MODULES plus the output settings
+def converter_fingerprint(settings):
+    digest = sha1()
+    for module in CONVERTER_MODULES:
+        with open(join(dirname(realpath(__file__)), module), 'rb') as source:
+            digest.update(sha1(source.read()).digest())
+    digest.update(settings)
+    return digest.hexdigest()
+
+
+class Manifest:
+    def __init__(self, path, fingerprint):
+        # --jobs pools consume the entries, hence query the manifest, from their task thread
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS entries "
+                        "(entry_id TEXT PRIMARY KEY, digest TEXT NOT NULL, run INTEGER NOT NULL)")
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+        # whether the output of previous runs is left out of this one: files they wrote
+        # (e.g. --thesauri) are only merged into the new ones when it is not
+        self.reset = row is None or row[0] != fingerprint
+        if self.reset:
+            # converter or settings changed: previous output can't be trusted
+            self.db.execute("DELETE FROM entries")
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('fingerprint', ?)", (fingerprint,))
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'run'").fetchone()
+        self.run = int(row[0]) + 1 if row else 1
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('run', ?)", (str(self.run),))
+        self.changed_count = self.unchanged_count = 0
+
+    # Record the digest of an entry, returning whether it is new or changed.
+    # Every entry seen is tagged with the current run, the others have been deleted.
+    def changed(self, entry_id, digest):
+        row = self.db.execute("SELECT digest FROM entries WHERE entry_id = ?", (entry_id,)).fetchone()
+        self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?)", (entry_id, digest, self.run))
+        if row is not None and row[0] == digest:
+            self.unchanged_count += 1
+            return False
+        self.changed_count += 1
+        return True
+
+    def deleted(self):
+        return [row[0] for row in self.db.execute("SELECT entry_id FROM entries WHERE run < ? ORDER BY entry_id",
+                                                  (self.run,))]
+
+    # Forget deleted entries and commit the run; nothing is recorded if the run
+    # does not get here, so a failed run is converted again in full.
+    def close(self):
+        self.db.execute("DELETE FROM entries WHERE run < ?", (self.run,))
+        self.db.commit()
+        self.db.close()
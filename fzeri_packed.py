@@ -0,0 +1,251 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Packed output format (-f packed, .fzp files), in the spirit of HDT.
+# Every distinct term is stored once in a sorted dictionary and triples become
+# (subject, predicate, object) integer IDs, sorted, so that a reader can look
+# triples up by subject with a binary search instead of parsing text.
+#
+# Layout:
+#     MAGIC
+#     header      <IIII: term count, triple count, dictionary bytes, triples bytes
+#     dictionary  zlib compressed, "\0" separated UTF-8 term keys in sorted order
+#                 (the position of a key is the ID of its term)
+#     triples     zlib compressed, little endian uint32 IDs, three per triple
+#
+# Term keys are "<" + URI, "_" + blank node id or '"' + lexical form + "\1" +
+# language + "\1" + datatype for literals; neither "\0" nor "\1" can appear in
+# the XML the terms come from. zlib takes care of the long shared prefixes of the
+# FZERI_* URIs.
+
+import sys
+import zlib
+import struct
+import argparse
+from array import array
+from bisect import bisect_left
+from rdflib import Graph, URIRef, BNode, Literal
+from rdflib import plugin
+from rdflib.parser import Parser
+from rdflib.serializer import Serializer
+from rdflib.util import from_n3
+from fzeri_compress import open_input, open_output
+
+MAGIC = "FZP\x01"
+HEADER = struct.Struct("<IIII")
+# array typecode of unsigned 32 bit integers
+ID_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+
+def term_key(term):
+    if isinstance(term, Literal):
+        return u'"%s\1%s\1%s' % (term, term.language or u"", term.datatype or u"")
+    if isinstance(term, BNode):
+        return u"_%s" % term
+    return u"<%s" % term
+
+
+def key_term(key):
+    if key[0] == u'"':
+        lexical, language, datatype = key[1:].split(u"\1")
+        return Literal(lexical, lang=language or None, datatype=URIRef(datatype) if datatype else None,
+                       normalize=False)
+    if key[0] == u"_":
+        return BNode(key[1:])
+    return URIRef(key[1:])
+
+
+def little_endian(ids):
+    if sys.byteorder == 'big':
+        ids = array(ID_TYPECODE, ids)
+        ids.byteswap()
+    return ids
+
+
+# Collects the triples of the whole run, interning terms as they come, and writes
+# the packed file on close. Memory is one dictionary entry per distinct term plus
+# twelve bytes per triple.
+class PackedSink:
+    chunk_format = "nt"
+
+    def __init__(self, destination=None):
+        self.destination = destination
+        self.ids = {}
+        self.terms = []
+        self.triples = array(ID_TYPECODE)
+
+    def term_id(self, term):
+        try:
+            return self.ids[term]
+        except KeyError:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+            return term_id
+
+    def add(self, triple):
+        self.triples.extend([self.term_id(term) for term in triple])
+
+    def update(self, triples):
+        term_id = self.term_id
+        self.triples.extend([term_id(term) for triple in triples for term in triple])
+
+    def commit(self, entry):
+        pass
+
+    def flush(self, context):
+        pass
+
+    def write(self, chunk):
+        for triple in Graph().parse(data=chunk, format=self.chunk_format):
+            self.add(triple)
+
+    # Renumber terms in key order, then sort and deduplicate the triples
+    def save(self, out):
+        keys = [term_key(term) for term in self.terms]
+        order = sorted(xrange(len(keys)), key=keys.__getitem__)
+        renumber = array(ID_TYPECODE, [0]) * len(keys)
+        for term_id, old_id in enumerate(order):
+            renumber[old_id] = term_id
+        triples = self.triples
+        rows = sorted(set((renumber[triples[i]], renumber[triples[i + 1]], renumber[triples[i + 2]])
+                          for i in xrange(0, len(triples), 3)))
+        ids = array(ID_TYPECODE)
+        for row in rows:
+            ids.extend(row)
+        dictionary = zlib.compress(u"\0".join([keys[old_id] for old_id in order]).encode('utf-8'), 9)
+        packed = zlib.compress(little_endian(ids).tostring(), 9)
+        out.write(MAGIC)
+        out.write(HEADER.pack(len(keys), len(rows), len(dictionary), len(packed)))
+        out.write(dictionary)
+        out.write(packed)
+
+    def close(self):
+        with open_output(self.destination) as out:
+            self.save(out)
+
+
+# Sequence view of the triple IDs as (s, p, o) tuples, for bisect
+class Rows:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def __len__(self):
+        return len(self.ids) // 3
+
+    def __getitem__(self, row):
+        return tuple(self.ids[3 * row:3 * row + 3])
+
+
+# Reads a packed file, given its path or a binary file object. Terms are decoded
+# only when a triple using them is returned.
+class PackedReader:
+    def __init__(self, source):
+        if isinstance(source, basestring):
+            with open_input(source) as stream:
+                data = stream.read()
+        else:
+            data = source.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a packed FZeri file")
+        offset = len(MAGIC) + HEADER.size
+        term_count, triple_count, dictionary_size, triples_size = HEADER.unpack(data[len(MAGIC):offset])
+        dictionary = zlib.decompress(data[offset:offset + dictionary_size]).decode('utf-8')
+        self.keys = dictionary.split(u"\0") if term_count else []
+        offset += dictionary_size
+        self.ids = array(ID_TYPECODE)
+        self.ids.fromstring(zlib.decompress(data[offset:offset + triples_size]))
+        self.ids = little_endian(self.ids)
+        if len(self.keys) != term_count or len(self.ids) != 3 * triple_count:
+            raise ValueError("truncated packed FZeri file")
+        self.rows = Rows(self.ids)
+        self.cache = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return self.triples((None, None, None))
+
+    def term(self, term_id):
+        try:
+            return self.cache[term_id]
+        except KeyError:
+            term = self.cache[term_id] = key_term(self.keys[term_id])
+            return term
+
+    # ID of term, None when the file does not contain it
+    def term_id(self, term):
+        key = term_key(term)
+        term_id = bisect_left(self.keys, key)
+        if term_id < len(self.keys) and self.keys[term_id] == key:
+            return term_id
+        return None
+
+    # Triples matching the (s, p, o) pattern, None matching anything.
+    # Patterns with a subject are answered by binary search, the others by a scan.
+    def triples(self, pattern):
+        ids = []
+        for term in pattern:
+            term_id = None if term is None else self.term_id(term)
+            if term is not None and term_id is None:
+                return
+            ids.append(term_id)
+        s, p, o = ids
+        first, last = 0, len(self.rows)
+        if s is not None:
+            prefix = (s,) if p is None else (s, p)
+            first = bisect_left(self.rows, prefix)
+            last = bisect_left(self.rows, prefix[:-1] + (prefix[-1] + 1,), first)
+        for row in xrange(first, last):
+            triple = self.rows[row]
+            if (p is None or triple[1] == p) and (o is None or triple[2] == o):
+                yield tuple(self.term(term_id) for term_id in triple)
+
+    def graph(self, graph=None):
+        graph = Graph() if graph is None else graph
+        graph.addN((s, p, o, graph) for s, p, o in self)
+        return graph
+
+
+# rdflib plugins, so that Graph.serialize/parse (and --single-entry) handle format="packed"
+class PackedSerializer(Serializer):
+    def serialize(self, stream, base=None, encoding=None, **args):
+        sink = PackedSink()
+        for triple in self.store:
+            sink.add(triple)
+        sink.save(stream)
+
+
+class PackedParser(Parser):
+    def parse(self, source, sink, **args):
+        PackedReader(source.getByteStream()).graph(sink)
+
+plugin.register('packed', Serializer, 'fzeri_packed', 'PackedSerializer')
+plugin.register('packed', Parser, 'fzeri_packed', 'PackedParser')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query or convert a packed FZeri file.')
+    parser.add_argument('packed_file', help='Packed (.fzp) file path')
+    parser.add_argument('-s', '--subject', help='Subject of the triples to print, in N3 (<uri>)')
+    parser.add_argument('-p', '--predicate', help='Predicate of the triples to print, in N3')
+    parser.add_argument('-o', '--object', help='Object of the triples to print, in N3')
+    parser.add_argument('-f', '--format', dest="format", help='Convert the whole file to this rdflib format')
+    options = parser.parse_args()
+    reader = PackedReader(options.packed_file)
+    if options.format:
+        reader.graph().serialize(sys.stdout, format=options.format)
+        return
+    pattern = [from_n3(term.decode('utf-8')) if term else None
+               for term in (options.subject, options.predicate, options.object)]
+    for triple in reader.triples(pattern):
+        print (u"%s %s %s ." % tuple(term.n3() for term in triple)).encode('utf-8')
+
+if __name__ == "__main__":
+    main()
+    sys.exit(0)
@@ -6,29 +6,48 @@ __license__ = 'ISC'
 __copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
 __docformat__ = 'restructuredtext en'
 
-from rdflib import Namespace, Literal, RDF, RDFS
+import re
+import logging
+import time
+import datetime
+import rdflib
+from rdflib import Graph, Namespace, URIRef, Literal, RDF, RDFS, OWL, XSD
 from hashlib import sha1
 from urllib import quote_plus
+from decimal import Decimal
+from collections import OrderedDict, Counter
+from fzeri_thes import fzeri_to_qudt
+
+
+# Namespace keeping the terms looked up as attributes (CRM.E53_Place), which the
+# handlers do for about every triple they add
+class TermNamespace(Namespace):
+    def __getattr__(self, name):
+        term = Namespace.__getattr__(self, name)
+        self.__dict__[name] = term
+        return term
+
 
 # init namespaces
-DC = Namespace("http://purl.org/dc/elements/1.1/")
-DCTERMS = Namespace("http://purl.org/dc/terms/")
-FOAF = Namespace("http://xmlns.com/foaf/0.1/")
-CRM = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
-PRO = Namespace("http://purl.org/spar/pro/")
-TIME = Namespace("http://www.w3.org/2006/time#")
-FABIO = Namespace("http://purl.org/spar/fabio/")
-FENTRY = Namespace("http://www.essepuntato.it/2014/03/fentry/")
-FRBR = Namespace("http://purl.org/vocab/frbr/core#")
-PROV = Namespace("http://www.w3.org/ns/prov#")
+DC = TermNamespace("http://purl.org/dc/elements/1.1/")
+DCTERMS = TermNamespace("http://purl.org/dc/terms/")
+FOAF = TermNamespace("http://xmlns.com/foaf/0.1/")
+CRM = TermNamespace("http://www.cidoc-crm.org/cidoc-crm/")
+PRO = TermNamespace("http://purl.org/spar/pro/")
+TIME = TermNamespace("http://www.w3.org/2006/time#")
+FABIO = TermNamespace("http://purl.org/spar/fabio/")
+FENTRY = TermNamespace("http://www.essepuntato.it/2014/03/fentry/")
+FRBR = TermNamespace("http://purl.org/vocab/frbr/core#")
+PROV = TermNamespace("http://www.w3.org/ns/prov#")
 # TODO: add DATACITE to identificators
 DATACITE = Namespace("http://purl.org/spar/datacite")
-QUDT = Namespace("http://qudt.org/vocab/unit#")
 FZERI_FENTRY = Namespace("http://fe.fondazionezeri.unibo.it/catalogo/schedaF/")
 FZERI_OAENTRY = Namespace("http://fe.fondazionezeri.unibo.it/catalogo/schedaOA/")
 FZERI_NEGATIVE = Namespace("http://fe.fondazionezeri.unibo.it/catalogo/negative/")
 FZERI_DIMAGES = Namespace("http://fe.fondazionezeri.unibo.it/foto/")
 FZERI_COLLECTION = Namespace("http://fe.fondazionezeri.unibo.it/collection/")
+FZERI_THESAURI = Namespace("http://fe.fondazionezeri.unibo.it/thesauri/")
+FZERI_AUTHORITY = Namespace("http://fe.fondazionezeri.unibo.it/authority/")
 
 FZERI_DIMENSION = Namespace("http://fe.fondazionezeri.unibo.it/thesauri/dimension/")
 FZERI_SERIE = Namespace("http://fe.fondazionezeri.unibo.it/thesauri/serie/")
@@ -41,85 +60,550 @@ FZERI_PHOTOCOLOR = Namespace("http://fe.fondazionezeri.unibo.it/thesauri/photo_c
 FZERI_PHOTOTYPE = Namespace("http://fe.fondazionezeri.unibo.it/thesauri/photo_type/")
 FZERI_CONDITIONTYPE = Namespace("http://fe.fondazionezeri.unibo.it/thesauri/condition_type/")
 
-unit_fzeri_to_qudt = {
-    'mm': QUDT.Millimeter,
-    'cm': QUDT.Centimeter,
-    'm': QUDT.Meter,
+# kinds of names linked to shared authority nodes by --reconcile -> class of the nodes
+AUTHORITY_KINDS = {
+    'actor': CRM.E39_Actor,
+    'repository': CRM.E53_Place,
+    'town': CRM.E53_Place,
+    'district': CRM.E53_Place,
+    'region': CRM.E53_Place,
+    'country': CRM.E53_Place,
 }
 
+# property -> its inverse, for every pair of properties the parser writes both ways.
+# With --canonical only the first one is written (triples of the inverse are turned
+# around), the owl:inverseOf axioms of --inverse-axioms telling how to get the other.
+INVERSE_PROPERTIES = OrderedDict([
+    (CRM.P2_has_type, CRM.P2i_is_type_of),
+    (CRM['P4_has_time-span'], CRM['P4i_is_time-span_of']),
+    (CRM.P7_took_place_at, CRM.P7i_witnessed),
+    (CRM.P9_consists_of, CRM.P9i_forms_part_of),
+    (CRM.P10_falls_within, CRM.P10i_contains),
+    (CRM.P11_had_participant, CRM.P11i_participated_in),
+    (CRM.P14_carried_out_by, CRM.P14i_performed),
+    (CRM.P16_used_specific_object, CRM.P16i_was_used_for),
+    (CRM.P22_transferred_title_to, CRM.P22i_acquired_title_through),
+    (CRM.P24_transferred_title_of, CRM.P24i_changed_ownership_through),
+    (CRM.P25_moved, CRM.P25i_moved_by),
+    (CRM.P26_moved_to, CRM.P26i_was_destination_of),
+    (CRM.P43_has_dimension, CRM.P43i_is_dimension_of),
+    (CRM.P44_has_condition, CRM.P44i_is_condition_of),
+    (CRM.P45_consists_of, CRM.P45i_is_incorporated_in),
+    (CRM.P46_is_composed_of, CRM.P46i_forms_part_of),
+    (CRM.P48_has_preferred_identifier, CRM.P48i_is_preferred_identifier_of),
+    (CRM.P50_has_current_keeper, CRM.P50i_is_current_keeper_of),
+    (CRM.P53_has_former_or_current_location, CRM.P53i_is_former_or_current_location_of),
+    (CRM.P54_has_current_permanent_location, CRM.P54i_is_current_permanent_location_of),
+    (CRM.P55_has_current_location, CRM.P55i_is_current_location_of),
+    (CRM.P59_has_section, CRM.P59i_is_located_on_or_within),
+    (CRM.P62_depicts, CRM.P62i_is_depicted_by),
+    (CRM.P70_documents, CRM.P70i_is_documented_in),
+    (CRM.P78_is_identified_by, CRM.P78i_identifies),
+    (CRM.P87_is_identified_by, CRM.P87i_identifies),
+    (CRM.P89_falls_within, CRM.P89i_contains),
+    (CRM.P91_has_unit, CRM.P91i_is_unit_of),
+    (CRM.P94_created, CRM.P94i_was_created_by),
+    (CRM.P104_is_subject_to, CRM.P104i_applies_to),
+    (CRM.P108_produced, CRM.P108i_was_produced_by),
+    (CRM.P124_transformed, CRM.P124i_was_transformed_by),
+    (CRM.P131_is_identified_by, CRM.P131i_identifies),
+    (CRM.P138_represents, CRM.P138i_has_representation),
+    (CRM.P140_assigned_attribute_to, CRM.P140i_was_attributed_by),
+    (CRM.P141_assigned, CRM.P141i_was_assigned_by),
+    (CRM.P149_is_identified_by, CRM.P149i_identifies),
+    (FENTRY.hasProperTitle, FENTRY.isProperTitleOf),
+    (FENTRY.hasParallelTitle, FENTRY.isParallelTitleOf),
+    (FENTRY.hasAttributedTitle, FENTRY.isAttributedTitleOf),
+    (FENTRY.hasCulturalContext, FENTRY.isCulturalContextOf),
+])
+# inverse -> property, triples (s, inverse, o) being written as (o, property, s)
+CANONICAL_PROPERTIES = dict((inverse, prop) for prop, inverse in INVERSE_PROPERTIES.iteritems())
+
+logger = logging.getLogger(__name__)
+
+# rdflib would rewrite gYear and gYearMonth lexical forms into full dates
+# ("1967" -> "1967-01-01") whenever such literals are built or parsed back
+rdflib.NORMALIZE_LITERALS = False
+
+# what FZeriParserSchedaF may do with paragraphs it has no handler for
+UNKNOWN_PARAGRAPH_POLICIES = ('skip', 'log', 'collect', 'raise')
+
+# max number of terms kept by each TermFactory cache
+TERM_CACHE_SIZE = 4096
+
+
+# Bounded LRU mapping with hit/miss counters
+class LRUCache:
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        try:
+            value = self.entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+        # re-insert to mark the key as most recently used
+        self.entries[key] = value
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return float(self.hits) / lookups if lookups else 0.0
+
+
+# Interns the terms derived from thesaurus and collection values.
+# Those vocabularies only have a few hundred distinct values across the whole
+# catalog, so hashing/quoting the text and building the URIRef or Literal is
+# done once per value instead of once per entry.
+class TermFactory:
+    def __init__(self, maxsize=TERM_CACHE_SIZE):
+        self.caches = OrderedDict((kind, LRUCache(maxsize)) for kind in ('hashed', 'quoted', 'literal'))
+
+    # namespace[sha1(text) + suffix]
+    def hashed(self, namespace, text, suffix=''):
+        cache = self.caches['hashed']
+        key = (namespace, text, suffix)
+        term = cache.get(key)
+        if term is None:
+            term = cache.put(key, namespace[sha1(text.encode('utf-8')).hexdigest() + suffix])
+        return term
+
+    # namespace[quote_plus(text)]
+    def quoted(self, namespace, text):
+        cache = self.caches['quoted']
+        key = (namespace, text)
+        term = cache.get(key)
+        if term is None:
+            term = cache.put(key, namespace[quote_plus(text.encode('utf-8'))])
+        return term
+
+    def literal(self, text):
+        cache = self.caches['literal']
+        term = cache.get(text)
+        if term is None:
+            term = cache.put(text, Literal(text))
+        return term
+
+    def report(self):
+        return ", ".join("%s %.1f%% of %d (%d cached)" % (kind, cache.hit_rate() * 100, cache.hits + cache.misses,
+                                                          len(cache.entries))
+                         for kind, cache in self.caches.iteritems())
+
+# shared by all the entries parsed by the process
+TERMS = TermFactory()
+
+# qualifiers written along the catalog dates ("1947/ ca.", "ante 1950") -> normalized form
+DATE_QUALIFIERS = {'ca': u"ca.", 'circa': u"ca.", 'ante': u"ante", 'post': u"post"}
+DATE_QUALIFIER_RE = re.compile(r'\b(ca|circa|ante|post)\b\.?', re.I | re.U)
+# 1967
+YEAR_RE = re.compile(r'^(\d{4})$')
+# 1953/12
+YEAR_MONTH_RE = re.compile(r'^(\d{4})[/-](\d{1,2})$')
+# 1953/12/10
+YEAR_MONTH_DAY_RE = re.compile(r'^(\d{4})[/-](\d{1,2})[/-](\d{1,2})$')
+# 10/10/2005 0.00.00 (CMPD), 09/10/2012 (AGGD)
+DAY_MONTH_YEAR_RE = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{4})(?:\s+(\d{1,2})\.(\d{2})\.(\d{2}))?$')
+# OWL-Time property holding a date of each datatype
+TIME_PROPERTIES = {
+    XSD.gYear: TIME.inXSDgYear,
+    XSD.gYearMonth: TIME.inXSDgYearMonth,
+    XSD.date: TIME.inXSDDate,
+    XSD.dateTime: TIME.inXSDDateTime,
+}
+
+
+# (typed literal, qualifier) of a catalog date; the literal is None when text is
+# not a valid date in one of the known forms, the qualifier None when there is none
+def parse_date(text):
+    qualifier = None
+    match = DATE_QUALIFIER_RE.search(text)
+    if match:
+        qualifier = DATE_QUALIFIERS[match.group(1).lower()]
+        text = text[:match.start()] + text[match.end():]
+    text = text.strip(u" /-")
+    try:
+        match = YEAR_RE.match(text)
+        if match:
+            return Literal(match.group(1), datatype=XSD.gYear), qualifier
+        match = YEAR_MONTH_RE.match(text)
+        if match:
+            year, month = int(match.group(1)), int(match.group(2))
+            datetime.date(year, month, 1)
+            return Literal(u"%04d-%02d" % (year, month), datatype=XSD.gYearMonth), qualifier
+        match = YEAR_MONTH_DAY_RE.match(text)
+        if match:
+            date = datetime.date(*[int(group) for group in match.groups()])
+            return Literal(date.isoformat(), datatype=XSD.date), qualifier
+        match = DAY_MONTH_YEAR_RE.match(text)
+        if match:
+            day, month, year = [int(group) for group in match.groups()[:3]]
+            date = datetime.date(year, month, day)
+            hours, minutes, seconds = [int(group or 0) for group in match.groups()[3:]]
+            if hours or minutes or seconds:
+                date = datetime.datetime(year, month, day, hours, minutes, seconds)
+                return Literal(date.isoformat(), datatype=XSD.dateTime), qualifier
+            return Literal(date.isoformat(), datatype=XSD.date), qualifier
+    except ValueError:
+        pass
+    return None, qualifier
+
+
+# Normalizes the catalog dates (DTSI, PRDU, CMPD...) with parse_date, None standing
+# for an empty field. Only a few thousand distinct date strings occur across the
+# catalog, so each one is parsed once.
+class DateNormalizer:
+    def __init__(self, maxsize=TERM_CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+        # distinct strings which are not dates
+        self.unparsed = 0
+
+    def normalize(self, text):
+        if not text:
+            return None
+        date = self.cache.get(text)
+        if date is None:
+            date = self.cache.put(text, parse_date(text))
+            if date[0] is None:
+                logger.debug("Not a date: %s", text)
+                self.unparsed += 1
+        return date
+
+    def report(self):
+        return "%.1f%% of %d (%d cached), %d not dates" % (self.cache.hit_rate() * 100,
+                                                           self.cache.hits + self.cache.misses,
+                                                           len(self.cache.entries), self.unparsed)
+
+# shared by all the entries parsed by the process
+DATES = DateNormalizer()
+
+# 240, 16,5
+DIMENSION_RE = re.compile(r'^(\d+(?:[.,]\d+)?)$')
+# 240-250, 16,5 / 17
+DIMENSION_RANGE_RE = re.compile(r'^(\d+(?:[.,]\d+)?)\s*[-/]\s*(\d+(?:[.,]\d+)?)$')
+
+
+# (lower, upper, approximate) xsd:decimal bounds of a MISA/MISL/MISD measure, lower
+# being upper for a single value; None when text is empty or not a measure
+def parse_dimension(text):
+    if not text:
+        return None
+    match = DATE_QUALIFIER_RE.search(text)
+    approximate = match is not None
+    if approximate:
+        text = text[:match.start()] + text[match.end():]
+    text = text.strip()
+    match = DIMENSION_RE.match(text) or DIMENSION_RANGE_RE.match(text)
+    if match is None:
+        return None
+    bounds = [Literal(unicode(Decimal(value.replace(',', '.'))), datatype=XSD.decimal) for value in match.groups()]
+    return bounds[0], bounds[-1], approximate
+
+
+# Triples of the entry being parsed, handed over to the sinks once it is done
+class TripleBuffer(list):
+    add = list.append
+
+
+# Add triples to sink in one call: rdflib graphs take them through addN (one store
+# operation instead of one per triple), sets and fzeri_sink sinks through update
+def add_triples(sink, triples):
+    if isinstance(sink, Graph):
+        sink.addN((s, p, o, sink) for s, p, o in triples)
+    else:
+        sink.update(triples)
+
+
+# Turn the triples of inverse properties the other way round (--canonical)
+def canonical_triples(triples):
+    canonical = CANONICAL_PROPERTIES
+    return [(o, canonical[p], s) if p in canonical else (s, p, o) for s, p, o in triples]
+
 
+# owl:inverseOf axioms of the properties in INVERSE_PROPERTIES
+def inverse_axioms():
+    for prop, inverse in INVERSE_PROPERTIES.iteritems():
+        yield (prop, OWL.inverseOf, inverse)
+
+
+# A PARAGRAFO (or RIPETIZIONE) flattened in a single pass over its fields:
+# items holds the (tag, text) pairs in document order, first the text of the first
+# field with each tag, i.e. what element.find(tag).text would return. Handlers
+# read these instead of scanning the element again for every lookup.
+class Paragraph(object):
+    __slots__ = ('items', 'first')
+
+    def __init__(self, element):
+        self.items = [(node.tag, node.text) for node in element]
+        # reversed, so that the first field with a tag wins
+        self.first = dict(reversed(self.items))
+
+
+# URI of the resource named by parts under base, e.g.
+#     child_uri(uris.photo, 'dimage', '1') -> .../schedaF/67680/photo/dimage/1
+def child_uri(base, *parts):
+    return URIRef(u"/".join((base,) + parts))
+
+
+# URIs of the nodes most resources of an entry hang from, built once per entry;
+# handlers derive the other ones from these (or from each other) with child_uri
+class EntryURIs(object):
+    __slots__ = ('entry', 'title', 'photo', 'production', 'location', 'cataloguing', 'artwork')
+
+    def __init__(self, entry_id, oaentry_id):
+        self.entry = FZERI_FENTRY[entry_id]
+        self.title = child_uri(self.entry, 'title')
+        self.photo = child_uri(self.entry, 'photo')
+        self.production = child_uri(self.photo, 'production')
+        self.location = child_uri(self.photo, 'location')
+        self.cataloguing = child_uri(self.entry, 'cataloguing')
+        # the artwork is described by the schedaOA entry
+        self.artwork = FZERI_OAENTRY[oaentry_id + '/artwork']
+
+
+# fields identifying an entry, looked up among the fields of its paragraphs
+ENTRY_ID_TAGS = ("SERCD", "SERCDOA", "ROFI")
+
+
+# Triples describing shared resources (thesauri, collections, artworks) go to the
+# vocabulary sink instead of the entry sink, so that they can be written once per
+# run; without a vocabulary sink they are written along with the entry.
+# Handlers add triples to per-entry buffers (self.sink and self.vocabulary), which
+# are written into the sinks in bulk once the whole entry has been parsed.
 class FZeriParserSchedaF:
-    def __init__(self, xmlentry, graph):
+    # paragraph handler name suffix -> parse_paragraph_* function, built at import
+    handlers = {}
+    # paragraph label as found in the catalog -> handler (None for unknown labels)
+    label_handlers = {}
+    # one of UNKNOWN_PARAGRAPH_POLICIES
+    unknown_paragraphs = 'log'
+    # unknown paragraph label -> occurrences (with the log and collect policies)
+    unknown_stats = Counter()
+    # account calls, running time and triples of every handler in handler_stats
+    profile_handlers = False
+    # handler name -> [calls, seconds, triples]
+    handler_stats = {}
+    # MISU units with no QUDT counterpart -> occurrences
+    unknown_units = Counter()
+    # fzeri_reconcile.Reconciler linking actors and places to authority nodes, if any
+    reconciler = None
+    # write inverse properties as their canonical counterpart
+    canonical = False
+
+    def __init__(self, xmlentry, sink, vocabulary=None):
         self.entry_id = self.oaentry_id = self.negative_id = self.myentry = None
+        # EntryURIs of the entry, built by init_graph
+        self.uris = None
+        # INVN inventory numbers met while parsing
+        self.inventory_ids = []
         self.xmlentry = xmlentry
-        self.graph = graph
+        self.entry_sink = sink
+        self.vocabulary_sink = vocabulary
+        self.sink = TripleBuffer()
+        self.vocabulary = self.sink if vocabulary is None else TripleBuffer()
+        # triples added for the entry, once parsed
+        self.triple_count = 0
         self.production_counter = 0
 
     def parse(self):
+        # flatten every paragraph once, picking up the entry ids on the way
+        paragraphs = []
+        ids = {}
+        for child in self.xmlentry.findall("PARAGRAFO"):
+            paragraph = Paragraph(child)
+            for tag in ENTRY_ID_TAGS:
+                if tag not in ids and tag in paragraph.first:
+                    ids[tag] = paragraph.first[tag]
+            if len(child):   # paragraph does contain at least one subelement
+                paragraphs.append((child, paragraph))
         try:
-            self.entry_id = self.xmlentry.find("PARAGRAFO/SERCD").text
-            self.oaentry_id = self.xmlentry.find("PARAGRAFO/SERCDOA").text
-        except AttributeError:
+            self.entry_id = ids["SERCD"]
+            self.oaentry_id = ids["SERCDOA"]
+        except KeyError:
             print "Entry has no ID!!!"
             return
-        try:
-            self.negative_id = quote_plus(self.xmlentry.find("PARAGRAFO/ROFI").text)
-        except AttributeError:
-            self.negative_id = None
+        self.negative_id = quote_plus(ids["ROFI"]) if "ROFI" in ids else None
 
         self.init_graph()
 
         # Process all paragraphs
-        for child in self.xmlentry.findall("PARAGRAFO"):
-            if len(child):   # paragraph does contain at least one subelement
-                if child[0].tag == "RIPETIZIONE":
-                    for repchild in child:
-                        # call the appropriate parse_paragraph_* function
-                        getattr(self, "parse_paragraph_" +
-                                      child.attrib["etichetta"].lower().
-                                replace(' ', '_').replace('(', '').replace(')', ''))(repchild, repchild.attrib['prog'])
-                else:
-                    # call the appropriate parse_paragraph_* function
-                    getattr(self, "parse_paragraph_" + child.attrib["etichetta"].lower().
-                            replace(' ', '_').replace('(', '').replace(')', ''))(child)
+        for child, paragraph in paragraphs:
+            # the appropriate parse_paragraph_* function
+            handler = self.handler_for(child.attrib["etichetta"])
+            if handler is None:
+                self.unknown_paragraph(child.attrib["etichetta"])
+                continue
+            if self.profile_handlers:
+                handler = self.timed(handler)
+            if child[0].tag == "RIPETIZIONE":
+                for repchild in child:
+                    handler(self, Paragraph(repchild), repchild.attrib['prog'])
+            else:
+                handler(self, paragraph)
+        self.write_triples()
+
+    # triples in the buffers so far
+    def buffered(self):
+        if self.vocabulary is self.sink:
+            return len(self.sink)
+        return len(self.sink) + len(self.vocabulary)
+
+    # Write the buffered triples into the sinks, one bulk write each
+    def write_triples(self):
+        self.triple_count = self.buffered()
+        for triples, sink in (self.sink, self.entry_sink), (self.vocabulary, self.vocabulary_sink):
+            if sink is None:
+                continue
+            if self.canonical:
+                triples = canonical_triples(triples)
+            add_triples(sink, triples)
+
+    # Look up the handler of a paragraph label, e.g.
+    #     RELATIONS WITH OTHER PHOTOGRAPHIC OBJECTS (NEGATIVE)
+    # is handled by parse_paragraph_relations_with_other_photographic_objects_negative.
+    # Each distinct label is resolved once, then served from label_handlers.
+    @classmethod
+    def handler_for(cls, label):
+        try:
+            return cls.label_handlers[label]
+        except KeyError:
+            handler = cls.handlers.get(label.lower().replace(' ', '_').replace('(', '').replace(')', ''))
+            cls.label_handlers[label] = handler
+            return handler
+
+    def unknown_paragraph(self, label):
+        if self.unknown_paragraphs == 'raise':
+            raise ValueError("Entry %s: no handler for paragraph %s" % (self.entry_id, label))
+        elif self.unknown_paragraphs == 'log':
+            logger.warning("Entry %s: skipping unknown paragraph %s", self.entry_id, label)
+            self.unknown_stats[label] += 1
+        elif self.unknown_paragraphs == 'collect':
+            self.unknown_stats[label] += 1
+
+    # Wrap a handler so that its calls, running time and triples end up in handler_stats
+    @classmethod
+    def timed(cls, handler):
+        stats = cls.handler_stats.setdefault(handler.__name__, [0, 0.0, 0])
+
+        def run(parser, *args):
+            start = time.time()
+            triples = parser.buffered()
+            try:
+                handler(parser, *args)
+            finally:
+                stats[0] += 1
+                stats[1] += time.time() - start
+                stats[2] += parser.buffered() - triples
+        return run
 
     # Init graph with the entry and various global resources
     def init_graph(self):
-        self.myentry = FZERI_FENTRY[self.entry_id]
-        self.graph.add((self.myentry, RDF.type, CRM.E31_Document))
-        self.graph.add((self.myentry, RDF.type, FENTRY.FEntry))
-        self.graph.add((self.myentry, CRM.P1_is_identified_by, Literal(self.entry_id)))
-        title = FZERI_FENTRY[self.entry_id + '/title']
-        self.graph.add((title, RDF.type, CRM.E35_Title))
-        self.graph.add((title, RDF.type, DCTERMS.title))
-        self.graph.add((title, RDFS.label, Literal(self.xmlentry.attrib['intestazione'])))
-        self.graph.add((self.myentry, CRM.P102_has_title, title))
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        self.graph.add((myphoto, RDF.type, CRM['E22_Man-Made_Object']))
-        self.graph.add((myphoto, RDF.type, FENTRY.Photograph))
-        self.graph.add((myphoto, CRM.P1_is_identified_by, Literal(self.entry_id)))
-        self.graph.add((self.myentry, CRM.P70_documents, myphoto))
-        self.graph.add((myphoto, CRM.P70i_is_documented_in, self.myentry))
-        self.graph.add((self.myentry, FENTRY.describes, myphoto))
-        production = FZERI_FENTRY[self.entry_id + '/photo/production']
-        self.graph.add((production, RDF.type, CRM.E12_Production))
-        self.graph.add((production, CRM.P108_produced, myphoto))
-        self.graph.add((myphoto, CRM.P108i_was_produced_by, production))
-        artwork = FZERI_OAENTRY[self.oaentry_id + '/artwork']
-        self.graph.add((artwork, RDF.type, CRM.E1_CRM_Entity))
-        self.graph.add((artwork, CRM.P1_is_identified_by, Literal(self.oaentry_id)))
+        self.uris = EntryURIs(self.entry_id, self.oaentry_id)
+        self.myentry = self.uris.entry
+        self.sink.add((self.myentry, RDF.type, CRM.E31_Document))
+        self.sink.add((self.myentry, RDF.type, FENTRY.FEntry))
+        self.sink.add((self.myentry, CRM.P1_is_identified_by, Literal(self.entry_id)))
+        title = self.uris.title
+        self.sink.add((title, RDF.type, CRM.E35_Title))
+        self.sink.add((title, RDF.type, DCTERMS.title))
+        self.sink.add((title, RDFS.label, Literal(self.xmlentry.attrib['intestazione'])))
+        self.sink.add((self.myentry, CRM.P102_has_title, title))
+        myphoto = self.uris.photo
+        self.sink.add((myphoto, RDF.type, CRM['E22_Man-Made_Object']))
+        self.sink.add((myphoto, RDF.type, FENTRY.Photograph))
+        self.sink.add((myphoto, CRM.P1_is_identified_by, Literal(self.entry_id)))
+        self.add_link(self.myentry, CRM.P70_documents, myphoto)
+        self.sink.add((self.myentry, FENTRY.describes, myphoto))
+        production = self.uris.production
+        self.sink.add((production, RDF.type, CRM.E12_Production))
+        self.add_link(production, CRM.P108_produced, myphoto)
+        artwork = self.uris.artwork
+        self.vocabulary.add((artwork, RDF.type, CRM.E1_CRM_Entity))
+        self.vocabulary.add((artwork, CRM.P1_is_identified_by, Literal(self.oaentry_id)))
+
+    # Triple templates of the patterns recurring across handlers; they add to the
+    # entry buffer unless given another one (target)
+    # node of class cls labelled text
+    def add_node(self, node, cls, text, target=None):
+        target = self.sink if target is None else target
+        target.extend(((node, RDF.type, cls), (node, RDFS.label, Literal(text))))
+
+    # s prop o, along with o inverse s as listed in INVERSE_PROPERTIES
+    def add_link(self, s, prop, o, target=None):
+        target = self.sink if target is None else target
+        target.extend(((s, prop, o), (o, INVERSE_PROPERTIES[prop], s)))
+
+    # time appellation (E49) date labelled text, identifying timespan
+    def add_time_appellation(self, date, timespan, text):
+        self.sink.extend(((date, RDF.type, CRM.E49_Time_Appellation), (date, RDFS.label, Literal(text)),
+                          (timespan, CRM.P78_is_identified_by, date), (date, CRM.P78i_identifies, timespan)))
+
+    # actor appellation (E82) name labelled text, identifying actor
+    def add_actor_appellation(self, name, actor, text, target=None):
+        target = self.sink if target is None else target
+        target.extend(((name, RDF.type, CRM.E82_Actor_Appellation), (name, RDFS.label, Literal(text)),
+                       (actor, CRM.P131_is_identified_by, name), (name, CRM.P131i_identifies, actor)))
+
+    # type_node as a shared type (E55) labelled text, and the type of node
+    def add_type(self, node, type_node, text):
+        self.vocabulary.extend(((type_node, RDF.type, CRM.E55_Type), (type_node, RDFS.label, TERMS.literal(text))))
+        self.sink.extend(((node, CRM.P2_has_type, type_node), (type_node, CRM.P2i_is_type_of, node)))
+
+    # Add instant as the beginning or end (edge) of timespan, with the typed date of
+    # text (its raw text as label when it is not a date). A qualifier found in text
+    # is added through qualifier_property, unless the paragraph has its own (qualified).
+    # An empty field has no instant.
+    def add_instant(self, timespan, instant, edge, text, qualifier_property, qualified=False):
+        normalized = DATES.normalize(text)
+        if normalized is None:
+            return
+        date, qualifier = normalized
+        self.sink.add((instant, RDF.type, TIME.Instant))
+        if date is None:
+            self.sink.add((instant, RDFS.label, Literal(text)))
+        else:
+            self.sink.add((instant, TIME_PROPERTIES[date.datatype], date))
+        self.sink.add((timespan, RDF.type, TIME.TemporalEntity))
+        self.sink.add((timespan, edge, instant))
+        if qualifier is not None and not qualified:
+            self.sink.add((timespan, qualifier_property, Literal(qualifier)))
+
+    # Link a per-entry actor or place node to the authority node shared by all the
+    # entries using the same name (--reconcile)
+    def reconcile(self, node, kind, text, target=None):
+        if self.reconciler is None:
+            return
+        authority = self.reconciler.resolve(kind, text)
+        if authority is not None:
+            self.vocabulary.add((authority, RDF.type, AUTHORITY_KINDS[kind]))
+            self.vocabulary.add((authority, RDFS.label, TERMS.literal(text)))
+            (self.sink if target is None else target).add((node, OWL.sameAs, authority))
+
+    # Typed date of a time-span identified by a date appellation
+    def add_date_value(self, timespan, text):
+        normalized = DATES.normalize(text)
+        if normalized is not None and normalized[0] is not None:
+            self.sink.add((timespan, CRM.P82_at_some_time_within, normalized[0]))
 
     # begin COPYRIGHT paragraph
     # COPYRIGHT contains only one field
     # example:
     #     CPRD: PI_0219/4/7
     def parse_paragraph_copyright(self, paragraph):
-        copyright_exp_date = FZERI_FENTRY[self.entry_id + '/copyright']
-        self.graph.add((copyright_exp_date, RDF.type, CRM.E30_Right))
-        if paragraph.find("CRPD") is not None:
-            self.graph.add((copyright_exp_date, CRM.P3_has_note, Literal(paragraph.find("CRPD").text)))
-        self.graph.add((copyright_exp_date, CRM.P104i_applies_to, self.myentry))
-        self.graph.add((self.myentry, CRM.P104_is_subject_to, copyright_exp_date))
+        copyright_exp_date = child_uri(self.myentry, 'copyright')
+        self.sink.add((copyright_exp_date, RDF.type, CRM.E30_Right))
+        if "CRPD" in paragraph.first:
+            self.sink.add((copyright_exp_date, CRM.P3_has_note, Literal(paragraph.first["CRPD"])))
+        self.add_link(self.myentry, CRM.P104_is_subject_to, copyright_exp_date)
         ### end COPYRIGHT paragraph
 
     # begin NOTES paragraph
@@ -127,7 +611,7 @@ class FZeriParserSchedaF:
     # example:
     #     OSS: Incollata su cartone delle stesse misure.
     def parse_paragraph_notes(self, paragraph):
-        self.graph.add((self.myentry, CRM.P3_has_note, Literal(paragraph.find("OSS").text)))
+        self.sink.add((self.myentry, CRM.P3_has_note, Literal(paragraph.first["OSS"])))
         ### end NOTES paragraph
 
     # begin SUPERVISOR paragraph
@@ -135,26 +619,24 @@ class FZeriParserSchedaF:
     # example:
     #     FUR: Giudici C.
     def parse_paragraph_supervisor(self, paragraph):
-        node = paragraph.find("FUR")
-        if node is None:
+        if "FUR" not in paragraph.first:
             return
-        supervisor = FZERI_FENTRY[self.entry_id + '/supervisor']
-        self.graph.add((supervisor, RDF.type, CRM.E39_Actor))
-        self.graph.add((supervisor, RDF.type, FOAF.Agent))
-        self.graph.add((supervisor, RDFS.label, Literal(node.text)))
-        self.graph.add((supervisor, FOAF.name, Literal(node.text)))
-        creation = FZERI_FENTRY[self.entry_id + '/cataloguing']
-        self.graph.add((creation, RDF.type, CRM.E65_Creation))
-        self.graph.add((creation, CRM.P11_had_participant, supervisor))
-        self.graph.add((supervisor, CRM.P11i_participated_in, creation))
-        self.graph.add((self.myentry, RDF.type, FOAF.Document))
-        role = FZERI_FENTRY[self.entry_id + '/supervisor/role']
-        self.graph.add((role, RDF.type, PRO.roleInTime))
-        self.graph.add((role, PRO.withRole, Literal("supervisor")))
-        self.graph.add((role, PRO.relatesToDocument, self.myentry))
-        self.graph.add((supervisor, PRO.holdsRoleInTime, role))
-        self.graph.add((creation, CRM.P94_created, self.myentry))
-        self.graph.add((self.myentry, CRM.P94i_was_created_by, creation))
+        name = paragraph.first["FUR"]
+        supervisor = child_uri(self.myentry, 'supervisor')
+        self.sink.add((supervisor, RDF.type, CRM.E39_Actor))
+        self.sink.add((supervisor, RDF.type, FOAF.Agent))
+        self.sink.add((supervisor, RDFS.label, Literal(name)))
+        self.sink.add((supervisor, FOAF.name, Literal(name)))
+        creation = self.uris.cataloguing
+        self.sink.add((creation, RDF.type, CRM.E65_Creation))
+        self.add_link(creation, CRM.P11_had_participant, supervisor)
+        self.sink.add((self.myentry, RDF.type, FOAF.Document))
+        role = child_uri(supervisor, 'role')
+        self.sink.add((role, RDF.type, PRO.roleInTime))
+        self.sink.add((role, PRO.withRole, Literal("supervisor")))
+        self.sink.add((role, PRO.relatesToDocument, self.myentry))
+        self.sink.add((supervisor, PRO.holdsRoleInTime, role))
+        self.add_link(creation, CRM.P94_created, self.myentry)
         ### end SUPERVISOR paragraph
 
     # begin CLASSIFICATION paragraph
@@ -170,46 +652,42 @@ class FZeriParserSchedaF:
     #     SERCDOA: 19030
     #     UBFN: 0199
     def parse_paragraph_classification(self, paragraph):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
+        myphoto = self.uris.photo
         collection = serie = box = issue = None
-        for node in paragraph:
-            if node.tag == "SERCDOA":
-                self.graph.add((self.myentry, CRM.P67_refers_to, FZERI_OAENTRY[node.text]))
-            elif node.tag == "INVN":
-                inv = FZERI_FENTRY[self.entry_id + '/inventory/' + node.text]
-                self.graph.add((inv, RDF.type, CRM.E42_Identifier))
-                self.graph.add((inv, RDFS.label, Literal(node.text)))
-                self.graph.add((inv, CRM.P149i_identifies, myphoto))
-                self.graph.add((myphoto, CRM.P149_is_identified_by, inv))
-            elif node.tag == "UBFP":
-                collection = FZERI_COLLECTION[sha1(node.text.encode('utf-8')).hexdigest()]
-                self.graph.add((collection, RDF.type, CRM.E53_Place))
-                self.graph.add((collection, CRM.P87_is_identified_by, Literal(node.text)))
-            elif node.tag == "UBFS":
-                serie = FZERI_SERIE[sha1(node.text.encode('utf-8')).hexdigest()]
-                self.graph.add((serie, RDF.type, CRM.E53_Place))
-                self.graph.add((serie, CRM.P87_is_identified_by, Literal(node.text)))
-            elif node.tag == "UBFT":
-                box = FZERI_BOX[sha1(node.text.encode('utf-8')).hexdigest() +
-                                "/" + paragraph.find("UBFN").text]
-                self.graph.add((box, RDF.type, CRM.E53_Place))
-                self.graph.add((box, CRM.P87_is_identified_by, Literal(node.text)))
-                self.graph.add((box, CRM.P87_is_identified_by, Literal(paragraph.find("UBFN").text)))
-            elif node.tag == "UBFU":
-                issue = FZERI_BOX[sha1(node.text.encode('utf-8')).hexdigest() +
-                                  "/" + paragraph.find("UBFF").text]
-                self.graph.add((issue, RDF.type, CRM.E53_Place))
-                self.graph.add((issue, CRM.P87_is_identified_by, Literal(node.text)))
-                self.graph.add((issue, CRM.P87_is_identified_by, Literal(paragraph.find("UBFF").text)))
-                self.graph.add((issue, CRM.P54i_is_current_permanent_location_of, myphoto))
-                self.graph.add((myphoto, CRM.P54_has_current_permanent_location, issue))
-            elif node.tag == "UBFC":
-                self.graph.add((myphoto, CRM.P54_has_current_permanent_location, Literal(node.text)))
+        for tag, text in paragraph.items:
+            if tag == "SERCDOA":
+                self.sink.add((self.myentry, CRM.P67_refers_to, FZERI_OAENTRY[text]))
+            elif tag == "INVN":
+                inv = child_uri(self.myentry, 'inventory', text)
+                self.inventory_ids.append(text)
+                self.add_node(inv, CRM.E42_Identifier, text)
+                self.add_link(myphoto, CRM.P149_is_identified_by, inv)
+            elif tag == "UBFP":
+                collection = TERMS.hashed(FZERI_COLLECTION, text)
+                self.vocabulary.add((collection, RDF.type, CRM.E53_Place))
+                self.vocabulary.add((collection, CRM.P87_is_identified_by, TERMS.literal(text)))
+            elif tag == "UBFS":
+                serie = TERMS.hashed(FZERI_SERIE, text)
+                self.vocabulary.add((serie, RDF.type, CRM.E53_Place))
+                self.vocabulary.add((serie, CRM.P87_is_identified_by, TERMS.literal(text)))
+            elif tag == "UBFT":
+                box = TERMS.hashed(FZERI_BOX, text, "/" + paragraph.first["UBFN"])
+                self.vocabulary.add((box, RDF.type, CRM.E53_Place))
+                self.vocabulary.add((box, CRM.P87_is_identified_by, TERMS.literal(text)))
+                self.vocabulary.add((box, CRM.P87_is_identified_by, TERMS.literal(paragraph.first["UBFN"])))
+            elif tag == "UBFU":
+                issue = TERMS.hashed(FZERI_BOX, text, "/" + paragraph.first["UBFF"])
+                self.vocabulary.add((issue, RDF.type, CRM.E53_Place))
+                self.vocabulary.add((issue, CRM.P87_is_identified_by, TERMS.literal(text)))
+                self.vocabulary.add((issue, CRM.P87_is_identified_by, TERMS.literal(paragraph.first["UBFF"])))
+                self.add_link(myphoto, CRM.P54_has_current_permanent_location, issue)
+            elif tag == "UBFC":
+                self.sink.add((myphoto, CRM.P54_has_current_permanent_location, Literal(text)))
         contained = issue
         for container in box, serie, collection:
             if container:
-                self.graph.add((container, CRM.P59_has_section, contained))
-                self.graph.add((contained, CRM.P59i_is_located_on_or_within, container))
+                self.vocabulary.add((container, CRM.P59_has_section, contained))
+                self.vocabulary.add((contained, CRM.P59i_is_located_on_or_within, container))
                 contained = container
         ### end CLASSIFICATION paragraph
 
@@ -218,21 +696,18 @@ class FZeriParserSchedaF:
     #     CDGG: proprietà Ente pubblico non territoriale
     #     CDGS: Alma Mater Studiorum Università di Bologna
     def parse_paragraph_ownership(self, paragraph):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        acquisition = FZERI_FENTRY[self.entry_id + '/photo/ownership']
-        self.graph.add((acquisition, RDF.type, CRM.E8_Acquisition))
-        self.graph.add((acquisition, CRM.P24_transferred_title_of, myphoto))
-        self.graph.add((myphoto, CRM.P24i_changed_ownership_through, acquisition))
-        for node in paragraph:
-            if node.tag == "CDGS":
-                actor = FZERI_FENTRY[self.entry_id + '/photo/ownership/owner']
-                self.graph.add((actor, RDF.type, CRM.E39_Actor))
-                self.graph.add((actor, RDFS.label, Literal(node.text)))
-                self.graph.add((actor, CRM.P22i_acquired_title_through, acquisition))
-                self.graph.add((acquisition, CRM.P22_transferred_title_to, actor))
-            elif node.tag == "CDGG":
-                acquisition = FZERI_FENTRY[self.entry_id + '/photo/ownership']
-                self.graph.add((acquisition, CRM.P3_has_note, Literal(node.text)))
+        myphoto = self.uris.photo
+        acquisition = child_uri(myphoto, 'ownership')
+        self.sink.add((acquisition, RDF.type, CRM.E8_Acquisition))
+        self.add_link(acquisition, CRM.P24_transferred_title_of, myphoto)
+        for tag, text in paragraph.items:
+            if tag == "CDGS":
+                actor = child_uri(acquisition, 'owner')
+                self.add_node(actor, CRM.E39_Actor, text)
+                self.reconcile(actor, 'actor', text)
+                self.add_link(acquisition, CRM.P22_transferred_title_to, actor)
+            elif tag == "CDGG":
+                self.sink.add((acquisition, CRM.P3_has_note, Literal(text)))
         ### end OWNERSHIP paragraph
 
     # begin CODES paragraph
@@ -243,42 +718,33 @@ class FZeriParserSchedaF:
     #     LIR: I
     # TODO: LIR field has yet to be mapped
     def parse_paragraph_codes(self, paragraph):
-        for node in paragraph:
-            if node.tag == "TSK":
-                entry_type = FZERI_ENTRYTYPE[node.text]
-                self.graph.add((entry_type, RDF.type, CRM.E55_Type))
-                self.graph.add((entry_type, RDFS.label, Literal(node.text)))
-                self.graph.add((self.myentry, CRM.P2_has_type, entry_type))
-                self.graph.add((entry_type, CRM.P2i_is_type_of, self.myentry))
-            elif node.tag == "NCTN":
-                identifier = FZERI_FENTRY[self.entry_id + '/id_number']
-                self.graph.add((identifier, RDF.type, CRM.E42_Identifier))
-                self.graph.add((identifier, RDFS.label, Literal(node.text)))
-                self.graph.add((identifier, CRM.P2_has_type, FZERI_IDENTIFIER.id_number))
-                self.graph.add((FZERI_IDENTIFIER.id_number, CRM.P2i_is_type_of, identifier))
-                self.graph.add((self.myentry, CRM.P48_has_preferred_identifier, identifier))
-                self.graph.add((identifier, CRM.P48i_is_preferred_identifier_of, self.myentry))
-            elif node.tag == "NCTR":
-                identifier = FZERI_FENTRY[self.entry_id + '/regional_code']
-                self.graph.add((identifier, RDF.type, CRM.E42_Identifier))
-                self.graph.add((identifier, RDFS.label, Literal(node.text)))
-                self.graph.add((identifier, CRM.P2_has_type, FZERI_IDENTIFIER.regional_code))
-                self.graph.add((FZERI_IDENTIFIER.regional_code, CRM.P2i_is_type_of, identifier))
-                self.graph.add((identifier, CRM.P48i_is_preferred_identifier_of, self.myentry))
-                self.graph.add((self.myentry, CRM.P48_has_preferred_identifier, identifier))
-            elif node.tag == "ESC":
-                actor = FZERI_FENTRY[self.entry_id + '/keeper']
-                self.graph.add((actor, RDF.type, CRM.E40_Legal_Body))
-                self.graph.add((actor, RDF.type, FOAF.Agent))
-                self.graph.add((actor, FOAF.name, Literal(node.text)))
-                role = FZERI_FENTRY[self.entry_id + '/keeper/role']
-                self.graph.add((role, RDF.type, PRO.roleInTime))
-                self.graph.add((role, PRO.withRole, Literal("keeper")))
-                self.graph.add((role, PRO.relatesToDocument, self.myentry))
-                self.graph.add((actor, CRM.P50i_is_current_keeper_of, self.myentry))
-                self.graph.add((self.myentry, CRM.P50_has_current_keeper, actor))
+        for tag, text in paragraph.items:
+            if tag == "TSK":
+                entry_type = FZERI_ENTRYTYPE[text]
+                self.add_type(self.myentry, entry_type, text)
+            elif tag == "NCTN":
+                identifier = child_uri(self.myentry, 'id_number')
+                self.add_node(identifier, CRM.E42_Identifier, text)
+                self.add_link(identifier, CRM.P2_has_type, FZERI_IDENTIFIER.id_number)
+                self.add_link(self.myentry, CRM.P48_has_preferred_identifier, identifier)
+            elif tag == "NCTR":
+                identifier = child_uri(self.myentry, 'regional_code')
+                self.add_node(identifier, CRM.E42_Identifier, text)
+                self.add_link(identifier, CRM.P2_has_type, FZERI_IDENTIFIER.regional_code)
+                self.add_link(self.myentry, CRM.P48_has_preferred_identifier, identifier)
+            elif tag == "ESC":
+                actor = child_uri(self.myentry, 'keeper')
+                self.sink.add((actor, RDF.type, CRM.E40_Legal_Body))
+                self.sink.add((actor, RDF.type, FOAF.Agent))
+                self.sink.add((actor, FOAF.name, Literal(text)))
+                self.reconcile(actor, 'actor', text)
+                role = child_uri(actor, 'role')
+                self.sink.add((role, RDF.type, PRO.roleInTime))
+                self.sink.add((role, PRO.withRole, Literal("keeper")))
+                self.sink.add((role, PRO.relatesToDocument, self.myentry))
+                self.add_link(self.myentry, CRM.P50_has_current_keeper, actor)
             # TODO: LIR has yet to be mapped
-            elif node.tag == "LIR":
+            elif tag == "LIR":
                 pass
         ### end CODES paragraph
 
@@ -287,27 +753,23 @@ class FZeriParserSchedaF:
     #     CMPD: 10/10/2005 0.00.00
     #     CMPN: Erika Giuliani
     def parse_paragraph_cataloguing(self, paragraph):
-        creation = FZERI_FENTRY[self.entry_id + '/cataloguing']
-        self.graph.add((creation, RDF.type, CRM.E65_Creation))
-        for node in paragraph:
-            if node.tag == "CMPD":
-                timespan = FZERI_FENTRY[self.entry_id + '/cataloguing/ts']
-                self.graph.add((timespan, RDF.type, CRM['E52_Time-Span']))
-                date = FZERI_FENTRY[self.entry_id + '/cataloguing/date']
-                self.graph.add((date, RDF.type, CRM.E49_Time_Appellation))
-                self.graph.add((date, RDFS.label, Literal(node.text)))
-                self.graph.add((date, CRM.P78i_identifies, timespan))
-                self.graph.add((timespan, CRM.P78_is_identified_by, date))
-                self.graph.add((timespan, CRM['P4i_is_time-span_of'], timespan))
-                self.graph.add((creation, CRM['P4_has_time-span'], timespan))
-            elif node.tag == "CMPN":
-                actor = FZERI_FENTRY[self.entry_id + '/cataloguing/actor']
-                self.graph.add((actor, RDF.type, CRM.E39_Actor))
-                self.graph.add((actor, RDFS.label, Literal(node.text)))
-                self.graph.add((actor, CRM.P14i_performed, creation))
-                self.graph.add((creation, CRM.P14_carried_out_by, actor))
-        self.graph.add((creation, CRM.P94_created, self.myentry))
-        self.graph.add((self.myentry, CRM.P94i_was_created_by, creation))
+        creation = self.uris.cataloguing
+        self.sink.add((creation, RDF.type, CRM.E65_Creation))
+        for tag, text in paragraph.items:
+            if tag == "CMPD":
+                timespan = child_uri(creation, 'ts')
+                self.sink.add((timespan, RDF.type, CRM['E52_Time-Span']))
+                date = child_uri(creation, 'date')
+                self.add_time_appellation(date, timespan, text)
+                self.add_date_value(timespan, text)
+                self.sink.add((timespan, CRM['P4i_is_time-span_of'], timespan))
+                self.sink.add((creation, CRM['P4_has_time-span'], timespan))
+            elif tag == "CMPN":
+                actor = child_uri(creation, 'actor')
+                self.add_node(actor, CRM.E39_Actor, text)
+                self.reconcile(actor, 'actor', text)
+                self.add_link(creation, CRM.P14_carried_out_by, actor)
+        self.add_link(creation, CRM.P94_created, self.myentry)
         ### end CATALOGUING paragraph
 
     # begin UPDATING paragraph
@@ -315,27 +777,22 @@ class FZeriParserSchedaF:
     #     AGGD: 09/10/2012
     #     AGGN: Marcello Rossini
     def parse_paragraph_updating(self, paragraph, rep):
-        transformation = FZERI_FENTRY[self.entry_id + '/cataloguing/update/' + str(rep)]
-        self.graph.add((transformation, RDF.type, CRM.E81_Transformation))
-        for node in paragraph:
-            if node.tag == "AGGD":
-                timespan = FZERI_FENTRY[self.entry_id + '/cataloguing/update/' + str(rep) + '/ts']
-                self.graph.add((timespan, RDF.type, CRM['E52_Time-Span']))
-                self.graph.add((timespan, CRM['P4i_is_time-span_of'], transformation))
-                self.graph.add((transformation, CRM['P4_has_time-span'], timespan))
-                date = FZERI_FENTRY[self.entry_id + '/cataloguing/update/' + str(rep) + '/date']
-                self.graph.add((date, RDF.type, CRM.E49_Time_Appellation))
-                self.graph.add((date, RDFS.label, Literal(node.text)))
-                self.graph.add((date, CRM.P78i_identifies, timespan))
-                self.graph.add((timespan, CRM.P78_is_identified_by, date))
-            elif node.tag == "AGGN":
-                actor = FZERI_FENTRY[self.entry_id + '/cataloguing/update/' + str(rep) + '/actor']
-                self.graph.add((actor, RDF.type, CRM.E39_Actor))
-                self.graph.add((actor, RDFS.label, Literal(node.text)))
-                self.graph.add((actor, CRM.P11i_participated_in, transformation))
-                self.graph.add((transformation, CRM.P11_had_participant, actor))
-        self.graph.add((transformation, CRM.P124_transformed, self.myentry))
-        self.graph.add((self.myentry, CRM.P124i_was_transformed_by, transformation))
+        transformation = child_uri(self.uris.cataloguing, 'update', str(rep))
+        self.sink.add((transformation, RDF.type, CRM.E81_Transformation))
+        for tag, text in paragraph.items:
+            if tag == "AGGD":
+                timespan = child_uri(transformation, 'ts')
+                self.sink.add((timespan, RDF.type, CRM['E52_Time-Span']))
+                self.add_link(transformation, CRM['P4_has_time-span'], timespan)
+                date = child_uri(transformation, 'date')
+                self.add_time_appellation(date, timespan, text)
+                self.add_date_value(timespan, text)
+            elif tag == "AGGN":
+                actor = child_uri(transformation, 'actor')
+                self.add_node(actor, CRM.E39_Actor, text)
+                self.reconcile(actor, 'actor', text)
+                self.add_link(transformation, CRM.P11_had_participant, actor)
+        self.add_link(transformation, CRM.P124_transformed, self.myentry)
         ### end UPDATING paragraph
 
     # begin OBJECT paragraph
@@ -352,41 +809,53 @@ class FZeriParserSchedaF:
     #     MISU: mm
     #     OGTD: positivo
     def parse_paragraph_object(self, paragraph):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
+        myphoto = self.uris.photo
         dimensions = {"MISA": "height", "MISL": "width", "MISD": "diameter"}
-        for node in paragraph:
-            if node.tag == "OGTD":
-                self.graph.add((myphoto, CRM.P2_has_type, Literal(node.text)))
-            elif node.tag == "QNTN":
-                self.graph.add((myphoto, CRM.P57_has_number_of_parts, Literal(node.text)))
-            elif node.tag == "OGTB":
-                self.graph.add((myphoto, DC.type, Literal(node.text)))
-            elif node.tag == "OGTS":
-                self.graph.add((myphoto, DC['format'], FZERI_PHOTOFORMAT[quote_plus(node.text)]))
-            elif node.tag == "MTX":
-                self.graph.add((myphoto, DC['format'], FZERI_PHOTOCOLOR[quote_plus(node.text)]))
-            elif node.tag == "MTC":
-                self.graph.add((myphoto, CRM.P45_consists_of, FZERI_MATERIAL[quote_plus(node.text)]))
-                self.graph.add((FZERI_MATERIAL[quote_plus(node.text)], CRM.P45i_is_incorporated_in,
-                                myphoto))
-            elif node.tag in dimensions.keys():
-                dimension = FZERI_FENTRY[self.entry_id + '/photo/' + dimensions[node.tag]]
-                self.graph.add((dimension, RDF.type, CRM.E54_Dimension))
-                self.graph.add((dimension, CRM.P2_has_type, FZERI_DIMENSION[dimensions[node.tag]]))
-                self.graph.add((FZERI_DIMENSION[dimensions[node.tag]], CRM.P2i_is_type_of, dimension))
-                self.graph.add((dimension, CRM.P90_has_value, Literal(node.text)))
-                if paragraph.find("MISU") is not None:
-                    self.graph.add((dimension, CRM.P91_has_unit,
-                                    unit_fzeri_to_qudt[paragraph.find("MISU").text]))
-                    self.graph.add((unit_fzeri_to_qudt[paragraph.find("MISU").text],
-                                    CRM.P91i_is_unit_of, dimension))
-                if paragraph.find("MISO") is not None:
-                    self.graph.add((dimension, CRM.P2_has_type,
-                                    FZERI_DIMENSION[quote_plus(paragraph.find("MISO").text)]))
-                    self.graph.add((FZERI_DIMENSION[quote_plus(paragraph.find("MISO").text)],
-                                    CRM.P2i_is_type_of, dimension))
-                self.graph.add((dimension, CRM.P43i_is_dimension_of, myphoto))
-                self.graph.add((myphoto, CRM.P43_has_dimension, dimension))
+        unit = None
+        if "MISU" in paragraph.first:
+            unit = fzeri_to_qudt(paragraph.first["MISU"])
+            if unit is None:
+                if paragraph.first["MISU"] not in self.unknown_units:
+                    logger.warning("Entry %s: unknown unit %s", self.entry_id, paragraph.first["MISU"])
+                self.unknown_units[paragraph.first["MISU"]] += 1
+        for tag, text in paragraph.items:
+            if tag == "OGTD":
+                self.sink.add((myphoto, CRM.P2_has_type, Literal(text)))
+            elif tag == "QNTN":
+                self.sink.add((myphoto, CRM.P57_has_number_of_parts, Literal(text)))
+            elif tag == "OGTB":
+                self.sink.add((myphoto, DC.type, Literal(text)))
+            elif tag == "OGTS":
+                self.sink.add((myphoto, DC['format'], TERMS.quoted(FZERI_PHOTOFORMAT, text)))
+            elif tag == "MTX":
+                self.sink.add((myphoto, DC['format'], TERMS.quoted(FZERI_PHOTOCOLOR, text)))
+            elif tag == "MTC":
+                material = TERMS.quoted(FZERI_MATERIAL, text)
+                self.add_link(myphoto, CRM.P45_consists_of, material)
+            elif tag in dimensions:
+                dimension = child_uri(myphoto, dimensions[tag])
+                self.sink.add((dimension, RDF.type, CRM.E54_Dimension))
+                self.add_link(dimension, CRM.P2_has_type, FZERI_DIMENSION[dimensions[tag]])
+                measure = parse_dimension(text)
+                if measure is None:
+                    # keep what can't be read as a number, an empty measure having nothing to keep
+                    if text:
+                        self.sink.add((dimension, RDFS.label, Literal(text)))
+                else:
+                    lower, upper, approximate = measure
+                    if lower == upper:
+                        self.sink.add((dimension, CRM.P90_has_value, lower))
+                    else:
+                        self.sink.add((dimension, CRM.P90a_has_lower_value_limit, lower))
+                        self.sink.add((dimension, CRM.P90b_has_upper_value_limit, upper))
+                    if approximate or lower != upper:
+                        self.sink.add((dimension, RDFS.label, Literal(text)))
+                if unit is not None:
+                    self.add_link(dimension, CRM.P91_has_unit, unit)
+                if "MISO" in paragraph.first:
+                    dimension_type = TERMS.quoted(FZERI_DIMENSION, paragraph.first["MISO"])
+                    self.add_link(dimension, CRM.P2_has_type, dimension_type)
+                self.add_link(myphoto, CRM.P43_has_dimension, dimension)
 
     # begin SUBJECT paragraph
     # example:
@@ -398,35 +867,31 @@ class FZeriParserSchedaF:
     #     SGLS: del catalogatore
     #     OGTD: dipinto
     def parse_paragraph_subject(self, paragraph):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        depicted_subject = FZERI_FENTRY[self.entry_id + '/photo/subject']
-        subj_title = FZERI_FENTRY[self.entry_id + '/photo/subject/title']
-        self.graph.add((subj_title, RDF.type, CRM.E35_Title))
-        self.graph.add((subj_title, RDF.type, DCTERMS.title))
-        self.graph.add((depicted_subject, RDF.type, CRM.E1_CRM_Entity))
-        self.graph.add((depicted_subject, CRM.P62i_is_depicted_by, myphoto))
-        self.graph.add((myphoto, CRM.P62_depicts, depicted_subject))
-        for node in paragraph:
-            if node.tag == "SGTI":
-                self.graph.add((depicted_subject, CRM.P1_is_identified_by, Literal(node.text)))
-            elif node.tag == "SGLT":
-                self.graph.add((subj_title, RDFS.label, Literal(node.text)))
-                self.graph.add((subj_title, FENTRY.isProperTitleOf, depicted_subject))
-                self.graph.add((depicted_subject, FENTRY.hasProperTitle, subj_title))
-            elif node.tag == "SGLL":
-                self.graph.add((subj_title, RDFS.label, Literal(node.text)))
-                self.graph.add((subj_title, FENTRY.isParallelTitleOf, depicted_subject))
-                self.graph.add((depicted_subject, FENTRY.hasParallelTitle, subj_title))
-            elif node.tag == "SGLA":
-                self.graph.add((subj_title, RDFS.label, Literal(node.text)))
-                self.graph.add((subj_title, FENTRY.isAttributedTitleOf, depicted_subject))
-                self.graph.add((depicted_subject, FENTRY.hasAttributedTitle, subj_title))
-            elif node.tag == "SGLS":
-                self.graph.add((subj_title, CRM.P3_has_note, Literal(node.text)))
-            elif node.tag == "FTAT":
-                self.graph.add((depicted_subject, CRM.P3_has_note, Literal(node.text)))
-            elif node.tag == "OGTD":
-                self.graph.add((depicted_subject, CRM.P2_has_type, Literal(node.text)))
+        myphoto = self.uris.photo
+        depicted_subject = child_uri(myphoto, 'subject')
+        subj_title = child_uri(depicted_subject, 'title')
+        self.sink.add((subj_title, RDF.type, CRM.E35_Title))
+        self.sink.add((subj_title, RDF.type, DCTERMS.title))
+        self.sink.add((depicted_subject, RDF.type, CRM.E1_CRM_Entity))
+        self.add_link(myphoto, CRM.P62_depicts, depicted_subject)
+        for tag, text in paragraph.items:
+            if tag == "SGTI":
+                self.sink.add((depicted_subject, CRM.P1_is_identified_by, Literal(text)))
+            elif tag == "SGLT":
+                self.sink.add((subj_title, RDFS.label, Literal(text)))
+                self.add_link(depicted_subject, FENTRY.hasProperTitle, subj_title)
+            elif tag == "SGLL":
+                self.sink.add((subj_title, RDFS.label, Literal(text)))
+                self.add_link(depicted_subject, FENTRY.hasParallelTitle, subj_title)
+            elif tag == "SGLA":
+                self.sink.add((subj_title, RDFS.label, Literal(text)))
+                self.add_link(depicted_subject, FENTRY.hasAttributedTitle, subj_title)
+            elif tag == "SGLS":
+                self.sink.add((subj_title, CRM.P3_has_note, Literal(text)))
+            elif tag == "FTAT":
+                self.sink.add((depicted_subject, CRM.P3_has_note, Literal(text)))
+            elif tag == "OGTD":
+                self.sink.add((depicted_subject, CRM.P2_has_type, Literal(text)))
         ### end SUBJECT paragraph
 
     # begin AUTHOR paragraph
@@ -435,43 +900,34 @@ class FZeriParserSchedaF:
     #     AUTB: Scuola italiana, scuola toscana, scuola senese
     #     AUTP: Girolamo del Guasta
     #     AUTI: Palmezzano Marco (?)
+    # The author describes the artwork, which every entry of the same schedaOA shares,
+    # so its triples are shared resources too
     def parse_paragraph_author(self, paragraph, rep):
         # TODO: isn't it already described in the actual artwork?
-        artwork = FZERI_OAENTRY[self.oaentry_id + '/artwork']
-        production = FZERI_OAENTRY[self.oaentry_id + '/artwork/production/' + str(rep)]
-        self.graph.add((production, RDF.type, CRM.E12_Production))
-        self.graph.add((production, CRM.P108_produced, artwork))
-        self.graph.add((artwork, CRM.P108i_was_produced_by, production))
-        actor = FZERI_OAENTRY[self.oaentry_id + '/artwork/production/' + str(rep) + '/author']
-        self.graph.add((actor, RDF.type, CRM.E39_Actor))
-        self.graph.add((actor, CRM.P14i_performed, production))
-        self.graph.add((production, CRM.P14_carried_out_by, actor))
+        shared = self.vocabulary
+        artwork = self.uris.artwork
+        production = child_uri(artwork, 'production', str(rep))
+        shared.add((production, RDF.type, CRM.E12_Production))
+        self.add_link(production, CRM.P108_produced, artwork, shared)
+        actor = child_uri(production, 'author')
+        shared.add((actor, RDF.type, CRM.E39_Actor))
+        self.add_link(production, CRM.P14_carried_out_by, actor, shared)
         # TODO: add PROV-O relations (as specified in TPDL paper)
-        for node in paragraph:
-            if node.tag == "AUTN":
-                proper_name = FZERI_OAENTRY[self.oaentry_id + '/artwork/production/' + str(rep) + '/author/proper_name']
-                self.graph.add((proper_name, RDF.type, CRM.E82_Actor_Appellation))
-                self.graph.add((proper_name, RDFS.label, Literal(node.text)))
-                self.graph.add((proper_name, CRM.P131i_identifies, actor))
-                self.graph.add((actor, CRM.P131_is_identified_by, proper_name))
-            elif node.tag == "AUTP":
-                pseudonym = FZERI_OAENTRY[self.oaentry_id + '/artwork/production/' + str(rep) + '/author/pseudonym']
-                self.graph.add((pseudonym, RDF.type, CRM.E82_Actor_Appellation))
-                self.graph.add((pseudonym, RDFS.label, Literal(node.text)))
-                self.graph.add((pseudonym, CRM.P131i_identifies, actor))
-                self.graph.add((actor, CRM.P131_is_identified_by, pseudonym))
-            elif node.tag == "AUTI":
-                other_name = FZERI_OAENTRY[self.oaentry_id + '/artwork/production/' + str(rep) + '/author/other_name']
-                self.graph.add((other_name, RDF.type, CRM.E82_Actor_Appellation))
-                self.graph.add((other_name, RDFS.label, Literal(node.text)))
-                self.graph.add((other_name, CRM.P131i_identifies, actor))
-                self.graph.add((actor, CRM.P131_is_identified_by, other_name))
-            elif node.tag == "AUTB":
-                context = FZERI_OAENTRY[self.oaentry_id + '/artwork/production/' + str(rep) + '/author/context']
-                self.graph.add((context, RDF.type, CRM.E62_String))
-                self.graph.add((context, RDFS.label, Literal(node.text)))
-                self.graph.add((actor, FENTRY.hasCulturalContext, context))
-                self.graph.add((context, FENTRY.isCulturalContextOf, actor))
+        for tag, text in paragraph.items:
+            if tag == "AUTN":
+                proper_name = child_uri(actor, 'proper_name')
+                self.add_actor_appellation(proper_name, actor, text, shared)
+                self.reconcile(actor, 'actor', text, shared)
+            elif tag == "AUTP":
+                pseudonym = child_uri(actor, 'pseudonym')
+                self.add_actor_appellation(pseudonym, actor, text, shared)
+            elif tag == "AUTI":
+                other_name = child_uri(actor, 'other_name')
+                self.add_actor_appellation(other_name, actor, text, shared)
+            elif tag == "AUTB":
+                context = child_uri(actor, 'context')
+                self.add_node(context, CRM.E62_String, text, shared)
+                self.add_link(actor, FENTRY.hasCulturalContext, context, shared)
         ### end AUTHOR paragraph
 
     # begin DATING paragraph
@@ -484,52 +940,37 @@ class FZeriParserSchedaF:
     #     DTSL: ca.
     #     DTSI: 1967
     def parse_paragraph_dating(self, paragraph):
-        production = FZERI_FENTRY[self.entry_id + '/photo/production']
-        p_production = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter)]
-        self.graph.add((p_production, RDF.type, CRM.E12_Production))
-        self.graph.add((p_production, CRM.P9i_forms_part_of, production))
-        self.graph.add((production, CRM.P9_consists_of, p_production))
-        timespan = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter) + '/date']
-        self.graph.add((timespan, RDF.type, CRM['E52_Time-Span']))
-        self.graph.add((timespan, CRM['P4i_is_time-span_of'], p_production))
-        self.graph.add((p_production, CRM['P4_has_time-span'], timespan))
-        for node in paragraph:
-            if node.tag == "DTZG":
-                century = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                       str(self.production_counter) + '/date/century']
-                self.graph.add((century, RDF.type, CRM.E49_Time_Appellation))
-                self.graph.add((century, RDFS.label, Literal(node.text)))
-                self.graph.add((century, CRM.P78i_identifies, timespan))
-                self.graph.add((timespan, CRM.P78_is_identified_by, century))
-            elif node.tag == "DTSI":
-                begin = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                     str(self.production_counter) + '/date/begin']
-                self.graph.add((begin, RDF.type, TIME.Instant))
-                self.graph.add((begin, TIME.inXSDDateTime, Literal(node.text)))
-                self.graph.add((timespan, RDF.type, TIME.TemporalEntity))
-                self.graph.add((timespan, TIME.hasBeginning, begin))
-                if paragraph.find("DTSV") is not None:
-                    self.graph.add((timespan, CRM.P79_beginning_is_qualified_by, Literal(paragraph.find("DTSV").text)))
-            elif node.tag == "DTSF":
-                end = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                   str(self.production_counter) + '/date/end']
-                self.graph.add((end, RDF.type, TIME.Instant))
-                self.graph.add((end, TIME.inXSDDateTime, Literal(node.text)))
-                self.graph.add((timespan, RDF.type, TIME.TemporalEntity))
-                self.graph.add((timespan, TIME.hasEnd, end))
-                if paragraph.find("DTSL") is not None:
-                    self.graph.add((timespan, CRM.P80_end_is_qualified_by, Literal(paragraph.find("DTSL").text)))
-            elif node.tag == "DTMM":
-                assignment = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                          str(self.production_counter) + '/assignment']
-                self.graph.add((assignment, RDF.type, CRM.E13_Attribute_Assignment))
-                self.graph.add((assignment, CRM.P17_was_motivated_by, Literal(node.text)))
-                self.graph.add((assignment, CRM.P141_assigned, timespan))
-                self.graph.add((timespan, CRM.P141i_was_assigned_by, assignment))
-                self.graph.add((assignment, CRM.P140_assigned_attribute_to, p_production))
-                self.graph.add((p_production, CRM.P140i_was_attributed_by, assignment))
-            elif node.tag == "DTMS":
-                self.graph.add((p_production, CRM.P3_has_note, Literal(node.text)))
+        production = self.uris.production
+        p_production = child_uri(production, str(self.production_counter))
+        self.sink.add((p_production, RDF.type, CRM.E12_Production))
+        self.add_link(production, CRM.P9_consists_of, p_production)
+        timespan = child_uri(p_production, 'date')
+        self.sink.add((timespan, RDF.type, CRM['E52_Time-Span']))
+        self.add_link(p_production, CRM['P4_has_time-span'], timespan)
+        for tag, text in paragraph.items:
+            if tag == "DTZG":
+                century = child_uri(timespan, 'century')
+                self.add_time_appellation(century, timespan, text)
+            elif tag == "DTSI":
+                begin = child_uri(timespan, 'begin')
+                self.add_instant(timespan, begin, TIME.hasBeginning, text, CRM.P79_beginning_is_qualified_by,
+                                 "DTSV" in paragraph.first)
+                if "DTSV" in paragraph.first:
+                    self.sink.add((timespan, CRM.P79_beginning_is_qualified_by, Literal(paragraph.first["DTSV"])))
+            elif tag == "DTSF":
+                end = child_uri(timespan, 'end')
+                self.add_instant(timespan, end, TIME.hasEnd, text, CRM.P80_end_is_qualified_by,
+                                 "DTSL" in paragraph.first)
+                if "DTSL" in paragraph.first:
+                    self.sink.add((timespan, CRM.P80_end_is_qualified_by, Literal(paragraph.first["DTSL"])))
+            elif tag == "DTMM":
+                assignment = child_uri(p_production, 'assignment')
+                self.sink.add((assignment, RDF.type, CRM.E13_Attribute_Assignment))
+                self.sink.add((assignment, CRM.P17_was_motivated_by, Literal(text)))
+                self.add_link(assignment, CRM.P141_assigned, timespan)
+                self.add_link(assignment, CRM.P140_assigned_attribute_to, p_production)
+            elif tag == "DTMS":
+                self.sink.add((p_production, CRM.P3_has_note, Literal(text)))
         self.production_counter += 1
         ### end DATING paragraph
 
@@ -543,67 +984,55 @@ class FZeriParserSchedaF:
     #     AUFR: fotografo principale
     #     AUFS: studio
     def parse_paragraph_photographer(self, paragraph, rep):
-        production = FZERI_FENTRY[self.entry_id + '/photo/production']
-        p_production = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter)]
-        self.graph.add((p_production, RDF.type, CRM.E12_Production))
-        self.graph.add((p_production, CRM.P9i_forms_part_of, production))
-        self.graph.add((production, CRM.P9_consists_of, p_production))
-        actor = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter) + '/photographer']
-        self.graph.add((actor, RDF.type, CRM.E39_Actor))
-        self.graph.add((actor, CRM.P14_performed, p_production))
-        self.graph.add((p_production, CRM.P14_carried_out_by, actor))
-        for node in paragraph:
-            if node.tag == "AUFN":
-                proper_name = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                           str(self.production_counter) + '/photographer/proper_name']
-                self.graph.add((proper_name, RDF.type, CRM.E82_Actor_Appellation))
-                self.graph.add((proper_name, RDFS.label, Literal(node.text)))
-                self.graph.add((actor, CRM.P131_is_identified_by, proper_name))
-            elif node.tag == "AUFI":
+        production = self.uris.production
+        p_production = child_uri(production, str(self.production_counter))
+        self.sink.add((p_production, RDF.type, CRM.E12_Production))
+        self.add_link(production, CRM.P9_consists_of, p_production)
+        actor = child_uri(p_production, 'photographer')
+        self.sink.add((actor, RDF.type, CRM.E39_Actor))
+        self.add_link(p_production, CRM.P14_carried_out_by, actor)
+        for tag, text in paragraph.items:
+            if tag == "AUFN":
+                proper_name = child_uri(actor, 'proper_name')
+                self.add_node(proper_name, CRM.E82_Actor_Appellation, text)
+                self.sink.add((actor, CRM.P131_is_identified_by, proper_name))
+                self.reconcile(actor, 'actor', text)
+            elif tag == "AUFI":
                 # TODO: add VCard Ontology
-                address = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                       str(self.production_counter) + '/photographer/address']
-                self.graph.add((address, RDF.type, CRM.E51_Contact_Point))
-                self.graph.add((address, RDFS.label, Literal(node.text)))
-                self.graph.add((actor, CRM.P76_has_contact_point, address))
-            elif node.tag == "AUFM":
+                address = child_uri(actor, 'address')
+                self.add_node(address, CRM.E51_Contact_Point, text)
+                self.sink.add((actor, CRM.P76_has_contact_point, address))
+            elif tag == "AUFM":
                 try:
                     attribute_assignment
                 except UnboundLocalError:
-                    attribute_assignment = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                                        str(self.production_counter) + '/photographer/assignment']
-                    self.graph.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
-                    self.graph.add((attribute_assignment, CRM.P141_assigned, actor))
-                    self.graph.add((actor, CRM.P141i_was_assigned_by, attribute_assignment))
-                    self.graph.add((attribute_assignment, CRM.P140_assigned_attribute_to, p_production))
-                    self.graph.add((p_production, CRM.P140i_was_attributed_by, attribute_assignment))
-                self.graph.add((attribute_assignment, CRM.P17_was_motivated_by, Literal(node.text)))
-            elif node.tag == "AUFK":
+                    attribute_assignment = child_uri(actor, 'assignment')
+                    self.sink.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
+                    self.add_link(attribute_assignment, CRM.P141_assigned, actor)
+                    self.add_link(attribute_assignment, CRM.P140_assigned_attribute_to, p_production)
+                self.sink.add((attribute_assignment, CRM.P17_was_motivated_by, Literal(text)))
+            elif tag == "AUFK":
                 try:
                     attribute_assignment
                 except UnboundLocalError:
-                    attribute_assignment = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                                        str(self.production_counter) + '/photographer/assignment']
-                    self.graph.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
-                    self.graph.add((attribute_assignment, CRM.P141_assigned, actor))
-                    self.graph.add((actor, CRM.P141i_was_assigned_by, attribute_assignment))
-                    self.graph.add((attribute_assignment, CRM.P140_assigned_attribute_to, p_production))
-                    self.graph.add((p_production, CRM.P140i_was_attributed_by, attribute_assignment))
-                self.graph.add((attribute_assignment, CRM.P16_used_specific_object, Literal(node.text)))
-            elif node.tag == "AUFA":
-                self.graph.add((actor, CRM.P3_has_note, Literal(node.text)))
-            elif node.tag == "AUFS":
-                self.graph.add((actor, CRM.P2_has_type, Literal(node.text)))
-            elif node.tag == "AUFR":
-                self.graph.add((actor, RDF.type, FOAF.Agent))
-                myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-                self.graph.add((myphoto, RDF.type, FOAF.Document))
-                role = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                    str(self.production_counter) + '/photographer/role']
-                self.graph.add((role, RDF.type, PRO.roleInTime))
-                self.graph.add((role, PRO.withRole, Literal(node.text)))
-                self.graph.add((role, PRO.relatesToDocument, myphoto))
-                self.graph.add((actor, PRO.holdsRoleInTime, role))
+                    attribute_assignment = child_uri(actor, 'assignment')
+                    self.sink.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
+                    self.add_link(attribute_assignment, CRM.P141_assigned, actor)
+                    self.add_link(attribute_assignment, CRM.P140_assigned_attribute_to, p_production)
+                self.sink.add((attribute_assignment, CRM.P16_used_specific_object, Literal(text)))
+            elif tag == "AUFA":
+                self.sink.add((actor, CRM.P3_has_note, Literal(text)))
+            elif tag == "AUFS":
+                self.sink.add((actor, CRM.P2_has_type, Literal(text)))
+            elif tag == "AUFR":
+                self.sink.add((actor, RDF.type, FOAF.Agent))
+                myphoto = self.uris.photo
+                self.sink.add((myphoto, RDF.type, FOAF.Document))
+                role = child_uri(actor, 'role')
+                self.sink.add((role, RDF.type, PRO.roleInTime))
+                self.sink.add((role, PRO.withRole, Literal(text)))
+                self.sink.add((role, PRO.relatesToDocument, myphoto))
+                self.sink.add((actor, PRO.holdsRoleInTime, role))
         self.production_counter += 1
         ### end PHOTOGRAPHER paragraph
 
@@ -620,95 +1049,76 @@ class FZeriParserSchedaF:
     #     EDIT: Tilli - Perugia
     #     PDFR: committente
     def parse_paragraph_production_and_publishing(self, paragraph, rep):
-        production = FZERI_FENTRY[self.entry_id + '/photo/production']
-        p_production = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter)]
-        self.graph.add((p_production, RDF.type, CRM.E12_Production))
-        self.graph.add((p_production, CRM.P9i_forms_part_of, production))
-        self.graph.add((production, CRM.P9_consists_of, p_production))
-        publisher = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter) + '/publisher']
-        self.graph.add((publisher, RDF.type, CRM.E39_Actor))
-        self.graph.add((publisher, CRM.P14_performed, p_production))
-        self.graph.add((p_production, CRM.P14_carried_out_by, publisher))
-        for node in paragraph:
-            if node.tag == "PDFN":
-                proper_name = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                           str(self.production_counter) + '/publisher/proper_name']
-                self.graph.add((proper_name, RDF.type, CRM.E82_Actor_Appellation))
-                self.graph.add((proper_name, RDFS.label, Literal(node.text)))
-                self.graph.add((publisher, CRM.P131_is_identified_by, proper_name))
-            elif node.tag == "PDFB":
-                corporate_name = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                              str(self.production_counter) + '/publisher/corporate_name']
-                self.graph.add((corporate_name, RDF.type, CRM.E82_Actor_Appellation))
-                self.graph.add((corporate_name, RDFS.label, Literal(node.text)))
-                self.graph.add((publisher, CRM.P131_is_identified_by, corporate_name))
-            elif node.tag == "PDFI":
+        production = self.uris.production
+        p_production = child_uri(production, str(self.production_counter))
+        self.sink.add((p_production, RDF.type, CRM.E12_Production))
+        self.add_link(production, CRM.P9_consists_of, p_production)
+        publisher = child_uri(p_production, 'publisher')
+        self.sink.add((publisher, RDF.type, CRM.E39_Actor))
+        self.add_link(p_production, CRM.P14_carried_out_by, publisher)
+        for tag, text in paragraph.items:
+            if tag == "PDFN":
+                proper_name = child_uri(publisher, 'proper_name')
+                self.add_node(proper_name, CRM.E82_Actor_Appellation, text)
+                self.sink.add((publisher, CRM.P131_is_identified_by, proper_name))
+                self.reconcile(publisher, 'actor', text)
+            elif tag == "PDFB":
+                corporate_name = child_uri(publisher, 'corporate_name')
+                self.add_node(corporate_name, CRM.E82_Actor_Appellation, text)
+                self.sink.add((publisher, CRM.P131_is_identified_by, corporate_name))
+                self.reconcile(publisher, 'actor', text)
+            elif tag == "PDFI":
                 # TODO: add VCard Ontology
-                address = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                       str(self.production_counter) + '/publisher/address']
-                self.graph.add((address, RDF.type, CRM.E51_Contact_Point))
-                self.graph.add((address, RDFS.label, Literal(node.text)))
-                self.graph.add((publisher, CRM.P76_has_contact_point, address))
-            elif node.tag == "PDFM":
+                address = child_uri(publisher, 'address')
+                self.add_node(address, CRM.E51_Contact_Point, text)
+                self.sink.add((publisher, CRM.P76_has_contact_point, address))
+            elif tag == "PDFM":
                 try:
                     attribute_assignment
                 except UnboundLocalError:
-                    attribute_assignment = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                                        str(self.production_counter) + '/publisher/assignment']
-                    self.graph.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
-                    self.graph.add((attribute_assignment, CRM.P141_assigned, publisher))
-                    self.graph.add((publisher, CRM.P141i_was_assigned_by, attribute_assignment))
-                    self.graph.add((attribute_assignment, CRM.P140_assigned_attribute_to, p_production))
-                    self.graph.add((p_production, CRM.P140i_was_attributed_by, attribute_assignment))
-                self.graph.add((attribute_assignment, CRM.P17_was_motivated_by, Literal(node.text)))
-            elif node.tag == "PDFK":
+                    attribute_assignment = child_uri(publisher, 'assignment')
+                    self.sink.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
+                    self.add_link(attribute_assignment, CRM.P141_assigned, publisher)
+                    self.add_link(attribute_assignment, CRM.P140_assigned_attribute_to, p_production)
+                self.sink.add((attribute_assignment, CRM.P17_was_motivated_by, Literal(text)))
+            elif tag == "PDFK":
                 try:
                     attribute_assignment
                 except UnboundLocalError:
-                    attribute_assignment = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                                        str(self.production_counter) + '/publisher/assignment']
-                    self.graph.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
-                    self.graph.add((attribute_assignment, CRM.P141_assigned, publisher))
-                    self.graph.add((publisher, CRM.P141i_was_assigned_by, attribute_assignment))
-                    self.graph.add((attribute_assignment, CRM.P140_assigned_attribute_to, p_production))
-                    self.graph.add((p_production, CRM.P140i_was_attributed_by, attribute_assignment))
-                self.graph.add((attribute_assignment, CRM.P16_used_specific_object, Literal(node.text)))
-            elif node.tag == "PDFR":
-                self.graph.add((publisher, RDF.type, FOAF.Agent))
-                myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-                self.graph.add((myphoto, RDF.type, FOAF.Document))
-                role = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                    str(self.production_counter) + '/photographer/role']
-                self.graph.add((role, RDF.type, PRO.roleInTime))
-                self.graph.add((role, PRO.withRole, Literal(node.text)))
-                self.graph.add((role, PRO.relatesToDocument, myphoto))
-                self.graph.add((publisher, PRO.holdsRoleInTime, role))
-            elif node.tag == "PDFL":
-                location = FZERI_FENTRY[self.entry_id + '/photo/production/' +
-                                        str(self.production_counter) + '/publisher/location']
-                self.graph.add((location, RDF.type, CRM.E53_Place))
-                self.graph.add((location, RDFS.label, Literal(node.text)))
-                self.graph.add((p_production, CRM.P7_took_place_at, location))
-            elif node.tag == "PDFD":
-                timespan = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter) + '/date']
-                self.graph.add((timespan, RDF.type, CRM['E52_Time-Span']))
-                date = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter) + '/date/year']
-                self.graph.add((date, RDF.type, CRM.E49_Time_Appellation))
-                self.graph.add((date, RDFS.label, Literal(node.text)))
-                self.graph.add((date, CRM.P78i_identifies, timespan))
-                self.graph.add((timespan, CRM.P78_is_identified_by, date))
-                self.graph.add((timespan, CRM['P4i_is_time-span_of'], p_production))
-                self.graph.add((p_production, CRM['P4_has_time-span'], timespan))
+                    attribute_assignment = child_uri(publisher, 'assignment')
+                    self.sink.add((attribute_assignment, RDF.type, CRM.E13_Attribute_Assignment))
+                    self.add_link(attribute_assignment, CRM.P141_assigned, publisher)
+                    self.add_link(attribute_assignment, CRM.P140_assigned_attribute_to, p_production)
+                self.sink.add((attribute_assignment, CRM.P16_used_specific_object, Literal(text)))
+            elif tag == "PDFR":
+                self.sink.add((publisher, RDF.type, FOAF.Agent))
+                myphoto = self.uris.photo
+                self.sink.add((myphoto, RDF.type, FOAF.Document))
+                role = child_uri(p_production, 'photographer', 'role')
+                self.sink.add((role, RDF.type, PRO.roleInTime))
+                self.sink.add((role, PRO.withRole, Literal(text)))
+                self.sink.add((role, PRO.relatesToDocument, myphoto))
+                self.sink.add((publisher, PRO.holdsRoleInTime, role))
+            elif tag == "PDFL":
+                location = child_uri(publisher, 'location')
+                self.add_node(location, CRM.E53_Place, text)
+                self.sink.add((p_production, CRM.P7_took_place_at, location))
+            elif tag == "PDFD":
+                timespan = child_uri(p_production, 'date')
+                self.sink.add((timespan, RDF.type, CRM['E52_Time-Span']))
+                date = child_uri(timespan, 'year')
+                self.add_time_appellation(date, timespan, text)
+                self.add_link(p_production, CRM['P4_has_time-span'], timespan)
             # TODO: EDIT has yet to be mapped
-            elif node.tag == "EDIT":
-                # edition = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter) + '/edition']
-                # self.graph.add((edition, RDF.type, CRM['E52_Time-Span']))
-                # self.graph.add((edition, RDFS.label, Literal(node.text)))
-                # self.graph.add((edition, CRM['P4i_is_time-span_of'], p_production))
-                # self.graph.add((p_production, CRM['P4_has_time-span'], edition))
+            elif tag == "EDIT":
+                # edition = child_uri(p_production, 'edition')
+                # self.sink.add((edition, RDF.type, CRM['E52_Time-Span']))
+                # self.sink.add((edition, RDFS.label, Literal(text)))
+                # self.sink.add((edition, CRM['P4i_is_time-span_of'], p_production))
+                # self.sink.add((p_production, CRM['P4_has_time-span'], edition))
                 pass
             # TODO: SFIT has yet to be mapped
-            elif node.tag == "SFIT":
+            elif tag == "SFIT":
                 pass
         self.production_counter += 1
         ### end PRODUCTION AND PUBLISHING paragraph
@@ -721,48 +1131,37 @@ class FZeriParserSchedaF:
     #     LRD: 1967
     #     LRO: Asta Christie's 11/07/1980
     def parse_paragraph_place_and_date_of_the_shot(self, paragraph):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        creation = FZERI_FENTRY[self.entry_id + '/photo/creation']
-        self.graph.add((creation, RDF.type, CRM.E65_Creation))
-        self.graph.add((creation, CRM.P94_created, myphoto))
-        self.graph.add((myphoto, CRM.P94i_was_created_by, creation))
+        myphoto = self.uris.photo
+        creation = child_uri(myphoto, 'creation')
+        self.sink.add((creation, RDF.type, CRM.E65_Creation))
+        self.add_link(creation, CRM.P94_created, myphoto)
         country = village = None
-        for node in paragraph:
-            if node.tag == "LRD":
-                timespan = FZERI_FENTRY[self.entry_id + '/photo/creation/date']
-                self.graph.add((timespan, RDF.type, CRM['E52_Time-Span']))
-                date = FZERI_FENTRY[self.entry_id + '/photo/creation/date/year']
-                self.graph.add((date, RDF.type, CRM.E49_Time_Appellation))
-                self.graph.add((date, RDFS.label, Literal(node.text)))
-                self.graph.add((date, CRM.P78i_identifies, timespan))
-                self.graph.add((timespan, CRM.P78_is_identified_by, date))
-                self.graph.add((timespan, CRM['P4i_is_time-span_of'], creation))
-                self.graph.add((creation, CRM['P4_has_time-span'], timespan))
-            elif node.tag == "LRCS":
-                country = FZERI_FENTRY[self.entry_id + '/photo/creation/country']
-                self.graph.add((country, RDF.type, CRM.E53_Place))
-                self.graph.add((country, RDFS.label, Literal(node.text)))
-            elif node.tag == "LRCC" or node.tag == "LRA":
-                village = FZERI_FENTRY[self.entry_id + '/photo/creation/village']
-                self.graph.add((village, RDF.type, CRM.E53_Place))
-                self.graph.add((village, RDFS.label, Literal(node.text)))
-            elif node.tag == "LRO":
-                occasion = FZERI_FENTRY[self.entry_id + '/photo/creation/occasion']
-                self.graph.add((occasion, RDF.type, CRM.E4_Period))
-                self.graph.add((occasion, RDFS.label, Literal(node.text)))
-                self.graph.add((occasion, CRM.P10i_contains, creation))
-                self.graph.add((creation, CRM.P10_falls_within, occasion))
+        for tag, text in paragraph.items:
+            if tag == "LRD":
+                timespan = child_uri(creation, 'date')
+                self.sink.add((timespan, RDF.type, CRM['E52_Time-Span']))
+                date = child_uri(timespan, 'year')
+                self.add_time_appellation(date, timespan, text)
+                self.add_link(creation, CRM['P4_has_time-span'], timespan)
+            elif tag == "LRCS":
+                country = child_uri(creation, 'country')
+                self.add_node(country, CRM.E53_Place, text)
+                self.reconcile(country, 'country', text)
+            elif tag == "LRCC" or tag == "LRA":
+                village = child_uri(creation, 'village')
+                self.add_node(village, CRM.E53_Place, text)
+                self.reconcile(village, 'town', text)
+            elif tag == "LRO":
+                occasion = child_uri(creation, 'occasion')
+                self.add_node(occasion, CRM.E4_Period, text)
+                self.add_link(creation, CRM.P10_falls_within, occasion)
         if country and village:
-            self.graph.add((country, CRM.P89i_contains, village))
-            self.graph.add((village, CRM.P89_falls_within, country))
-            self.graph.add((village, CRM.P7i_witnessed, creation))
-            self.graph.add((creation, CRM.P7_took_place_at, village))
+            self.add_link(village, CRM.P89_falls_within, country)
+            self.add_link(creation, CRM.P7_took_place_at, village)
         elif country:
-            self.graph.add((country, CRM.P7i_witnessed, creation))
-            self.graph.add((creation, CRM.P7_took_place_at, country))
+            self.add_link(creation, CRM.P7_took_place_at, country)
         elif village:
-            self.graph.add((village, CRM.P7i_witnessed, creation))
-            self.graph.add((creation, CRM.P7_took_place_at, village))
+            self.add_link(creation, CRM.P7_took_place_at, village)
         ### end PLACE AND DATE OF THE SHOT paragraph
 
     # begin RELATIONS WITH OTHER PHOTOGRAPHIC OBJECTS (NEGATIVE) paragraph
@@ -772,33 +1171,26 @@ class FZeriParserSchedaF:
     #     ROFO: negativo
     #     ROFF: positivo
     def parse_paragraph_relations_with_other_photographic_objects_negative(self, paragraph):
-        production = FZERI_FENTRY[self.entry_id + '/photo/production']
-        p_production = FZERI_FENTRY[self.entry_id + '/photo/production/' + str(self.production_counter)]
-        self.graph.add((p_production, RDF.type, CRM.E12_Production))
-        self.graph.add((p_production, CRM.P9i_forms_part_of, production))
-        self.graph.add((production, CRM.P9_consists_of, p_production))
+        production = self.uris.production
+        p_production = child_uri(production, str(self.production_counter))
+        self.sink.add((p_production, RDF.type, CRM.E12_Production))
+        self.add_link(production, CRM.P9_consists_of, p_production)
         negative = FZERI_NEGATIVE[self.negative_id]
-        self.graph.add((negative, RDF.type, CRM['E22_Man-Made_Object']))
-        self.graph.add((negative, CRM.P1_is_identified_by, Literal(self.negative_id)))
-        self.graph.add((p_production, CRM.P16_used_specific_object, negative))
-        self.graph.add((negative, CRM.P16i_was_used_for, p_production))
-        for node in paragraph:
-            if node.tag == "ROFI":  # the ID we altready mapped in self.negative_id
+        self.sink.add((negative, RDF.type, CRM['E22_Man-Made_Object']))
+        self.sink.add((negative, CRM.P1_is_identified_by, Literal(self.negative_id)))
+        self.add_link(p_production, CRM.P16_used_specific_object, negative)
+        for tag, text in paragraph.items:
+            if tag == "ROFI":  # the ID we altready mapped in self.negative_id
                 pass
-            if node.tag == "ROFC":
+            if tag == "ROFC":
                 place = FZERI_NEGATIVE[self.negative_id + '/location']
-                self.graph.add((place, RDF.type, CRM.E53_Place))
-                self.graph.add((place, RDFS.label, Literal(node.text)))
-                self.graph.add((place, CRM.P55i_is_current_location_of, negative))
-                self.graph.add((negative, CRM.P55_has_current_location, place))
-            if node.tag == "ROFO":
-                neg_type = FZERI_PHOTOTYPE[quote_plus(node.text)]
-                self.graph.add((neg_type, RDF.type, CRM.E55_Type))
-                self.graph.add((neg_type, RDFS.label, Literal(node.text)))
-                self.graph.add((neg_type, CRM.P2i_is_type_of, negative))
-                self.graph.add((negative, CRM.P2_has_type, neg_type))
+                self.add_node(place, CRM.E53_Place, text)
+                self.add_link(negative, CRM.P55_has_current_location, place)
+            if tag == "ROFO":
+                neg_type = TERMS.quoted(FZERI_PHOTOTYPE, text)
+                self.add_type(negative, neg_type, text)
             # TODO: ROFF has yet to be mapped
-            if node.tag == "ROFF":
+            if tag == "ROFF":
                 pass
         self.production_counter += 1
         ### end RELATIONS WITH OTHER PHOTOGRAPHIC OBJECTS (NEGATIVE) paragraph
@@ -811,37 +1203,32 @@ class FZeriParserSchedaF:
     #     FTAX: allegata
     #     FTAP: fotografia digitale
     def parse_paragraph_digital_image(self, paragraph, rep):
-        image_id = paragraph.find('FTAN')
-        if image_id is None:
+        if "FTAN" not in paragraph.first:
             return
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        digital_image = FZERI_FENTRY[self.entry_id + '/photo/dimage/' + str(rep)]
-        self.graph.add((digital_image, RDF.type, CRM.E38_Image))
-        self.graph.add((digital_image, RDF.type, FABIO.DigitalManifestation))
-        self.graph.add((self.myentry, FENTRY.describes, digital_image))
-        self.graph.add((myphoto, FABIO.hasManifestation, digital_image))
-        self.graph.add((digital_image, CRM.P138_represents, myphoto))
-        self.graph.add((myphoto, CRM.P138i_has_representation, digital_image))
-        img_file = FZERI_DIMAGES[image_id.text.replace('\\', '/').strip('/')]
-        self.graph.add((img_file, RDF.type, CRM.E38_Image))
-        self.graph.add((img_file, RDF.type, FABIO.ComputerFile))
-        self.graph.add((img_file, FRBR.exemplar, digital_image))
-        self.graph.add((self.myentry, FENTRY.describes, img_file))
-        self.graph.add((img_file, CRM.P138_represents, digital_image))
-        self.graph.add((digital_image, CRM.P138i_has_representation, img_file))
-        for node in paragraph:
-            if node.tag == "FTAT":
-                self.graph.add((digital_image, CRM.P3_has_note, Literal(node.text)))
-            elif node.tag == "FTAP":
-                image_type = FZERI_PHOTOTYPE[quote_plus(node.text)]
-                self.graph.add((image_type, RDF.type, CRM.E55_Type))
-                self.graph.add((image_type, RDFS.label, Literal(node.text)))
-                self.graph.add((image_type, CRM.P2i_is_type_of, digital_image))
-                self.graph.add((digital_image, CRM.P2_has_type, image_type))
+        myphoto = self.uris.photo
+        digital_image = child_uri(myphoto, 'dimage', str(rep))
+        self.sink.add((digital_image, RDF.type, CRM.E38_Image))
+        self.sink.add((digital_image, RDF.type, FABIO.DigitalManifestation))
+        self.sink.add((self.myentry, FENTRY.describes, digital_image))
+        self.sink.add((myphoto, FABIO.hasManifestation, digital_image))
+        self.add_link(digital_image, CRM.P138_represents, myphoto)
+        img_file = FZERI_DIMAGES[paragraph.first["FTAN"].replace('\\', '/').strip('/')]
+        self.sink.add((img_file, RDF.type, CRM.E38_Image))
+        self.sink.add((img_file, RDF.type, FABIO.ComputerFile))
+        self.sink.add((img_file, FRBR.exemplar, digital_image))
+        self.sink.add((self.myentry, FENTRY.describes, img_file))
+        self.sink.add((img_file, CRM.P138_represents, digital_image))
+        self.sink.add((digital_image, CRM.P138i_has_representation, img_file))
+        for tag, text in paragraph.items:
+            if tag == "FTAT":
+                self.sink.add((digital_image, CRM.P3_has_note, Literal(text)))
+            elif tag == "FTAP":
+                image_type = TERMS.quoted(FZERI_PHOTOTYPE, text)
+                self.add_type(digital_image, image_type, text)
             # TODO: FTAX and VERSO
-            elif node.tag == "FTAX":
+            elif tag == "FTAX":
                 pass
-            elif node.tag == "VERSO":
+            elif tag == "VERSO":
                 pass
         ### end DIGITAL IMAGE paragraph
 
@@ -856,62 +1243,52 @@ class FZeriParserSchedaF:
     #     PRCD: Università degli studi di Roma "La Sapienza": Dipartimento di Storia dell'Arte
     #     PRVC: Firenze
     def parse_paragraph_provenance(self, paragraph, rep):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        provenance = FZERI_FENTRY[self.entry_id + '/photo/provenance' + str(rep)]
-        self.graph.add((provenance, RDF.type, CRM.E53_Place))
-        self.graph.add((provenance, CRM.P53i_is_former_or_current_location_of, myphoto))
-        self.graph.add((myphoto, CRM.P53_has_former_or_current_location, provenance))
-        activity = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/move']
-        self.graph.add((activity, RDF.type, CRM.E9_Move))
-        timespan = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/move/date']
-        self.graph.add((timespan, RDF.type, CRM['E52_Time-Span']))
-        self.graph.add((timespan, CRM['P4i_is_time-span_of'], activity))
-        self.graph.add((activity, CRM['P4_has_time-span'], timespan))
-        self.graph.add((provenance, CRM.P26_moved_to, activity))
-        self.graph.add((provenance, CRM.P26i_was_destination_of, activity))
-        self.graph.add((activity, CRM.P25_moved, myphoto))
-        self.graph.add((myphoto, CRM.P25i_moved_by, activity))
+        myphoto = self.uris.photo
+        provenance = child_uri(myphoto, 'provenance' + str(rep))
+        # the move and the places of the provenance are under provenance/<rep>
+        places = child_uri(myphoto, 'provenance', str(rep))
+        self.sink.add((provenance, RDF.type, CRM.E53_Place))
+        self.add_link(myphoto, CRM.P53_has_former_or_current_location, provenance)
+        activity = child_uri(places, 'move')
+        self.sink.add((activity, RDF.type, CRM.E9_Move))
+        timespan = child_uri(activity, 'date')
+        self.sink.add((timespan, RDF.type, CRM['E52_Time-Span']))
+        self.add_link(activity, CRM['P4_has_time-span'], timespan)
+        self.sink.add((provenance, CRM.P26_moved_to, activity))
+        self.sink.add((provenance, CRM.P26i_was_destination_of, activity))
+        self.add_link(activity, CRM.P25_moved, myphoto)
         country = district = town = repository = None
-        for node in paragraph:
-            if node.tag == "PRDI":
-                begin = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/move/date/begin']
-                self.graph.add((begin, RDF.type, TIME.Instant))
-                self.graph.add((begin, TIME.inXSDDateTime, Literal(node.text)))
-                self.graph.add((timespan, RDF.type, TIME.TemporalEntity))
-                self.graph.add((timespan, TIME.hasBeginning, begin))
-            elif node.tag == "PRDU":
-                end = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/move/date/end']
-                self.graph.add((end, RDF.type, TIME.Instant))
-                self.graph.add((end, TIME.inXSDDateTime, Literal(node.text)))
-                self.graph.add((timespan, RDF.type, TIME.TemporalEntity))
-                self.graph.add((timespan, TIME.hasEnd, end))
-            elif node.tag == "PRVP":
-                district = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/district']
-                self.graph.add((district, RDF.type, CRM.E53_Place))
-                self.graph.add((district, RDFS.label, Literal(node.text)))
-            elif node.tag == "PRVS":
-                country = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/country']
-                self.graph.add((country, RDF.type, CRM.E53_Place))
-                self.graph.add((country, RDFS.label, Literal(node.text)))
-            elif node.tag == "PRVC" or node.tag == "PRL":
-                town = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/town']
-                self.graph.add((town, RDF.type, CRM.E53_Place))
-                self.graph.add((town, RDFS.label, Literal(node.text)))
-            elif node.tag == "PRCM":
-                collection = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/collection']
-                self.graph.add((collection, RDF.type, CRM.E46_Section_Definition))
-                self.graph.add((collection, RDFS.label, Literal(node.text)))
-                self.graph.add((collection, CRM.P87i_identifies, provenance))
-                self.graph.add((provenance, CRM.P87_is_identified_by, collection))
-            elif node.tag == "PRCD":
-                repository = FZERI_FENTRY[self.entry_id + '/photo/provenance/' + str(rep) + '/repository']
-                self.graph.add((repository, RDF.type, CRM.E53_Place))
-                self.graph.add((repository, RDFS.label, Literal(node.text)))
+        for tag, text in paragraph.items:
+            if tag == "PRDI":
+                begin = child_uri(timespan, 'begin')
+                self.add_instant(timespan, begin, TIME.hasBeginning, text, CRM.P79_beginning_is_qualified_by)
+            elif tag == "PRDU":
+                end = child_uri(timespan, 'end')
+                self.add_instant(timespan, end, TIME.hasEnd, text, CRM.P80_end_is_qualified_by)
+            elif tag == "PRVP":
+                district = child_uri(places, 'district')
+                self.add_node(district, CRM.E53_Place, text)
+                self.reconcile(district, 'district', text)
+            elif tag == "PRVS":
+                country = child_uri(places, 'country')
+                self.add_node(country, CRM.E53_Place, text)
+                self.reconcile(country, 'country', text)
+            elif tag == "PRVC" or tag == "PRL":
+                town = child_uri(places, 'town')
+                self.add_node(town, CRM.E53_Place, text)
+                self.reconcile(town, 'town', text)
+            elif tag == "PRCM":
+                collection = child_uri(places, 'collection')
+                self.add_node(collection, CRM.E46_Section_Definition, text)
+                self.add_link(provenance, CRM.P87_is_identified_by, collection)
+            elif tag == "PRCD":
+                repository = child_uri(places, 'repository')
+                self.add_node(repository, CRM.E53_Place, text)
+                self.reconcile(repository, 'repository', text)
         contained = provenance
         for container in repository, town, district, country:
             if container:
-                self.graph.add((container, CRM.P59_has_section, contained))
-                self.graph.add((contained, CRM.P59i_is_located_on_or_within, container))
+                self.add_link(container, CRM.P59_has_section, contained)
                 contained = container
         ### end PROVENANCE paragraph
 
@@ -925,52 +1302,45 @@ class FZeriParserSchedaF:
     #     LDCU: piazzetta G. Morandi, 2
     #     LDCS: Grandi Formati
     def parse_paragraph_location(self, paragraph):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        location = FZERI_FENTRY[self.entry_id + '/photo/location']
-        self.graph.add((location, RDF.type, CRM.E53_Place))
-        self.graph.add((location, CRM.P55i_is_current_location_of, myphoto))
-        self.graph.add((myphoto, CRM.P55_has_current_location, location))
+        myphoto = self.uris.photo
+        location = self.uris.location
+        self.sink.add((location, RDF.type, CRM.E53_Place))
+        self.add_link(myphoto, CRM.P55_has_current_location, location)
         region = district = town = repository = None
-        for node in paragraph:
-            if node.tag == "LDCN":
-                repository = FZERI_FENTRY[self.entry_id + '/photo/location/repository']
-                self.graph.add((repository, RDF.type, CRM.E53_Place))
-                self.graph.add((repository, RDFS.label, Literal(node.text)))
-            elif node.tag == "PVCP":
-                district = FZERI_FENTRY[self.entry_id + '/photo/location/district']
-                self.graph.add((district, RDF.type, CRM.E53_Place))
-                self.graph.add((district, RDFS.label, Literal(node.text)))
-            elif node.tag == "PVCR":
-                region = FZERI_FENTRY[self.entry_id + '/photo/location/region']
-                self.graph.add((region, RDF.type, CRM.E53_Place))
-                self.graph.add((region, RDFS.label, Literal(node.text)))
-            elif node.tag == "PVCC":
-                town = FZERI_FENTRY[self.entry_id + '/photo/location/town']
-                self.graph.add((town, RDF.type, CRM.E53_Place))
-                self.graph.add((town, RDFS.label, Literal(node.text)))
-            elif node.tag == "LDCM":
-                collection = FZERI_FENTRY[self.entry_id + '/photo/location/collection']
-                self.graph.add((collection, RDF.type, CRM.E46_Section_Definition))
-                self.graph.add((collection, RDFS.label, Literal(node.text)))
-                self.graph.add((collection, CRM.P87i_identifies, location))
-                self.graph.add((location, CRM.P87_is_identified_by, collection))
-            elif node.tag == "LDCS":
-                precise_location = FZERI_FENTRY[self.entry_id + '/photo/location/precise_location']
-                self.graph.add((precise_location, RDF.type, CRM.E46_Section_Definition))
-                self.graph.add((precise_location, RDFS.label, Literal(node.text)))
-                self.graph.add((precise_location, CRM.P87i_identifies, location))
-                self.graph.add((location, CRM.P87_is_identified_by, precise_location))
-            elif node.tag == "LDCU":
+        for tag, text in paragraph.items:
+            if tag == "LDCN":
+                repository = child_uri(location, 'repository')
+                self.add_node(repository, CRM.E53_Place, text)
+                self.reconcile(repository, 'repository', text)
+            elif tag == "PVCP":
+                district = child_uri(location, 'district')
+                self.add_node(district, CRM.E53_Place, text)
+                self.reconcile(district, 'district', text)
+            elif tag == "PVCR":
+                region = child_uri(location, 'region')
+                self.add_node(region, CRM.E53_Place, text)
+                self.reconcile(region, 'region', text)
+            elif tag == "PVCC":
+                town = child_uri(location, 'town')
+                self.add_node(town, CRM.E53_Place, text)
+                self.reconcile(town, 'town', text)
+            elif tag == "LDCM":
+                collection = child_uri(location, 'collection')
+                self.add_node(collection, CRM.E46_Section_Definition, text)
+                self.add_link(location, CRM.P87_is_identified_by, collection)
+            elif tag == "LDCS":
+                precise_location = child_uri(location, 'precise_location')
+                self.add_node(precise_location, CRM.E46_Section_Definition, text)
+                self.add_link(location, CRM.P87_is_identified_by, precise_location)
+            elif tag == "LDCU":
                 # TODO: add VCard Ontology
-                address = FZERI_FENTRY[self.entry_id + '/photo/location/address']
-                self.graph.add((address, RDF.type, CRM.E53_Place))
-                self.graph.add((address, RDFS.label, Literal(node.text)))
-                self.graph.add((location, CRM.P87_is_identified_by, address))
+                address = child_uri(location, 'address')
+                self.add_node(address, CRM.E53_Place, text)
+                self.sink.add((location, CRM.P87_is_identified_by, address))
         contained = location
         for container in repository, town, district, region:
             if container:
-                self.graph.add((container, CRM.P59_has_section, contained))
-                self.graph.add((contained, CRM.P59i_is_located_on_or_within, container))
+                self.add_link(container, CRM.P59_has_section, contained)
                 contained = container
         ### end LOCATION paragraph
 
@@ -979,20 +1349,16 @@ class FZeriParserSchedaF:
     #     STCS: sbiadimento
     #     STCC: mediocre
     def parse_paragraph_state_of_preservation(self, paragraph):
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        condition = FZERI_FENTRY[self.entry_id + '/photo/condition']
-        self.graph.add((condition, RDF.type, CRM.E3_Condition_State))
-        self.graph.add((condition, CRM.P44i_is_condition_of, myphoto))
-        self.graph.add((myphoto, CRM.P44_has_condition, condition))
-        for node in paragraph:
-            if node.tag == "STCS":
-                self.graph.add((condition, RDFS.label, Literal(node.text)))
-            elif node.tag == "STCC":
-                condition_type = FZERI_CONDITIONTYPE[quote_plus(node.text)]
-                self.graph.add((condition_type, RDF.type, CRM.E55_Type))
-                self.graph.add((condition_type, RDFS.label, Literal(node.text)))
-                self.graph.add((condition_type, CRM.P2i_is_type_of, condition))
-                self.graph.add((condition, CRM.P2_has_type, condition_type))
+        myphoto = self.uris.photo
+        condition = child_uri(myphoto, 'condition')
+        self.sink.add((condition, RDF.type, CRM.E3_Condition_State))
+        self.add_link(myphoto, CRM.P44_has_condition, condition)
+        for tag, text in paragraph.items:
+            if tag == "STCS":
+                self.sink.add((condition, RDFS.label, Literal(text)))
+            elif tag == "STCC":
+                condition_type = TERMS.quoted(FZERI_CONDITIONTYPE, text)
+                self.add_type(condition, condition_type, text)
         ### end STATE OF PRESERVATION paragraph
 
     # begin RELATION TO OTHER OBJECTS paragraph
@@ -1000,18 +1366,22 @@ class FZeriParserSchedaF:
     #     OGTI: Collage di fotografie della predella raffigurante il Miracolo dell'ostia profanata di Paolo Uccello
     #     RVEL: 2
     def parse_paragraph_relation_to_other_objects(self, paragraph):
-        collection_desc = paragraph.find('OGTI').text
+        collection_desc = paragraph.first["OGTI"]
         if collection_desc is None:
             return
-        myphoto = FZERI_FENTRY[self.entry_id + '/photo']
-        collection = FZERI_COLLECTION[sha1(collection_desc.encode('utf-8')).hexdigest()]
-        self.graph.add((collection, RDF.type, CRM.E18_Physical_Thing))
-        self.graph.add((collection, CRM.P46_is_composed_of, myphoto))
-        self.graph.add((myphoto, CRM.P46i_forms_part_of, collection))
-        for node in paragraph:
+        myphoto = self.uris.photo
+        collection = TERMS.hashed(FZERI_COLLECTION, collection_desc)
+        self.vocabulary.add((collection, RDF.type, CRM.E18_Physical_Thing))
+        self.add_link(collection, CRM.P46_is_composed_of, myphoto)
+        for tag, text in paragraph.items:
             # TODO
-            if node.tag == "RVEL":
+            if tag == "RVEL":
                 pass
-            elif node.tag == "OGTI":
-                self.graph.add((collection, RDFS.label, Literal(node.text)))
+            elif tag == "OGTI":
+                self.vocabulary.add((collection, RDFS.label, TERMS.literal(text)))
         ### end RELATION TO OTHER OBJECTS paragraph
+
+
+FZeriParserSchedaF.handlers = dict((name[len("parse_paragraph_"):], function)
+                                   for name, function in vars(FZeriParserSchedaF).items()
+                                   if name.startswith("parse_paragraph_"))
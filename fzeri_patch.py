@@ -0,0 +1,63 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Change set between two conversion runs (--patch).
+# The --index of the previous run holds the N-Triples rows of every entry: when an
+# entry is converted again its new rows are compared with the old ones, as sets of
+# lines (the converter writes no blank nodes, so equal triples give equal lines),
+# and only the rows which went away (unless the index says other entries still hold
+# them) or appeared are written, either as an RDF Patch (A/D rows in a TX/TC
+# transaction) or, when the file name ends with .ru or .sparql, as SPARQL DELETE
+# DATA/INSERT DATA operations.
+
+from fzeri_compress import open_output, plain_path
+
+SPARQL_EXTENSIONS = ('.ru', '.sparql')
+
+
+class PatchWriter:
+    def __init__(self, path):
+        self.sparql = plain_path(path).endswith(SPARQL_EXTENSIONS)
+        self.out = open_output(path)
+        if not self.sparql:
+            self.out.write("TX .\n")
+        self.changed = self.unchanged = self.deleted = self.added = 0
+
+    # Write what turns old_rows into new_rows (either None for a missing entry), but
+    # for the rows in kept; with delete False no row is deleted at all
+    def change(self, old_rows, new_rows, delete=True, kept=()):
+        old = set(old_rows.splitlines()) if old_rows else set()
+        new = set(new_rows.splitlines()) if new_rows else set()
+        old.discard("")
+        new.discard("")
+        removed = sorted(old - new - set(kept)) if delete else []
+        added = sorted(new - old)
+        if not removed and not added:
+            self.unchanged += 1
+            return
+        self.changed += 1
+        self.deleted += len(removed)
+        self.added += len(added)
+        if self.sparql:
+            for operation, rows in (("DELETE DATA", removed), ("INSERT DATA", added)):
+                if rows:
+                    self.out.write("%s {\n%s\n} ;\n" % (operation, "\n".join(rows)))
+        else:
+            for row in removed:
+                self.out.write("D " + row + "\n")
+            for row in added:
+                self.out.write("A " + row + "\n")
+
+    def report(self):
+        return "%d changed, %d unchanged, %d triples deleted, %d added" % (self.changed, self.unchanged,
+                                                                           self.deleted, self.added)
+
+    def close(self):
+        if not self.sparql:
+            self.out.write("TC .\n")
+        self.out.close()
@@ -0,0 +1,218 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Staged conversion pipeline (--pipeline):
+#     reader thread  -> tasks queue -> converter processes -> results queue -> writer
+# The reader produces tasks (reading and parsing the XML), the converters run them
+# and the writer, i.e. the caller iterating Pipeline.results, gets the results in
+# task order. Both queues are bounded, so a slow stage makes the previous ones wait
+# instead of piling up entries in memory; the reader also waits while queue_size
+# tasks are ahead of the next result to be yielded, so that results converted ahead
+# of a slow entry do not pile up either. Each stage accounts the time it spends
+# working and waiting, and queue depths are sampled, to tell which stage bounds the run.
+
+import sys
+import time
+import threading
+import traceback
+import multiprocessing
+
+# tasks and results each queue may hold per converter process
+PIPELINE_QUEUE_SIZE = 64
+
+
+# seconds spent working and waiting by a stage, and items it went through
+class StageMetrics:
+    def __init__(self, name, workers=1):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.busy = 0.0
+        self.waiting = 0.0
+
+    def merge(self, items, busy, waiting):
+        self.items += items
+        self.busy += busy
+        self.waiting += waiting
+
+    # items per second the stage could sustain, all its workers together
+    def capacity(self):
+        return self.items * self.workers / self.busy if self.busy else 0.0
+
+
+# Converter process: run convert on every task until the None sentinel, then hand
+# back the metrics of the process
+def convert_tasks(convert, tasks, results):
+    busy = waiting = 0.0
+    items = 0
+    while True:
+        start = time.time()
+        item = tasks.get()
+        got = time.time()
+        waiting += got - start
+        if item is None:
+            break
+        sequence, task = item
+        try:
+            result = convert(task)
+        except Exception:
+            results.put(('error', traceback.format_exc()))
+            return
+        done = time.time()
+        busy += done - got
+        items += 1
+        results.put(('result', (sequence, result)))
+        waiting += time.time() - done
+    results.put(('done', (items, busy, waiting)))
+
+
+class Pipeline:
+    def __init__(self, convert, workers=1, queue_size=PIPELINE_QUEUE_SIZE):
+        self.convert = convert
+        self.workers = workers
+        self.queue_size = queue_size * workers
+        self.read = StageMetrics("read")
+        self.converted = StageMetrics("convert", workers)
+        self.written = StageMetrics("write")
+        # sum and max of the sampled queue depths, and number of samples
+        self.depths = {'tasks': [0, 0], 'results': [0, 0]}
+        self.samples = 0
+        # most results held back waiting for an earlier one
+        self.max_reordered = 0
+        # sequence of the next result to be yielded, guarded by window
+        self.expected = 0
+        self.window = threading.Condition()
+        self.stopped = False
+        self.started = time.time()
+
+    # Feed the tasks queue, then one sentinel per converter
+    def read_tasks(self, tasks, queue):
+        try:
+            tasks = iter(tasks)
+            sequence = 0
+            while True:
+                start = time.time()
+                try:
+                    task = next(tasks)
+                except StopIteration:
+                    self.read.busy += time.time() - start
+                    break
+                got = time.time()
+                self.read.busy += got - start
+                with self.window:
+                    while sequence - self.expected >= self.queue_size and not self.stopped:
+                        self.window.wait()
+                    if self.stopped:
+                        break
+                queue.put((sequence, task))
+                self.read.waiting += time.time() - got
+                self.read.items += 1
+                sequence += 1
+        except Exception:
+            self.reader_error = traceback.format_exc()
+        finally:
+            for _ in range(self.workers):
+                queue.put(None)
+
+    def sample(self, tasks, results):
+        try:
+            depths = (('tasks', tasks.qsize()), ('results', results.qsize()))
+        except NotImplementedError:
+            # qsize is not available on OS X
+            return
+        for name, depth in depths:
+            self.depths[name][0] += depth
+            self.depths[name][1] = max(self.depths[name][1], depth)
+        self.samples += 1
+
+    # Run convert over tasks, yielding the results in task order
+    def results(self, tasks):
+        task_queue = multiprocessing.Queue(self.queue_size)
+        result_queue = multiprocessing.Queue(self.queue_size)
+        self.reader_error = None
+        self.expected = 0
+        self.stopped = False
+        processes = [multiprocessing.Process(target=convert_tasks, args=(self.convert, task_queue, result_queue))
+                     for _ in range(self.workers)]
+        for process in processes:
+            process.daemon = True
+            process.start()
+        reader = threading.Thread(target=self.read_tasks, args=(tasks, task_queue))
+        reader.daemon = True
+        reader.start()
+        # results ahead of the next one to be yielded
+        early = {}
+        expected = 0
+        running = self.workers
+        try:
+            while running:
+                start = time.time()
+                kind, value = result_queue.get()
+                self.written.waiting += time.time() - start
+                if kind == 'error':
+                    raise RuntimeError("pipeline converter failed:\n" + value)
+                if kind == 'done':
+                    self.converted.merge(*value)
+                    running -= 1
+                    continue
+                self.sample(task_queue, result_queue)
+                sequence, result = value
+                early[sequence] = result
+                while expected in early:
+                    start = time.time()
+                    yield early.pop(expected)
+                    # time the caller spent writing the result
+                    self.written.busy += time.time() - start
+                    self.written.items += 1
+                    expected += 1
+                    with self.window:
+                        self.expected = expected
+                        self.window.notify()
+                self.max_reordered = max(self.max_reordered, len(early))
+        finally:
+            with self.window:
+                self.stopped = True
+                self.window.notify()
+            for process in processes:
+                if running and process.is_alive():
+                    process.terminate()
+                process.join()
+        reader.join()
+        if self.reader_error:
+            raise RuntimeError("pipeline reader failed:\n" + self.reader_error)
+
+    def metrics(self):
+        elapsed = time.time() - self.started
+        stages = [self.read, self.converted, self.written]
+        return {
+            'seconds': elapsed,
+            'stages': dict((stage.name, {'items': stage.items, 'workers': stage.workers, 'busy': stage.busy,
+                                         'waiting': stage.waiting, 'capacity': stage.capacity()})
+                           for stage in stages),
+            'queue_depth': dict((name, {'average': float(total) / self.samples if self.samples else 0.0,
+                                        'max': top, 'size': self.queue_size})
+                                for name, (total, top) in self.depths.items()),
+            'max_reordered': self.max_reordered,
+            # the stage with the lowest capacity bounds the run
+            'bottleneck': min((stage for stage in stages if stage.items),
+                              key=lambda stage: stage.capacity()).name if self.written.items else None,
+        }
+
+    def report(self, out=sys.stdout):
+        metrics = self.metrics()
+        out.write("### PIPELINE %.2fs, bottleneck: %s\n" % (metrics['seconds'], metrics['bottleneck']))
+        for name in ("read", "convert", "write"):
+            stage = metrics['stages'][name]
+            out.write("%10s x%d %8d items %9.2fs busy %9.2fs waiting %10.1f items/s capacity\n" % (
+                name, stage['workers'], stage['items'], stage['busy'], stage['waiting'], stage['capacity']))
+        for name in ("tasks", "results"):
+            depth = metrics['queue_depth'][name]
+            out.write("%10s queue depth %.1f average, %d max of %d\n" % (name, depth['average'], depth['max'],
+                                                                         depth['size']))
+        out.write("%10s %d results held back at most, of %d\n" % ("reorder", metrics['max_reordered'],
+                                                                   self.queue_size))
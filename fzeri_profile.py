@@ -0,0 +1,124 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Timing report of a conversion run (--profile).
+# For every source file the wall time is split into XML parsing, conversion and
+# serialization; together with the per-handler statistics collected by
+# FZeriParserSchedaF and the slowest entries it is written as JSON or CSV.
+
+import csv
+import heapq
+import json
+import time
+from collections import OrderedDict
+
+# how many of the slowest entries are reported
+SLOWEST_ENTRIES = 20
+
+
+def rate(count, seconds):
+    return count / seconds if seconds else 0.0
+
+
+class ConversionProfile:
+    def __init__(self, slowest=SLOWEST_ENTRIES):
+        self.files = []
+        self.current = None
+        self.started = self.file_started = time.time()
+        self.keep = slowest
+        # min-heap of (seconds, entry_id, triples)
+        self.slowest = []
+        # serialization happening once the whole run is over (e.g. Graph sinks)
+        self.closing_seconds = 0.0
+
+    def start_file(self, source_file):
+        self.current = OrderedDict([
+            ('source_file', source_file),
+            ('entries', 0),
+            ('triples', 0),
+            ('xml_seconds', 0.0),
+            ('convert_seconds', 0.0),
+            ('serialize_seconds', 0.0),
+        ])
+        self.files.append(self.current)
+        self.file_started = time.time()
+
+    # Wrap an entry iterator, accounting the time spent producing entries as XML parsing
+    def timed_entries(self, entries):
+        entries = iter(entries)
+        while True:
+            start = time.time()
+            try:
+                xmlentry = next(entries)
+            except StopIteration:
+                self.current['xml_seconds'] += time.time() - start
+                return
+            self.current['xml_seconds'] += time.time() - start
+            yield xmlentry
+
+    def converted(self, entry, seconds):
+        self.current['entries'] += 1
+        self.current['triples'] += entry.triple_count
+        self.current['convert_seconds'] += seconds
+        if entry.entry_id is None:
+            return
+        item = (seconds, entry.entry_id, entry.triple_count)
+        if len(self.slowest) < self.keep:
+            heapq.heappush(self.slowest, item)
+        else:
+            heapq.heappushpop(self.slowest, item)
+
+    def serialized(self, seconds):
+        self.current['serialize_seconds'] += seconds
+
+    def end_file(self):
+        current = self.current
+        current['wall_seconds'] = time.time() - self.file_started
+        current['entries_per_sec'] = rate(current['entries'], current['wall_seconds'])
+        current['triples_per_sec'] = rate(current['triples'], current['wall_seconds'])
+
+    def summary(self, handler_stats):
+        totals = OrderedDict((key, sum(f[key] for f in self.files))
+                             for key in ('entries', 'triples', 'xml_seconds', 'convert_seconds', 'serialize_seconds'))
+        totals['serialize_seconds'] += self.closing_seconds
+        totals['wall_seconds'] = time.time() - self.started
+        totals['entries_per_sec'] = rate(totals['entries'], totals['wall_seconds'])
+        totals['triples_per_sec'] = rate(totals['triples'], totals['wall_seconds'])
+        handlers = [OrderedDict([('handler', name), ('calls', calls), ('seconds', seconds), ('triples', triples),
+                                 ('triples_per_sec', rate(triples, seconds))])
+                    for name, (calls, seconds, triples) in sorted(handler_stats.items(),
+                                                                  key=lambda item: item[1][1], reverse=True)]
+        slowest = [OrderedDict([('entry_id', entry_id), ('seconds', seconds), ('triples', triples)])
+                   for seconds, entry_id, triples in sorted(self.slowest, reverse=True)]
+        return OrderedDict([('totals', totals), ('files', self.files), ('handlers', handlers),
+                            ('slowest_entries', slowest)])
+
+    # Write the summary as CSV when path ends with .csv, as JSON otherwise
+    def write(self, path, handler_stats):
+        summary = self.summary(handler_stats)
+        with open(path, 'wb') as out:
+            if not path.endswith('.csv'):
+                json.dump(summary, out, indent=2)
+                return
+            writer = csv.writer(out)
+            writer.writerow(['section', 'name', 'count', 'triples', 'seconds', 'per_sec'])
+            totals = summary['totals']
+            writer.writerow(['total', 'entries', totals['entries'], totals['triples'], totals['wall_seconds'],
+                             totals['entries_per_sec']])
+            for phase in ('xml', 'convert', 'serialize'):
+                writer.writerow(['total', phase, '', '', totals[phase + '_seconds'], ''])
+            for f in summary['files']:
+                writer.writerow(['file', f['source_file'], f['entries'], f['triples'], f['wall_seconds'],
+                                 f['entries_per_sec']])
+                for phase in ('xml', 'convert', 'serialize'):
+                    writer.writerow(['file_' + phase, f['source_file'], '', '', f[phase + '_seconds'], ''])
+            for h in summary['handlers']:
+                writer.writerow(['handler', h['handler'], h['calls'], h['triples'], h['seconds'],
+                                 h['triples_per_sec']])
+            for e in summary['slowest_entries']:
+                writer.writerow(['slowest_entry', e['entry_id'], '', e['triples'], e['seconds'], ''])
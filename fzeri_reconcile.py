@@ -0,0 +1,81 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Reconciliation of actor and place names (--reconcile).
+# Every name is reduced to a key (accents, case, punctuation and word order
+# dropped, so that "Zeri, Federico" and "ZERI Federico" agree) and the sha1 of the
+# key names the authority node shared by all the entries using that name.
+# The name -> node mapping is kept in a JSON cache file between runs: names found
+# there are not normalized again, and editing the cache (pointing a name to the
+# node of another one) merges variants the key does not catch.
+
+import re
+import unicodedata
+from hashlib import sha1
+from rdflib import RDFS
+from fzeri_parser_schedaF import FZERI_AUTHORITY, AUTHORITY_KINDS
+from fzeri_checkpoint import Checkpoint
+
+NON_WORD_RE = re.compile(r'[\W_]+', re.U)
+
+
+# Fingerprint of a name: ASCII folded, lowercase, punctuation free, distinct words sorted
+def name_key(text):
+    text = u"".join(c for c in unicodedata.normalize('NFKD', unicode(text)) if not unicodedata.combining(c))
+    return u" ".join(sorted(set(NON_WORD_RE.sub(u" ", text.lower()).split())))
+
+
+# Label triples of the authority nodes among triples: the names resolved into them
+def authority_labels(triples):
+    return [(s, p, o) for s, p, o in triples if p == RDFS.label and s.startswith(FZERI_AUTHORITY)]
+
+
+class Reconciler:
+    def __init__(self, path):
+        self.cache = Checkpoint(path)
+        # kind -> name -> sha1 of its key
+        self.names = self.cache.load() or {}
+        self.changed = False
+        # (kind, name) -> authority node, for the names met by this process
+        self.nodes = {}
+
+    # Authority node of a name, None when the name has no words at all
+    def resolve(self, kind, text):
+        try:
+            return self.nodes[kind, text]
+        except KeyError:
+            pass
+        names = self.names.setdefault(kind, {})
+        digest = names.get(text)
+        if digest is None:
+            key = name_key(text)
+            if not key:
+                self.nodes[kind, text] = None
+                return None
+            digest = names[text] = sha1(key.encode('utf-8')).hexdigest()
+            self.changed = True
+        node = self.nodes[kind, text] = FZERI_AUTHORITY[kind + '/' + digest]
+        return node
+
+    # Pick up the names resolved by other processes (--jobs) from the labels of the
+    # authority nodes among the shared triples
+    def learn(self, triples):
+        for s, p, o in authority_labels(triples):
+            kind, _, digest = s[len(FZERI_AUTHORITY):].partition('/')
+            if kind in AUTHORITY_KINDS and unicode(o) not in self.names.setdefault(kind, {}):
+                self.names[kind][unicode(o)] = unicode(digest)
+                self.changed = True
+
+    def save(self):
+        if self.changed:
+            self.cache.save(self.names)
+            self.changed = False
+
+    def report(self):
+        return ", ".join("%s %d names, %d nodes" % (kind, len(names), len(set(names.itervalues())))
+                         for kind, names in sorted(self.names.iteritems()))
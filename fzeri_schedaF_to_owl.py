@@ -9,21 +9,42 @@ __docformat__ = 'restructuredtext en'
 import sys
 import os
 import argparse
+import multiprocessing
+import resource
+import time
 from os.path import dirname, realpath
 import logging
-from rdflib import Graph, Namespace
+from rdflib import Graph, ConjunctiveGraph, Namespace, URIRef
 from rdflib.namespace import RDF, RDFS
 try:
     from lxml import etree
 except ImportError:
     import xml.etree.ElementTree as etree
-from fzeri_parser_schedaF import FZeriParserSchedaF
+from fzeri_parser_schedaF import FZeriParserSchedaF, TERMS, DATES, UNKNOWN_PARAGRAPH_POLICIES, FZERI_FENTRY, \
+    inverse_axioms
+from fzeri_sink import open_sink, entry_rows, serialize_rows, VocabularySink, SingleEntryWriter, StoreSink
+from fzeri_profile import ConversionProfile
+from fzeri_manifest import Manifest, entry_digest, converter_fingerprint
+from fzeri_index import EntryIndex, IndexingSink, index_record
+from fzeri_checkpoint import Progress, Checkpoint
+from fzeri_pipeline import Pipeline
+from fzeri_reconcile import Reconciler, authority_labels
+from fzeri_patch import PatchWriter
+from fzeri_compress import CODECS, path_codec, open_input
 
 # define default source
 DEFAULT_SOURCE = dirname(realpath(__file__)) + "/catalog/fzeri_F_2014_03_11_163504_test.xml"
 
 CRM = Namespace("http://www.cidoc-crm.org/cidoc-crm/")
 
+# number of entries handed to a --jobs worker at once
+JOBS_CHUNKSIZE = 32
+# rows read at once when merging part files into the output
+MERGE_BUFFER_SIZE = 1 << 20
+
+# SingleEntryWriter of a --jobs worker process, built by its first task
+worker_writer = None
+
 
 def parse_options():
     global options
@@ -31,11 +52,89 @@ def parse_options():
     parser.add_argument('source_file', nargs='+', help='FZeri catalog file(s) path')
     parser.add_argument('--single-entry', action="store_true",
                         help='Outputs entries in a single file for each one.')
+    parser.add_argument('--stream', action="store_true",
+                        help='Read catalog files incrementally instead of loading them whole.')
+    parser.add_argument('--writer-threads', dest="writer_threads", type=int, default=4,
+                        help='Threads writing entry files in --single-entry mode')
+    parser.add_argument('--shard-depth', dest="shard_depth", type=int, default=0,
+                        help='Spread entry files over this many levels of hashed subdirectories')
+    parser.add_argument('-j', '--jobs', dest="jobs", type=int, default=1,
+                        help='Number of worker processes converting entries in parallel')
+    parser.add_argument('--pipeline', action="store_true",
+                        help='Overlap XML reading, conversion (--jobs processes) and writing in a staged pipeline')
+    parser.add_argument('--file-jobs', dest="file_jobs", type=int,
+                        help='Convert this many source files at once, each into a checkpointed part file')
+    parser.add_argument('--checkpoint-every', dest="checkpoint_every", type=int, default=1000,
+                        help='Entries between two checkpoints of a part file (--file-jobs)')
+    parser.add_argument('--resume', action="store_true",
+                        help='Go on from the checkpoints of an interrupted --file-jobs run')
+    parser.add_argument('--thesauri', dest="thesauri_file",
+                        help='Write shared thesauri resources once into this file instead of the output')
+    parser.add_argument('--unknown-paragraphs', dest="unknown_paragraphs", default="log",
+                        choices=UNKNOWN_PARAGRAPH_POLICIES,
+                        help='What to do with paragraphs the converter has no handler for')
+    parser.add_argument('--handler-stats', action="store_true",
+                        help='Print call counts and timings of the paragraph handlers')
+    parser.add_argument('--profile', dest="profile_file",
+                        help='Write a JSON (or CSV, by extension) timing report of the conversion')
+    parser.add_argument('--incremental', dest="manifest_file",
+                        help='Only convert entries new or changed since the run recorded in this manifest '
+                             '(--single-entry or --store)')
+    parser.add_argument('--index', dest="index_file",
+                        help='Also index the converted entries by SERCD, SERCDOA, INVN and ROFI in this file')
+    parser.add_argument('--patch', dest="patch_file",
+                        help='Write the triples changed since the run which built --index as an RDF Patch '
+                             '(or SPARQL Update, with a .ru or .sparql extension) to this file')
+    parser.add_argument('--reconcile', dest="reconcile_file",
+                        help='Link actors and places to authority nodes shared by name, caching names in this file')
+    parser.add_argument('--canonical', action="store_true",
+                        help='Write each pair of inverse properties one way only')
+    parser.add_argument('--inverse-axioms', dest="inverse_axioms_file",
+                        help='Write the owl:inverseOf axioms of the inverse properties into this file')
+    parser.add_argument('--store', dest="store",
+                        help='Write into this persistent rdflib store (PLUGIN:PATH, e.g. Sleepycat:fzeri_store) '
+                             'instead of an output file')
     parser.add_argument('-o', '--output', dest="output_file", default="fzeri.ttl",
                         help='Output file or directory name')
     parser.add_argument('-f', '--format', dest="format", default="turtle",
-                        help='Output format (xml|n3|turtle|nt|pretty-xml|trix)')
+                        help='Output format (xml|n3|turtle|nt|nquads|packed|pretty-xml|trix)')
+    parser.add_argument('-z', '--compress', dest="compress", choices=sorted(CODECS),
+                        help='Compress the output files (entry files with --single-entry) with this codec')
     options = parser.parse_args()
+    outputs = ['thesauri_file', 'inverse_axioms_file', 'patch_file']
+    if not options.single_entry:
+        outputs.append('output_file')
+    if options.compress:
+        if not CODECS[options.compress].available():
+            parser.error("--compress %s needs the %s module" % (options.compress, CODECS[options.compress].requires))
+        # output files get the extension of the codec, unless they name one already
+        for name in outputs:
+            path = getattr(options, name)
+            if path and not path_codec(path):
+                setattr(options, name, path + CODECS[options.compress].extension)
+    for name in outputs:
+        path = getattr(options, name)
+        codec = path_codec(path) if path else None
+        if codec and not codec.available():
+            parser.error("%s: %s files need the %s module" % (path, codec.name, codec.requires))
+    if options.profile_file and (options.jobs > 1 or options.pipeline):
+        parser.error("--profile can only be used on serial runs")
+    if options.store and options.single_entry:
+        parser.error("--store can't be combined with --single-entry")
+    if options.patch_file and not options.index_file:
+        parser.error("--patch needs the --index of the previous run")
+    if options.manifest_file and not (options.single_entry or options.store):
+        # an output file would only get the changed entries
+        parser.error("--incremental only updates --single-entry directories and --store stores")
+    if options.resume and not options.file_jobs:
+        options.file_jobs = 1
+    if options.file_jobs:
+        for option, used in (("--single-entry", options.single_entry), ("--jobs", options.jobs > 1),
+                             ("--pipeline", options.pipeline),
+                             ("--incremental", options.manifest_file), ("--index", options.index_file),
+                             ("--profile", options.profile_file)):
+            if used:
+                parser.error("%s can't be combined with --file-jobs/--resume" % option)
 
 
 def format_to_ext(fmt):
@@ -43,50 +142,448 @@ def format_to_ext(fmt):
             'n3': '.n3',
             'turtle': '.ttl',
             'nt': '.nt',
+            'nquads': '.nq',
+            'packed': '.fzp',
             'pretty-xml': '.xml',
             'trix': '.xml'
             }[fmt]
 
 
+# Yield the SCHEDA entries of a catalog file.
+# In streaming mode the file is consumed through iterparse: each entry is cleared,
+# together with the already processed siblings, as soon as the caller moves on,
+# so memory is bounded by the largest single entry instead of the whole file.
+def iter_entries(source_file, stream=False):
+    if not stream:
+        for xmlentry in etree.parse(source_file).findall("SCHEDA"):
+            yield xmlentry
+        return
+    root = None
+    depth = 0
+    for event, elem in etree.iterparse(source_file, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1 or elem.tag != "SCHEDA":
+            continue
+        yield elem
+        elem.clear()
+        if hasattr(elem, "getprevious"):
+            # lxml: drop the entry and everything before it from the root
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        else:
+            root.clear()
+
+
+# Peak resident set size of the process in kB
+def peak_rss():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        # OS X reports bytes instead of kilobytes
+        rss /= 1024
+    return rss
+
+
+# Convert one serialized SCHEDA inside a --jobs worker process.
+# With a single entry target (output directory, extension, shard depth) the entry
+# is written to its own file, otherwise its triples are returned as sorted rows in
+# the chunk format of the output sink, so that the merged output does not depend on
+# which worker converted the entry.
+# Shared vocabulary triples, when split off, are handed back to the main process,
+# and so are the SERCD of the entry and its --index record when indexed. Entry files
+# keep the shared triples otherwise: only the labels of the --reconcile authority
+# nodes are handed back then, for the main process to cache the names resolved.
+def convert_entry(task):
+    global worker_writer
+    xmlstring, target, fmt, split_vocabulary, indexed = task
+    vocabulary = VocabularySink() if split_vocabulary else None
+    chunk = record = None
+    if target:
+        if worker_writer is None:
+            output_dir, ext, shard_depth = target
+            worker_writer = SingleEntryWriter(output_dir, fmt, ext, init_graph, shard_depth=shard_depth)
+        rdf = worker_writer.new_graph()
+        entry = FZeriParserSchedaF(etree.fromstring(xmlstring), rdf, vocabulary)
+        entry.parse()
+        if entry.entry_id is not None:
+            if indexed:
+                record = index_record(entry, rdf)
+            worker_writer.write(entry.entry_id, rdf)
+        if vocabulary is None and FZeriParserSchedaF.reconciler:
+            return entry.entry_id, None, authority_labels(rdf), record
+    else:
+        triples = set()
+        entry = FZeriParserSchedaF(etree.fromstring(xmlstring), triples, vocabulary)
+        entry.parse()
+        if entry.entry_id is not None:
+            chunk = entry_rows(triples, fmt, entry)
+            if indexed:
+                record = index_record(entry, triples)
+    return entry.entry_id, chunk, vocabulary.triples if vocabulary else None, record
+
+
+# Convert a source file into its own part file (--file-jobs), rows being in the
+# chunk format of the output sink and the shared vocabulary going to a second,
+# N-Triples, part file. Every checkpoint_every entries both files are flushed and a
+# checkpoint records where they end; with resume the conversion goes on from the
+# last checkpoint of a previous run, which must still match the source file.
+def convert_file(task):
+    source_file, part, fmt, checkpoint_every, resume = task
+    checkpoint = Checkpoint(part + ".checkpoint")
+    state = checkpoint.load() if resume else None
+    if state and state['source_file'] != source_file:
+        raise ValueError("%s was checkpointed for %s" % (part, state['source_file']))
+    if state and state['done']:
+        print "### SKIPPING %s, converted by a previous run" % source_file
+        return part
+    out = open(part, 'r+b' if state else 'wb')
+    vocabulary_out = open(part + ".vocabulary", 'r+b' if state else 'wb')
+    skip = 0
+    if state:
+        # drop what was written after the last checkpoint
+        out.truncate(state['offset'])
+        out.seek(state['offset'])
+        vocabulary_out.truncate(state['vocabulary_offset'])
+        vocabulary_out.seek(state['vocabulary_offset'])
+        skip = state['entries']
+        print "### RESUMING %s after entry %s (%d entries)" % (source_file, state['last_entry'], skip)
+    vocabulary = VocabularySink()
+    written = set()
+    count = 0
+    last_entry = state['last_entry'] if state else None
+
+    def save(done):
+        vocabulary_out.write(serialize_rows(vocabulary.triples - written, "nt", None))
+        written.update(vocabulary.triples)
+        for f in out, vocabulary_out:
+            f.flush()
+            os.fsync(f.fileno())
+        checkpoint.save({'source_file': source_file, 'entries': count, 'last_entry': last_entry,
+                         'offset': out.tell(), 'vocabulary_offset': vocabulary_out.tell(), 'done': done})
+
+    with open_input(source_file) as source:
+        progress = Progress(source_file, source, skip)
+        for xmlentry in iter_entries(source, True):
+            count += 1
+            if count <= skip:
+                if count == skip and xmlentry.findtext("PARAGRAFO/SERCD") != state['last_entry']:
+                    raise ValueError("%s: checkpoint does not match the source file, remove %s" %
+                                     (source_file, checkpoint.path))
+                continue
+            triples = set()
+            entry = FZeriParserSchedaF(xmlentry, triples, vocabulary)
+            entry.parse()
+            if entry.entry_id is not None:
+                out.write(entry_rows(triples, fmt, entry))
+            last_entry = xmlentry.findtext("PARAGRAFO/SERCD")
+            progress.entry()
+            if count % checkpoint_every == 0:
+                save(False)
+        if count < skip:
+            raise ValueError("%s: checkpoint does not match the source file, remove %s" %
+                             (source_file, checkpoint.path))
+        save(True)
+        progress.done()
+    out.close()
+    vocabulary_out.close()
+    return part
+
+
+# Convert every source file into a part file, up to options.file_jobs at once, then
+# append the parts to sink in source order and collect their vocabulary.
+# Returns the part files, to be removed once the output is complete.
+def convert_parts(sink, vocabulary):
+    output_file = dirname(realpath(__file__)) + "/" + options.output_file
+    tasks = [(source_file, "%s.part-%d" % (output_file, number), sink.chunk_format, options.checkpoint_every,
+              options.resume) for number, source_file in enumerate(options.source_file)]
+    if options.file_jobs > 1:
+        file_pool = multiprocessing.Pool(options.file_jobs)
+        parts = file_pool.map(convert_file, tasks, 1)
+        file_pool.close()
+        file_pool.join()
+    else:
+        parts = map(convert_file, tasks)
+    for part in parts:
+        with open(part, 'rb') as source:
+            while True:
+                rows = source.readlines(MERGE_BUFFER_SIZE)
+                if not rows:
+                    break
+                sink.write("".join(rows))
+        with open(part + ".vocabulary", 'rb') as source:
+            vocabulary.update(Graph().parse(data=source.read(), format="nt"))
+    return parts
+
+
+def remove_part(part):
+    for path in part, part + ".vocabulary", part + ".checkpoint":
+        if os.path.isfile(path):
+            os.unlink(path)
+
+
+# Print unknown paragraphs and handler timings collected by the parser.
+# Statistics live in the process running the parser, so --jobs workers are not
+# accounted for.
+def print_parser_report():
+    if FZeriParserSchedaF.unknown_stats:
+        print "### UNKNOWN PARAGRAPHS"
+        for label, count in FZeriParserSchedaF.unknown_stats.most_common():
+            print "%10d  %s" % (count, label)
+    if FZeriParserSchedaF.unknown_units:
+        print "### UNKNOWN UNITS"
+        for unit, count in FZeriParserSchedaF.unknown_units.most_common():
+            print "%10d  %s" % (count, unit)
+    if options.handler_stats:
+        print "### HANDLER STATS"
+        for name, (calls, seconds, triples) in sorted(FZeriParserSchedaF.handler_stats.items(),
+                                             key=lambda item: item[1][1], reverse=True):
+            print "%10d calls %10.3fs %10d triples  %s" % (calls, seconds, triples, name)
+
+
+# Add the triples of a file written by a previous run to vocabulary
+def load_vocabulary(path, fmt, vocabulary):
+    graph = ConjunctiveGraph()
+    with open_input(path) as source:
+        graph.parse(source, format="xml" if fmt == "pretty-xml" else fmt)
+    vocabulary.update(graph)
+
+
+# Skip the entries the manifest holds with the same content
+def changed_entries(entries, manifest):
+    for xmlentry in entries:
+        node = xmlentry.find("PARAGRAFO/SERCD")
+        if node is None or manifest.changed(node.text, entry_digest(xmlentry, etree.tostring)):
+            yield xmlentry
+
+
 def main():
     global options
     parse_options()
     logging.basicConfig()
+    FZeriParserSchedaF.unknown_paragraphs = options.unknown_paragraphs
+    FZeriParserSchedaF.profile_handlers = options.handler_stats or bool(options.profile_file)
+    FZeriParserSchedaF.canonical = options.canonical
+    profile = ConversionProfile() if options.profile_file else None
+    reconciler = None
+    if options.reconcile_file:
+        # loaded before the workers are forked, so that they share the cached names
+        reconciler = Reconciler(dirname(realpath(__file__)) + "/" + options.reconcile_file)
+        FZeriParserSchedaF.reconciler = reconciler
+    pool = pipeline = None
+    if options.pipeline:
+        pipeline = Pipeline(convert_entry, options.jobs)
+    elif options.jobs > 1:
+        pool = multiprocessing.Pool(options.jobs)
+    manifest = None
+    if options.manifest_file:
+        manifest = Manifest(dirname(realpath(__file__)) + "/" + options.manifest_file,
+                            converter_fingerprint("%s|%s|%s|%s|%s|%s" % (options.format, options.single_entry,
+                                                                         bool(options.thesauri_file),
+                                                                         bool(options.reconcile_file),
+                                                                         options.canonical, options.compress)))
+    index = patch = None
+    if options.patch_file:
+        patch = PatchWriter(dirname(realpath(__file__)) + "/" + options.patch_file)
+    if options.index_file:
+        # incremental and patch runs update the index of the previous one
+        index = EntryIndex(dirname(realpath(__file__)) + "/" + options.index_file,
+                           create=manifest is None and patch is None, patch=patch)
     if options.single_entry:
         output_dir = dirname(realpath(__file__)) + "/" + options.output_file
         ext = format_to_ext(options.format)
-        # empty already existing directory or create a new one
-        if os.path.isdir(output_dir):
-            for the_file in os.listdir(output_dir):
-                file_path = os.path.join(output_dir, the_file)
-                try:
-                    if os.path.isfile(file_path):
-                        os.unlink(file_path)
-                except Exception, e:
-                    print e
-        else:
-            os.path.mkdir(output_dir)
+        if options.compress:
+            ext += CODECS[options.compress].extension
+        # existing entry files are replaced one by one, never wiped in advance; a full
+        # run removes the files of the other entries once it is done
+        writer = SingleEntryWriter(output_dir, options.format, ext, init_graph, threads=options.writer_threads,
+                                   shard_depth=options.shard_depth, prune=manifest is None)
+        # entry files carry the shared resources too, unless they go to --thesauri
+        vocabulary = VocabularySink() if options.thesauri_file else None
         # parse xml
         for source_file in options.source_file:
             print "### SOURCING FILE " + source_file
-            xml = etree.parse(source_file)
-            for xmlentry in xml.findall("SCHEDA"):
-                # create a new Graph
-                rdf = init_graph()
-                entry = FZeriParserSchedaF(xmlentry, rdf)
-                entry.parse()
-                rdf.serialize(output_dir + "/" + entry.entry_id + ext, format=options.format)
+            source = open_input(source_file)
+            entries = iter_entries(source, options.stream)
+            progress = Progress(source_file, source if options.stream else None)
+            if manifest:
+                entries = changed_entries(entries, manifest)
+            if pool or pipeline:
+                target = (output_dir, ext, options.shard_depth)
+                tasks = ((etree.tostring(xmlentry), target, options.format, vocabulary is not None,
+                          index is not None)
+                         for xmlentry in entries)
+                if pool:
+                    results = pool.imap_unordered(convert_entry, tasks, JOBS_CHUNKSIZE)
+                else:
+                    results = pipeline.results(tasks)
+                for entry_id, _, shared, record in results:
+                    progress.entry()
+                    if entry_id is not None:
+                        writer.keep(entry_id)
+                    if shared and vocabulary is None:
+                        reconciler.learn(shared)
+                    elif shared:
+                        vocabulary.update(shared)
+                    if record:
+                        index.add(record)
+            else:
+                if profile:
+                    profile.start_file(source_file)
+                    entries = profile.timed_entries(entries)
+                for xmlentry in entries:
+                    progress.entry()
+                    start = time.time()
+                    # create a new Graph
+                    rdf = writer.new_graph()
+                    entry = FZeriParserSchedaF(xmlentry, rdf, vocabulary)
+                    entry.parse()
+                    converted = time.time()
+                    if entry.entry_id is not None:
+                        if index:
+                            index.add(index_record(entry, rdf))
+                        writer.write(entry.entry_id, rdf)
+                    if profile:
+                        profile.converted(entry, converted - start)
+                        profile.serialized(time.time() - converted)
+                if profile:
+                    profile.end_file()
+            source.close()
+            progress.done()
+            print "### PEAK RSS %d kB" % peak_rss()
+        start = time.time()
+        writer.close()
+        if profile:
+            profile.closing_seconds += time.time() - start
     else:
-        # create a new Graph
-        rdf = init_graph()
-        # parse xml
-        for source_file in options.source_file:
-            print "### SOURCING FILE " + source_file
-            xml = etree.parse(source_file)
-            for xmlentry in xml.findall("SCHEDA"):
-                entry = FZeriParserSchedaF(xmlentry, rdf)
-                entry.parse()
-        rdf.serialize(dirname(realpath(__file__)) + "/" + options.output_file, format=options.format)
+        if options.store:
+            sink = StoreSink(options.store)
+        else:
+            # line based formats are streamed, the others are collected in a Graph
+            sink = open_sink(dirname(realpath(__file__)) + "/" + options.output_file, options.format, init_graph)
+        # shared resources are collected across the run and written once
+        vocabulary = VocabularySink()
+        entry_sink = IndexingSink(sink, index) if index else sink
+        if options.file_jobs:
+            # each source file goes to its own part file, merged once all are done
+            parts = convert_parts(sink, vocabulary)
+        else:
+            # parse xml
+            for source_file in options.source_file:
+                print "### SOURCING FILE " + source_file
+                source = open_input(source_file)
+                entries = iter_entries(source, options.stream)
+                progress = Progress(source_file, source if options.stream else None)
+                if manifest:
+                    entries = changed_entries(entries, manifest)
+                if pool or pipeline:
+                    tasks = ((etree.tostring(xmlentry), None, sink.chunk_format, True, index is not None)
+                             for xmlentry in entries)
+                    # results come back in source order, keeping the output stable
+                    if pool:
+                        results = pool.imap(convert_entry, tasks, JOBS_CHUNKSIZE)
+                    else:
+                        results = pipeline.results(tasks)
+                    for _, chunk, shared, record in results:
+                        progress.entry()
+                        if chunk:
+                            sink.write(chunk)
+                        if shared:
+                            vocabulary.update(shared)
+                        if record:
+                            index.add(record)
+                else:
+                    if profile:
+                        profile.start_file(source_file)
+                        entries = profile.timed_entries(entries)
+                    for xmlentry in entries:
+                        progress.entry()
+                        start = time.time()
+                        entry = FZeriParserSchedaF(xmlentry, entry_sink, vocabulary)
+                        entry.parse()
+                        converted = time.time()
+                        entry_sink.commit(entry)
+                        if profile:
+                            profile.converted(entry, converted - start)
+                            profile.serialized(time.time() - converted)
+                    if profile:
+                        profile.end_file()
+                source.close()
+                progress.done()
+                print "### PEAK RSS %d kB" % peak_rss()
+        if options.store and manifest:
+            for entry_id in manifest.deleted():
+                sink.remove(FZERI_FENTRY[entry_id])
+        start = time.time()
+        if not options.thesauri_file:
+            vocabulary.write_to(sink)
+        sink.close()
+        if profile:
+            profile.closing_seconds += time.time() - start
+        if options.file_jobs:
+            # the output is complete, checkpoints are no longer needed
+            for part in parts:
+                remove_part(part)
+    if manifest:
+        deleted = manifest.deleted()
+        print "### INCREMENTAL %d changed, %d unchanged, %d deleted" % (manifest.changed_count,
+                                                                       manifest.unchanged_count, len(deleted))
+        with open(dirname(realpath(__file__)) + "/" + options.output_file.rstrip("/") + ".deleted", "w") as out:
+            for entry_id in deleted:
+                out.write(entry_id.encode('utf-8') + "\n")
+                if options.single_entry:
+                    writer.delete(entry_id)
+                if index:
+                    index.delete(entry_id)
+        manifest.close()
+    if index:
+        if patch and not manifest:
+            # a full run converted every entry of the catalog, the others are gone
+            for entry_id in index.unseen():
+                index.delete(entry_id)
+        if vocabulary:
+            index.add_vocabulary(vocabulary.triples, complete=manifest is None)
+        index.close()
+    if patch:
+        patch.close()
+        print "### PATCH " + patch.report()
+    if options.thesauri_file:
+        thesauri_file = dirname(realpath(__file__)) + "/" + options.thesauri_file
+        if manifest and not manifest.reset and os.path.isfile(thesauri_file):
+            # an incremental run only meets the resources of the changed entries
+            load_vocabulary(thesauri_file, options.format, vocabulary)
+        thesauri = open_sink(thesauri_file, options.format, init_graph)
+        vocabulary.write_to(thesauri)
+        thesauri.close()
+    if options.inverse_axioms_file:
+        axioms = open_sink(dirname(realpath(__file__)) + "/" + options.inverse_axioms_file, options.format,
+                           init_graph)
+        for triple in inverse_axioms():
+            axioms.add(triple)
+        axioms.flush(URIRef(CRM))
+        axioms.close()
+    if reconciler:
+        if vocabulary is not None:
+            # names resolved by worker processes come back with the shared triples (the
+            # authority labels alone when the entry files keep them)
+            reconciler.learn(vocabulary.triples)
+        reconciler.save()
+        print "### RECONCILE " + reconciler.report()
+    if pool:
+        pool.close()
+        pool.join()
+    elif pipeline:
+        pipeline.report()
+    elif options.file_jobs <= 1:
+        # with more --file-jobs, entries were converted (and counted) by the file workers
+        print "### TERM CACHE " + TERMS.report()
+        print "### DATE CACHE " + DATES.report()
+        print_parser_report()
+    if profile:
+        profile.write(dirname(realpath(__file__)) + "/" + options.profile_file, FZeriParserSchedaF.handler_stats)
 
 
 def init_graph():
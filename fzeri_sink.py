@@ -0,0 +1,350 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Triple sinks FZeriParserSchedaF writes into.
+# Every sink exposes the same small interface:
+#     add(triple)     adds a triple of the current entry
+#     update(triples) adds the triples of an entry at once, as the parser does
+#     commit(entry)   called once the entry has been parsed
+#     flush(context)  writes out what has been added so far as part of the named
+#                     graph context (only meaningful for line based sinks)
+#     write(chunk)    appends rows already serialized in the sink chunk_format
+#                     (used by the --jobs workers)
+#     close()         finalizes the output
+
+import os
+import errno
+import tempfile
+import threading
+from collections import deque
+from hashlib import sha1
+from multiprocessing.pool import ThreadPool
+from rdflib import Graph, ConjunctiveGraph, URIRef
+from rdflib.plugins.serializers.nt import _nt_row
+from rdflib.plugins.serializers.nquads import _nq_row
+from fzeri_parser_schedaF import FZERI_THESAURI
+from fzeri_packed import PackedSink
+from fzeri_compress import open_output, compressing
+
+# write buffer for line based outputs
+BUFFER_SIZE = 1 << 20
+# entry files a SingleEntryWriter thread may have queued before conversion waits
+WRITER_BACKLOG = 8
+# triples a StoreSink writes in one transaction
+STORE_BATCH = 50000
+
+
+# Serialize triples into sorted N-Triples/N-Quads rows, context being the named
+# graph of N-Quads rows. Sorting makes the output independent of set ordering, so
+# that the same triples always yield the same bytes.
+def serialize_rows(triples, fmt, context):
+    if fmt == "nquads":
+        lines = [_nq_row(triple, context) for triple in triples]
+    else:
+        lines = [_nt_row(triple) for triple in triples]
+    lines.sort()
+    return u"".join(lines).encode("ascii", "_rdflib_nt_escape")
+
+
+# Serialize the triples of an entry, which is its own named graph
+def entry_rows(triples, fmt, entry):
+    return serialize_rows(triples, fmt, entry.myentry)
+
+
+# Keeps the whole catalog in an rdflib Graph and serializes it on close.
+# Needed by formats which can only be written once all triples are known
+# (xml, pretty-xml, turtle, n3, trix).
+class GraphSink:
+    chunk_format = "nt"
+
+    def __init__(self, graph, destination, fmt):
+        self.graph = graph
+        self.destination = destination
+        self.format = fmt
+
+    def add(self, triple):
+        self.graph.add(triple)
+
+    def update(self, triples):
+        self.graph.addN((s, p, o, self.graph) for s, p, o in triples)
+
+    def commit(self, entry):
+        pass
+
+    def flush(self, context):
+        pass
+
+    def write(self, chunk):
+        self.graph.parse(data=chunk, format=self.chunk_format)
+
+    def close(self):
+        with open_output(self.destination) as out:
+            self.graph.serialize(out, format=self.format)
+
+
+# Streams every entry to a buffered file handle as soon as it has been parsed.
+# Only the triples of the current entry are held in memory.
+class NTriplesSink:
+    chunk_format = "nt"
+
+    def __init__(self, destination):
+        self.out = open_output(destination, BUFFER_SIZE)
+        self.pending = set()
+
+    def add(self, triple):
+        self.pending.add(triple)
+
+    def update(self, triples):
+        self.pending.update(triples)
+
+    def commit(self, entry):
+        self.flush(entry.myentry)
+
+    def flush(self, context):
+        if self.pending:
+            self.out.write(serialize_rows(self.pending, self.chunk_format, context))
+            self.pending.clear()
+
+    def write(self, chunk):
+        self.out.write(chunk)
+
+    def close(self):
+        self.out.close()
+
+
+# Like NTriplesSink, putting each entry in its own named graph
+class NQuadsSink(NTriplesSink):
+    chunk_format = "nquads"
+
+
+# Collects the triples describing shared resources (thesaurus values, collections,
+# artworks and their authors) which every entry referencing them would otherwise
+# repeat. Thesaurus values are bounded by the size of the vocabularies, but there is
+# an artwork (and author) per schedaOA, so the set still grows with the catalog.
+class VocabularySink:
+    def __init__(self):
+        self.triples = set()
+
+    def add(self, triple):
+        self.triples.add(triple)
+
+    def update(self, triples):
+        self.triples.update(triples)
+
+    # write the collected vocabulary into sink, once, as the thesauri graph
+    def write_to(self, sink):
+        for triple in self.triples:
+            sink.add(triple)
+        sink.flush(URIRef(FZERI_THESAURI))
+
+
+# Writes straight into a persistent rdflib store (e.g. Sleepycat), spec being
+# "PLUGIN:PATH". Every entry is its own named graph: the first time an entry is
+# written in a run, the triples a previous run stored for it are replaced (later
+# writes, e.g. rows of an entry split across chunks, are merged). Entries are
+# written in batches of about STORE_BATCH triples, each batch being committed as
+# one transaction by transactional stores (and synced to disk by stores such as
+# Sleepycat).
+class StoreSink:
+    chunk_format = "nquads"
+
+    def __init__(self, spec, create=True):
+        plugin_name, _, path = spec.partition(":")
+        self.graph = ConjunctiveGraph(store=plugin_name)
+        self.graph.open(path, create=create)
+        # (context, triples, replace) in commit order
+        self.batch = []
+        self.batch_size = 0
+        self.pending = set()
+        # contexts already replaced by this run
+        self.replaced = set()
+
+    def add(self, triple):
+        self.pending.add(triple)
+
+    def update(self, triples):
+        self.pending.update(triples)
+
+    def commit(self, entry):
+        self.enqueue(entry.myentry, self.pending, True)
+        self.pending = set()
+
+    # Shared resources are merged into context, not replaced: incremental runs
+    # only see the ones used by changed entries
+    def flush(self, context):
+        if self.pending:
+            self.enqueue(context, self.pending, False)
+            self.pending = set()
+
+    def write(self, chunk):
+        contexts = {}
+        graph = ConjunctiveGraph()
+        graph.parse(data=chunk, format=self.chunk_format)
+        for s, p, o, context in graph.quads((None, None, None)):
+            contexts.setdefault(context.identifier, set()).add((s, p, o))
+        for context, triples in contexts.iteritems():
+            self.enqueue(context, triples, True)
+
+    # remove the named graph of an entry (deleted from the catalog)
+    def remove(self, context):
+        self.enqueue(context, (), True)
+
+    def enqueue(self, context, triples, replace):
+        if replace:
+            replace = context not in self.replaced
+            self.replaced.add(context)
+        self.batch.append((context, triples, replace))
+        self.batch_size += len(triples)
+        if self.batch_size >= STORE_BATCH:
+            self.write_batch()
+
+    def write_batch(self):
+        store = self.graph.store
+        for context, triples, replace in self.batch:
+            graph = Graph(store, identifier=context)
+            if replace:
+                store.remove((None, None, None), graph)
+            store.addN((s, p, o, graph) for s, p, o in triples)
+        self.graph.commit()
+        if hasattr(store, "sync"):
+            store.sync()
+        self.batch = []
+        self.batch_size = 0
+
+    def close(self):
+        self.write_batch()
+        self.graph.close()
+
+
+# sinks which do without a Graph
+LINE_SINKS = {
+    'nt': NTriplesSink,
+    'nquads': NQuadsSink,
+    'packed': PackedSink,
+}
+
+
+# Open the sink matching the output format; init_graph builds the Graph used by
+# the other formats.
+def open_sink(destination, fmt, init_graph):
+    if fmt in LINE_SINKS:
+        return LINE_SINKS[fmt](destination)
+    return GraphSink(init_graph(), destination, fmt)
+
+
+# Writes every entry into its own file (--single-entry).
+# Files are written to a temporary name and renamed, so readers never see a partial
+# entry; with more than one thread serialization and writes are handed to a thread
+# pool, overlapping them with conversion. With shard_depth > 0 files are spread over
+# nested subdirectories named after the hash of the entry id (ab/cd/SERCD.ttl), to
+# keep directories small. Namespace bindings are built once per thread and shared
+# by the graphs it serializes.
+# With prune, the run being a full one, close() removes the entry files it did not
+# write (entries gone from the catalog, files laid out by another shard_depth), and
+# the directories they leave empty.
+class SingleEntryWriter:
+    def __init__(self, output_dir, fmt, ext, init_graph, threads=1, shard_depth=0, prune=False):
+        self.output_dir = output_dir
+        self.format = fmt
+        self.ext = ext
+        self.init_graph = init_graph
+        self.shard_depth = shard_depth
+        self.prune = prune
+        # paths of the entry files written by this run
+        self.written = set()
+        self.local = threading.local()
+        self.directories = set()
+        self.pool = ThreadPool(threads) if threads > 1 else None
+        self.backlog = deque()
+        self.max_backlog = threads * WRITER_BACKLOG
+        # temporary files are private, give entry files the usual permissions
+        umask = os.umask(0)
+        os.umask(umask)
+        self.file_mode = 0666 & ~umask
+        self.makedirs(output_dir)
+
+    def path(self, entry_id):
+        directory = self.output_dir
+        if self.shard_depth:
+            digest = sha1(entry_id.encode('utf-8')).hexdigest()
+            directory = os.path.join(directory, *[digest[2 * level:2 * level + 2]
+                                                  for level in range(self.shard_depth)])
+        return os.path.join(directory, entry_id + self.ext)
+
+    def makedirs(self, directory):
+        if directory in self.directories:
+            return
+        try:
+            os.makedirs(directory)
+        except OSError, e:
+            if e.errno != errno.EEXIST:
+                raise
+        self.directories.add(directory)
+
+    # Graphs handed to write() don't need any namespace binding
+    def new_graph(self):
+        return Graph()
+
+    # Record the file of an entry written by another process (--jobs workers)
+    def keep(self, entry_id):
+        self.written.add(os.path.normpath(self.path(entry_id)))
+
+    def write(self, entry_id, graph):
+        self.keep(entry_id)
+        if self.pool is None:
+            self.serialize(entry_id, graph)
+            return
+        if len(self.backlog) >= self.max_backlog:
+            # wait for the oldest write, re-raising its errors
+            self.backlog.popleft().get()
+        self.backlog.append(self.pool.apply_async(self.serialize, (entry_id, graph)))
+
+    def serialize(self, entry_id, graph):
+        try:
+            graph.namespace_manager = self.local.namespace_manager
+        except AttributeError:
+            self.local.namespace_manager = self.init_graph().namespace_manager
+            graph.namespace_manager = self.local.namespace_manager
+        path = self.path(entry_id)
+        directory = os.path.dirname(path)
+        self.makedirs(directory)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+        try:
+            os.fchmod(fd, self.file_mode)
+            with compressing(os.fdopen(fd, "wb"), path) as out:
+                graph.serialize(out, format=self.format)
+            os.rename(temp_path, path)
+        except:
+            os.unlink(temp_path)
+            raise
+
+    def delete(self, entry_id):
+        if os.path.isfile(self.path(entry_id)):
+            os.unlink(self.path(entry_id))
+
+    def close(self):
+        while self.backlog:
+            self.backlog.popleft().get()
+        if self.pool:
+            self.pool.close()
+            self.pool.join()
+        if self.prune:
+            self.remove_stale()
+
+    def remove_stale(self):
+        emptied = set()
+        for directory, subdirectories, files in os.walk(self.output_dir, topdown=False):
+            directory = os.path.normpath(directory)
+            for name in files:
+                path = os.path.join(directory, name)
+                if name.endswith(self.ext) and path not in self.written:
+                    os.unlink(path)
+                    emptied.add(directory)
+            if directory != os.path.normpath(self.output_dir) and directory in emptied and not os.listdir(directory):
+                os.rmdir(directory)
+                emptied.add(os.path.dirname(directory))
@@ -0,0 +1,219 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# Synthetic FZeri SCHEDA F catalog generator.
+# Produces catalogs shaped like the real exports: every paragraph handled by
+# FZeriParserSchedaF, RIPETIZIONE blocks for the repeatable ones, and thesaurus
+# values drawn from a skewed (Zipf) distribution. Entries are written one at a time,
+# so millions of them can be generated in constant memory; the same seed always
+# yields the same file.
+
+import sys
+import argparse
+import random
+from bisect import bisect
+from xml.sax.saxutils import escape, quoteattr
+from fzeri_compress import open_output
+
+# Zipf exponent of thesaurus values: a few values cover most of the entries
+SKEW = 1.1
+
+COLLECTIONS = [u"Fototeca Zeri", u"Fondo Gnoli", u"Fondo Bacchi"]
+SERIES = [u"Pittura italiana", u"Scultura italiana", u"Pittura straniera", u"Arte minore", u"Architettura"]
+BOXES = [u"Pittura italiana sec. %s. %s" % (century, school)
+         for century in (u"XIII", u"XIV", u"XV", u"XVI", u"XVII", u"XVIII")
+         for school in (u"Siena", u"Firenze", u"Venezia", u"Roma", u"Bologna", u"Napoli")]
+AUTHORS = [u"Girolamo di Benvenuto", u"Benvenuto di Giovanni", u"Sano di Pietro", u"Botticelli Sandro",
+           u"Perugino", u"Lotto Lorenzo", u"Tiziano", u"Anonimo", u"Reni Guido", u"Carracci Annibale",
+           u"Giotto", u"Duccio di Buoninsegna", u"Lippi Filippo", u"Crivelli Carlo", u"Palmezzano Marco"]
+SCHOOLS = [u"Scuola italiana, scuola toscana, scuola senese", u"Scuola italiana, scuola veneta",
+           u"Scuola italiana, scuola emiliana", u"Scuola italiana, scuola umbra"]
+SUBJECTS = [u"Madonna con Bambino", u"Madonna con Bambino e san Giovannino", u"Crocifissione",
+            u"Annunciazione", u"Adorazione dei Magi", u"Ritratto d'uomo", u"San Girolamo", u"Deposizione"]
+PHOTOGRAPHERS = [u"Anonimo", u"Brogi", u"Alinari", u"Anderson", u"Villani", u"Perotti", u"Sansoni"]
+PUBLISHERS = [u"Christie's", u"Sotheby's", u"Finarte", u"Dorotheum", u"Semenzato"]
+PLACES = [u"Firenze", u"Roma", u"Londra", u"Bologna", u"Milano", u"Venezia", u"New York", u"Parigi"]
+COUNTRIES = [u"Italia", u"Regno Unito", u"Stati Uniti", u"Francia", u"Germania"]
+REGIONS = [u"Emilia-Romagna", u"Toscana", u"Lazio", u"Lombardia"]
+DISTRICTS = [u"BO", u"FI", u"RM", u"MI"]
+MATERIALS = [u"gelatina ai sali d'argento/ carta baritata", u"albumina", u"gelatina ai sali d'argento",
+             u"carta salata", u"collodio"]
+FORMATS = [u"assemblaggio", u"singolo", u"montaggio"]
+COLORS = [u"BN", u"C"]
+CONDITIONS = [u"buono", u"discreto", u"mediocre", u"cattivo"]
+DAMAGES = [u"sbiadimento", u"abrasioni", u"pieghe", u"macchie"]
+OWNERS = [u"Alma Mater Studiorum Università di Bologna"]
+CATALOGUERS = [u"Erika Giuliani", u"Marcello Rossini", u"Francesca Mambelli", u"Giudici C."]
+UNITS = [u"mm", u"cm"]
+
+
+# Draws values from a list with probability decreasing with their rank
+class Skewed:
+    def __init__(self, values, skew=SKEW):
+        self.values = values
+        self.cumulative = []
+        total = 0.0
+        for rank in range(len(values)):
+            total += 1.0 / (rank + 1) ** skew
+            self.cumulative.append(total)
+
+    def __call__(self, rng):
+        return self.values[bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+
+VOCABULARIES = dict((name, Skewed(values)) for name, values in (
+    ('collection', COLLECTIONS), ('serie', SERIES), ('box', BOXES), ('author', AUTHORS), ('school', SCHOOLS),
+    ('subject', SUBJECTS), ('photographer', PHOTOGRAPHERS), ('publisher', PUBLISHERS), ('place', PLACES),
+    ('country', COUNTRIES), ('region', REGIONS), ('district', DISTRICTS), ('material', MATERIALS),
+    ('format', FORMATS), ('color', COLORS), ('condition', CONDITIONS), ('damage', DAMAGES),
+    ('owner', OWNERS), ('cataloguer', CATALOGUERS), ('unit', UNITS)))
+
+
+def paragraph(label, fields):
+    return u'<PARAGRAFO etichetta=%s>%s</PARAGRAFO>' % (quoteattr(label), render(fields))
+
+
+def repeated(label, repetitions):
+    return u'<PARAGRAFO etichetta=%s>%s</PARAGRAFO>' % (
+        quoteattr(label), u"".join(u'<RIPETIZIONE prog="%d">%s</RIPETIZIONE>' % (prog + 1, render(fields))
+                                   for prog, fields in enumerate(repetitions)))
+
+
+# fields with a None value are left out
+def render(fields):
+    return u"".join(u"<%s>%s</%s>" % (tag, escape(value), tag) for tag, value in fields if value is not None)
+
+
+class CatalogGenerator:
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+
+    def pick(self, vocabulary):
+        return VOCABULARIES[vocabulary](self.rng)
+
+    def maybe(self, probability, value):
+        return value if self.rng.random() < probability else None
+
+    def year(self):
+        return self.rng.randint(1860, 2010)
+
+    def entry(self, number):
+        rng = self.rng
+        pick = self.pick
+        maybe = self.maybe
+        entry_id = unicode(10000 + number)
+        box = pick('box')
+        author = pick('author')
+        subject = pick('subject')
+        begin = self.year()
+        paragraphs = [
+            paragraph(u"CODES", [(u"TSK", u"F"), (u"LIR", u"I"), (u"NCTR", u"08"), (u"NCTN", unicode(number)),
+                                 (u"ESC", u"Fondazione Federico Zeri - Università di Bologna")]),
+            paragraph(u"CLASSIFICATION", [
+                (u"UBFP", pick('collection')), (u"UBFS", pick('serie')), (u"UBFT", box),
+                (u"UBFN", u"%04d" % BOXES.index(box)), (u"UBFU", u"%s %d" % (author, rng.randint(1, 3))),
+                (u"UBFF", unicode(rng.randint(1, 40))), (u"INVN", unicode(40000 + number)),
+                (u"SERCD", entry_id), (u"SERCDOA", unicode(rng.randint(1, max(1, number // 3 + 1)))),
+                (u"UBFC", u"PI_%04d/%d/%d" % (BOXES.index(box), rng.randint(1, 9), rng.randint(1, 99)))]),
+            paragraph(u"COPYRIGHT", [(u"CRPD", u"PI_%04d/%d/%d" % (rng.randint(1, 999), rng.randint(1, 9),
+                                                                  rng.randint(1, 99)))]),
+            paragraph(u"OWNERSHIP", [(u"CDGG", u"proprietà Ente pubblico non territoriale"),
+                                     (u"CDGS", pick('owner'))]),
+            paragraph(u"OBJECT", [
+                (u"OGTD", u"positivo"), (u"OGTB", u"m"), (u"OGTS", pick('format')), (u"QNTN", u"1"),
+                (u"MTX", pick('color')), (u"MTC", pick('material')), (u"MISU", pick('unit')),
+                (u"MISA", unicode(rng.randint(90, 400))), (u"MISL", unicode(rng.randint(60, 300))),
+                (u"MISD", maybe(0.05, unicode(rng.randint(60, 300)))), (u"MISO", maybe(0.7, u"supporto primario"))]),
+            paragraph(u"SUBJECT", [
+                (u"OGTD", u"dipinto"), (u"SGTI", subject), (u"SGLT", maybe(0.8, u"%s. %s" % (author, subject))),
+                (u"SGLA", maybe(0.5, u"%s - %s" % (author, subject))), (u"SGLL", maybe(0.2, subject)),
+                (u"SGLS", maybe(0.5, u"del catalogatore")), (u"FTAT", maybe(0.3, u"insieme"))]),
+            repeated(u"AUTHOR", [[
+                (u"AUTN", pick('author')), (u"AUTB", maybe(0.7, pick('school'))),
+                (u"AUTP", maybe(0.1, pick('author'))), (u"AUTI", maybe(0.2, pick('author') + u" (?)"))]
+                for _ in range(rng.choice((1, 1, 1, 2)))]),
+            paragraph(u"DATING", [
+                (u"DTZG", u"XX"), (u"DTSI", unicode(begin)), (u"DTSV", maybe(0.4, u"ca.")),
+                (u"DTSF", unicode(begin + rng.randint(0, 5))), (u"DTSL", maybe(0.4, u"ca.")),
+                (u"DTMM", maybe(0.6, u"iscrizione")), (u"DTMS", maybe(0.2, u"fotografia eseguita per la vendita"))]),
+            repeated(u"PHOTOGRAPHER", [[
+                (u"AUFN", pick('photographer')), (u"AUFA", maybe(0.3, u"Edizioni " + pick('photographer'))),
+                (u"AUFS", maybe(0.3, u"studio")), (u"AUFR", maybe(0.8, u"fotografo principale")),
+                (u"AUFM", maybe(0.6, u"timbro")), (u"AUFK", maybe(0.2, u"numero di inventario")),
+                (u"AUFI", maybe(0.1, u"The Art Institute of Chicago. Photograph Department"))]
+                for _ in range(rng.choice((1, 1, 2)))]),
+            repeated(u"PRODUCTION AND PUBLISHING", [[
+                (u"PDFN", maybe(0.3, u"Procacci, Michele")), (u"PDFB", pick('publisher')),
+                (u"PDFI", maybe(0.2, pick('publisher'))), (u"PDFL", pick('place')),
+                (u"PDFD", unicode(self.year())), (u"PDFR", maybe(0.5, u"committente")),
+                (u"PDFM", maybe(0.4, u"timbro")), (u"PDFK", maybe(0.4, unicode(rng.randint(1, 9999)))),
+                (u"EDIT", maybe(0.1, u"Tilli - Perugia")), (u"SFIT", maybe(0.1, u"L'Umbria Illustrata"))]]),
+            paragraph(u"PLACE AND DATE OF THE SHOT", [
+                (u"LRCS", maybe(0.6, pick('country'))), (u"LRCC", maybe(0.6, pick('place'))),
+                (u"LRA", maybe(0.1, pick('place'))), (u"LRD", maybe(0.5, unicode(self.year()))),
+                (u"LRO", maybe(0.2, u"Asta %s %02d/%02d/%d" % (pick('publisher'), rng.randint(1, 28),
+                                                             rng.randint(1, 12), self.year())))]),
+            paragraph(u"RELATIONS WITH OTHER PHOTOGRAPHIC OBJECTS (NEGATIVE)", [
+                (u"ROFI", u"C %d" % rng.randint(1, 99999)), (u"ROFO", u"negativo"),
+                (u"ROFC", u"Bologna/ Fondazione Federico Zeri - Università di Bologna/ Fototeca Zeri"),
+                (u"ROFF", maybe(0.3, u"positivo"))]),
+            repeated(u"DIGITAL IMAGE", [[
+                (u"FTAN", u"\\%d\\%d\\%s_%d.jpg" % (number // 1000 * 1000, number // 100 * 100, entry_id, prog)),
+                (u"FTAP", u"fotografia digitale"), (u"FTAT", maybe(0.5, u"insieme")),
+                (u"FTAX", u"allegata"), (u"VERSO", maybe(0.5, u"Pubblico"))]
+                for prog in range(rng.choice((1, 1, 2)))]),
+            repeated(u"PROVENANCE", [[
+                (u"PRVS", pick('country')), (u"PRVP", maybe(0.5, pick('place'))), (u"PRVC", pick('place')),
+                (u"PRL", maybe(0.1, pick('place'))), (u"PRCM", maybe(0.4, u"Collezione privata")),
+                (u"PRCD", maybe(0.2, u"Università degli studi di Roma \"La Sapienza\"")),
+                (u"PRDI", maybe(0.5, u"%d/%02d/%02d" % (self.year(), rng.randint(1, 12), rng.randint(1, 28)))),
+                (u"PRDU", maybe(0.3, u"%d/ ca." % self.year()))]
+                for _ in range(rng.choice((1, 1, 2)))]),
+            paragraph(u"LOCATION", [
+                (u"PVCR", pick('region')), (u"PVCP", pick('district')), (u"PVCC", pick('place')),
+                (u"LDCN", u"Ex convento di S. Cristina"), (u"LDCU", u"piazzetta G. Morandi, 2"),
+                (u"LDCM", u"Fototeca Zeri"), (u"LDCS", maybe(0.1, u"Grandi Formati"))]),
+            paragraph(u"STATE OF PRESERVATION", [(u"STCC", pick('condition')), (u"STCS", maybe(0.4, pick('damage')))]),
+            paragraph(u"CATALOGUING", [
+                (u"CMPD", u"%02d/%02d/%d 0.00.00" % (rng.randint(1, 28), rng.randint(1, 12), rng.randint(1995, 2013))),
+                (u"CMPN", pick('cataloguer'))]),
+            paragraph(u"SUPERVISOR", [(u"FUR", u"Giudici C.")]),
+        ]
+        if rng.random() < 0.4:
+            paragraphs.append(repeated(u"UPDATING", [[
+                (u"AGGD", u"%02d/%02d/%d" % (rng.randint(1, 28), rng.randint(1, 12), rng.randint(2005, 2014))),
+                (u"AGGN", pick('cataloguer'))] for _ in range(rng.choice((1, 1, 2, 3)))]))
+        if rng.random() < 0.3:
+            paragraphs.append(paragraph(u"NOTES", [(u"OSS", u"Incollata su cartone delle stesse misure.")]))
+        if rng.random() < 0.05:
+            paragraphs.append(paragraph(u"RELATION TO OTHER OBJECTS", [
+                (u"OGTI", u"Collage di fotografie della predella di %s" % author), (u"RVEL", u"2")]))
+        return u'<SCHEDA intestazione=%s>%s</SCHEDA>\n' % (quoteattr(u"%s, %s" % (author, subject)),
+                                                            u"".join(paragraphs))
+
+    def write(self, out, entries):
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n<CATALOGO>\n')
+        for number in xrange(entries):
+            out.write(self.entry(number).encode('utf-8'))
+        out.write('</CATALOGO>\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Synthetic FZeri SCHEDA F catalog generator.')
+    parser.add_argument('-n', '--entries', type=int, default=1000, help='Number of SCHEDA entries')
+    parser.add_argument('-s', '--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('-o', '--output', dest="output_file", help='Output file (default: stdout)')
+    options = parser.parse_args()
+    out = open_output(options.output_file) if options.output_file else sys.stdout
+    CatalogGenerator(options.seed).write(out, options.entries)
+    if out is not sys.stdout:
+        out.close()
+
+if __name__ == "__main__":
+    main()
+    sys.exit(0)
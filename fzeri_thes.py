@@ -10,11 +10,22 @@ from rdflib import Literal, Namespace
 
 QUDT = Namespace("http://qudt.org/vocab/unit#")
 
+# FZeri unit (MISU) -> QUDT unit name
 unit_fzeri_to_qudt = {
-    'mm':   'Millimeters',
+    'mm': 'Millimeter',
+    'cm': 'Centimeter',
+    'm': 'Meter',
+    'in': 'Inch',
 }
 
+# every spelling of the units found in the catalog ("mm", "mm.", "MM", "Mm") -> QUDT unit
+qudt_units = {}
+for unit, name in unit_fzeri_to_qudt.iteritems():
+    for spelling in (unit, unit + '.'):
+        for variant in (spelling, spelling.upper(), spelling.capitalize()):
+            qudt_units[variant] = QUDT[name]
 
+
+# QUDT unit of a FZeri unit, None when the unit is unknown
 def fzeri_to_qudt(unit):
-    if unit in unit_fzeri_to_qudt:
-        return QUDT[unit_fzeri_to_qudt[unit]]
+    return qudt_units.get(unit.strip()) if unit else None
@@ -6,59 +6,293 @@ __license__ = 'ISC'
 __copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
 __docformat__ = 'restructuredtext en'
 
+# Streaming profiler of FZeri catalog exports.
+# Catalog files are read incrementally (one SCHEDA at a time), optionally one file
+# per process, and for every paragraph and field it records occurrence counts,
+# cardinality, repetitions, max lengths and, through bounded sketches, distinct
+# value counts (HyperLogLog) and the most frequent values (Misra-Gries), so memory
+# does not grow with the catalog size. Paragraphs the converter has no handler
+# for are flagged.
 
 import sys
+import json
+import math
+import argparse
+import multiprocessing
+from hashlib import sha1
+from collections import Counter
 from os.path import dirname, realpath
-try:
-    from lxml import etree
-except ImportError:
-    import xml.etree.ElementTree as etree
+from fzeri_schedaF_to_owl import iter_entries
+from fzeri_parser_schedaF import FZeriParserSchedaF
+from fzeri_compress import open_input
 
 # define default source
-DEFAULT_SOURCES = {
+DEFAULT_SOURCES = [
     # dirname(realpath(__file__)) + "/catalog/fzeri_F_2014_03_11_163504_test.xml",
     dirname(realpath(__file__)) + "/catalog/fzeri_F_2014_03_11_163504.xml",
     dirname(realpath(__file__)) + "/catalog/fzeri_F_2014_03_11_164432.xml",
-}
-out = {}
+]
+# HyperLogLog registers are 2 ** HLL_PRECISION (about 1.6% standard error)
+HLL_PRECISION = 12
+# values tracked by each Misra-Gries summary, and how many of them are reported
+TOP_CAPACITY = 64
+TOP_REPORTED = 5
 
 
-def parse(xmlentry):
-    # flatten XML to dict
-    for child in xmlentry.findall("PARAGRAFO"):
-        if len(child):   # paragraph does contain at least one subelement
+# Distinct values estimate in 2 ** precision bytes
+class HyperLogLog:
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        h = int(sha1(value).hexdigest()[:16], 16)
+        width = 64 - self.precision
+        index = h >> width
+        rank = width - (h & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        registers = self.registers
+        for index, rank in enumerate(other.registers):
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def count(self):
+        m = len(self.registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count("\0")
+        if estimate <= 2.5 * m and zeros:
+            # small cardinalities: linear counting
+            estimate = m * math.log(float(m) / zeros)
+        return int(round(estimate))
+
+
+# Most frequent values (Misra-Gries summary): counts are lower bounds, exact for
+# fields with at most capacity distinct values
+class TopValues:
+    def __init__(self, capacity=TOP_CAPACITY):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, value):
+        counts = self.counts
+        if value in counts:
+            counts[value] += 1
+        elif len(counts) < self.capacity:
+            counts[value] = 1
+        else:
+            for key in counts.keys():
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+
+    def merge(self, other):
+        counts = self.counts
+        for value, count in other.counts.iteritems():
+            counts[value] = counts.get(value, 0) + count
+        if len(counts) > self.capacity:
+            cut = sorted(counts.itervalues(), reverse=True)[self.capacity]
+            for key in counts.keys():
+                counts[key] -= cut
+                if counts[key] <= 0:
+                    del counts[key]
+
+    def top(self, k=TOP_REPORTED):
+        return sorted(self.counts.iteritems(), key=lambda item: (-item[1], item[0]))[:k]
+
+
+class FieldStats:
+    def __init__(self):
+        self.occurrences = 0
+        # paragraph instances holding the field, and the most it appears in one
+        self.paragraphs = 0
+        self.max_per_paragraph = 0
+        self.empty = 0
+        self.max_length = 0
+        self.sample = None
+        self.distinct = HyperLogLog()
+        self.top = TopValues()
+
+    def add(self, text):
+        self.occurrences += 1
+        if text is None:
+            self.empty += 1
+            return
+        if self.sample is None:
+            self.sample = text
+        self.max_length = max(self.max_length, len(text))
+        value = text.encode('utf-8')
+        self.distinct.add(value)
+        self.top.add(text)
+
+    def merge(self, other):
+        self.occurrences += other.occurrences
+        self.paragraphs += other.paragraphs
+        self.max_per_paragraph = max(self.max_per_paragraph, other.max_per_paragraph)
+        self.empty += other.empty
+        self.max_length = max(self.max_length, other.max_length)
+        if self.sample is None:
+            self.sample = other.sample
+        self.distinct.merge(other.distinct)
+        self.top.merge(other.top)
+
+
+class ParagraphStats:
+    def __init__(self, label):
+        self.label = label
+        self.handled = FZeriParserSchedaF.handler_for(label) is not None
+        # entries holding the paragraph, paragraph instances (every repetition
+        # counting as one) and the most repetitions found in one entry
+        self.entries = 0
+        self.instances = 0
+        self.max_repetitions = 0
+        self.fields = {}
+
+    def add(self, element):
+        self.instances += 1
+        tags = Counter()
+        for node in element:
+            field = self.fields.get(node.tag)
+            if field is None:
+                field = self.fields[node.tag] = FieldStats()
+            field.add(node.text)
+            tags[node.tag] += 1
+        for tag, count in tags.iteritems():
+            field = self.fields[tag]
+            field.paragraphs += 1
+            field.max_per_paragraph = max(field.max_per_paragraph, count)
+
+    def merge(self, other):
+        self.entries += other.entries
+        self.instances += other.instances
+        self.max_repetitions = max(self.max_repetitions, other.max_repetitions)
+        for tag, field in other.fields.iteritems():
+            if tag in self.fields:
+                self.fields[tag].merge(field)
+            else:
+                self.fields[tag] = field
+
+
+class CatalogProfile:
+    def __init__(self):
+        self.entries = 0
+        # paragraph key (label, with "[r]" for repeated paragraphs) -> ParagraphStats
+        self.paragraphs = {}
+
+    def paragraph(self, key, label):
+        stats = self.paragraphs.get(key)
+        if stats is None:
+            stats = self.paragraphs[key] = ParagraphStats(label)
+        return stats
+
+    def add_entry(self, xmlentry):
+        self.entries += 1
+        repetitions = Counter()
+        for child in xmlentry.findall("PARAGRAFO"):
+            if not len(child):   # paragraph does not contain any subelement
+                continue
+            label = child.attrib["etichetta"]
             if child[0].tag == "RIPETIZIONE":
-                label = child.attrib["etichetta"] + "[r]"
-                if not label in out:
-                    out[label] = {}
+                stats = self.paragraph(label + "[r]", label)
                 for rep in child:
-                    for subchild in rep:
-                        if not subchild.tag in out[label]:
-                            out[label][subchild.tag] = {}
-                        out[label][subchild.tag] = subchild.text
+                    stats.add(rep)
+                    repetitions[stats] += 1
             else:
-                label = child.attrib["etichetta"]
-                if not label in out:
-                    out[label] = {}
-                for subchild in child:
-                    if not subchild.tag in out[child.attrib["etichetta"]]:
-                        out[child.attrib["etichetta"]][subchild.tag] = {}
-                    out[child.attrib["etichetta"]][subchild.tag] = subchild.text
+                stats = self.paragraph(label, label)
+                stats.add(child)
+                repetitions[stats] += 1
+        for stats, count in repetitions.iteritems():
+            stats.entries += 1
+            stats.max_repetitions = max(stats.max_repetitions, count)
+
+    def merge(self, other):
+        self.entries += other.entries
+        for key, stats in other.paragraphs.iteritems():
+            if key in self.paragraphs:
+                self.paragraphs[key].merge(stats)
+            else:
+                self.paragraphs[key] = stats
+
+    def summary(self):
+        paragraphs = []
+        for key in sorted(self.paragraphs):
+            stats = self.paragraphs[key]
+            fields = []
+            for tag in sorted(stats.fields):
+                field = stats.fields[tag]
+                fields.append({
+                    'field': tag,
+                    'occurrences': field.occurrences,
+                    'cardinality': [1 if field.paragraphs == stats.instances else 0, field.max_per_paragraph],
+                    'distinct': field.distinct.count(),
+                    'max_length': field.max_length,
+                    'empty': field.empty,
+                    'top': field.top.top(),
+                    'sample': field.sample,
+                })
+            paragraphs.append({
+                'paragraph': key,
+                'handled': stats.handled,
+                'entries': stats.entries,
+                'instances': stats.instances,
+                'max_repetitions': stats.max_repetitions,
+                'fields': fields,
+            })
+        return {'entries': self.entries, 'paragraphs': paragraphs}
+
+    def write_text(self, out):
+        summary = self.summary()
+        out.write("### %d entries\n" % summary['entries'])
+        for paragraph in summary['paragraphs']:
+            out.write(("\n%s  (entries %d, instances %d, max repetitions %d%s)" % (
+                paragraph['paragraph'], paragraph['entries'], paragraph['instances'],
+                paragraph['max_repetitions'], "" if paragraph['handled'] else ", NO HANDLER")).encode('utf-8'))
+            for field in paragraph['fields']:
+                out.write(("\n\t%s: occurrences %d, cardinality %d..%d, distinct ~%d, max length %d, empty %d" % (
+                    field['field'], field['occurrences'], field['cardinality'][0], field['cardinality'][1],
+                    field['distinct'], field['max_length'], field['empty'])).encode('utf-8'))
+                if field['top']:
+                    out.write(("\n\t\ttop: " + ", ".join(u"%s (%d)" % (value, count)
+                                                         for value, count in field['top'])).encode('utf-8'))
+        out.write("\n")
+
+
+def profile_file(source_file):
+    print "### SOURCING FILES " + source_file
+    profile = CatalogProfile()
+    with open_input(source_file) as source:
+        for xmlentry in iter_entries(source, True):
+            profile.add_entry(xmlentry)
+    return profile
 
 
 def main():
-    for the_file in DEFAULT_SOURCES:
-        print "### SOURCING FILES " + the_file
-        xml = etree.parse(the_file)
-        for xmlentry in xml.findall("SCHEDA"):
-            parse(xmlentry)
-    out_file = open("catalog_schema.txt", "w")
-    for x in out:
-        out_file.write("\n" + x)
-        for y in out[x]:
-            out_file.write("\n\t" + y + ': ' + out[x][y].encode('utf-8'))
-    out_file.close()
+    parser = argparse.ArgumentParser(description='FZeri catalog schema profiler.')
+    parser.add_argument('source_file', nargs='*', default=DEFAULT_SOURCES, help='FZeri catalog file(s) path')
+    parser.add_argument('-o', '--output', dest="output_file", default="catalog_schema.txt",
+                        help='Output file name')
+    parser.add_argument('-j', '--jobs', dest="jobs", type=int, default=1,
+                        help='Number of catalog files scanned in parallel')
+    parser.add_argument('--json', action="store_true", help='Write the profile as JSON')
+    options = parser.parse_args()
+    if options.jobs > 1:
+        pool = multiprocessing.Pool(options.jobs)
+        profiles = pool.map(profile_file, options.source_file, 1)
+        pool.close()
+        pool.join()
+    else:
+        profiles = map(profile_file, options.source_file)
+    profile = profiles[0]
+    for other in profiles[1:]:
+        profile.merge(other)
+    with open(options.output_file, "w") as out_file:
+        if options.json:
+            json.dump(profile.summary(), out_file, indent=2)
+        else:
+            profile.write_text(out_file)
 
 if __name__ == "__main__":
     main()
-    sys.exit(0)
\ No newline at end of file
+    sys.exit(0)
@@ -0,0 +1,53 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+# SCHEDA entries built field by field for the tests
+
+from xml.sax.saxutils import escape, quoteattr
+try:
+    from lxml import etree
+except ImportError:
+    import xml.etree.ElementTree as etree
+from fzeri_parser_schedaF import FZeriParserSchedaF
+
+
+# XML of a field, None text giving an empty element
+def field(tag, text):
+    return u"<%s/>" % tag if text is None else u"<%s>%s</%s>" % (tag, escape(text), tag)
+
+
+# XML of a SCHEDA (the parser needs its SERCDOA too). paragraphs are (label, fields)
+# pairs, fields being (tag, text) pairs, or a list of them per RIPETIZIONE for
+# repeated paragraphs.
+def scheda_xml(entry_id, oaentry_id="1", paragraphs=()):
+    classification = [("SERCD", entry_id)]
+    if oaentry_id is not None:
+        classification.append(("SERCDOA", oaentry_id))
+    xml = [u"<SCHEDA intestazione=%s>" % quoteattr(u"Entry %s" % entry_id)]
+    for label, fields in [("CLASSIFICATION", classification)] + list(paragraphs):
+        xml.append(u"<PARAGRAFO etichetta=%s>" % quoteattr(label))
+        if fields and isinstance(fields[0], list):
+            for prog, repetition in enumerate(fields, 1):
+                xml.append(u'<RIPETIZIONE prog="%d">%s</RIPETIZIONE>' % (
+                    prog, u"".join(field(tag, text) for tag, text in repetition)))
+        else:
+            xml.append(u"".join(field(tag, text) for tag, text in fields))
+        xml.append(u"</PARAGRAFO>")
+    xml.append(u"</SCHEDA>")
+    return u"".join(xml).encode('utf-8')
+
+
+def scheda(entry_id, oaentry_id="1", paragraphs=()):
+    return etree.fromstring(scheda_xml(entry_id, oaentry_id, paragraphs))
+
+
+# Triples of a SCHEDA, the shared ones included
+def parse_triples(xmlentry):
+    triples = set()
+    FZeriParserSchedaF(xmlentry, triples).parse()
+    return triples
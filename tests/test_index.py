@@ -0,0 +1,87 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+import os
+import shutil
+import tempfile
+import unittest
+from rdflib import Literal
+from rdflib.namespace import RDFS
+from fzeri_parser_schedaF import FZeriParserSchedaF, FZERI_OAENTRY
+from fzeri_sink import VocabularySink
+from fzeri_index import EntryIndex, index_record
+from fzeri_patch import PatchWriter
+from tests.fixtures import scheda
+
+ARTWORK = FZERI_OAENTRY["382/artwork"]
+
+
+class VocabularyTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "fzeri.idx")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def add_vocabulary(self, triples, create=False):
+        index = EntryIndex(self.path, create=create)
+        index.add_vocabulary(triples)
+        index.close()
+
+    # rows stored by a previous run are kept when a run only meets some of them
+    def test_merge(self):
+        self.add_vocabulary([(ARTWORK, RDFS.label, Literal(u"Madonna")), (ARTWORK, RDFS.comment, Literal(u"a"))],
+                            create=True)
+        self.add_vocabulary([(ARTWORK, RDFS.comment, Literal(u"b"))])
+        index = EntryIndex(self.path)
+        rows = index.vocabulary_rows(ARTWORK).splitlines()
+        index.close()
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(len([row for row in rows if '"Madonna"' in row]), 1)
+
+
+class PatchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "fzeri.idx")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    # Full run of two entries of the same schedaOA, its author being named author;
+    # with patch the run is compared with the previous one. Returns the patch rows.
+    def convert(self, author, patch=False):
+        writer = PatchWriter(os.path.join(self.directory, "fzeri.rdfp")) if patch else None
+        index = EntryIndex(self.path, create=not patch, patch=writer)
+        vocabulary = VocabularySink()
+        for entry_id in ("10000", "10001"):
+            triples = set()
+            entry = FZeriParserSchedaF(scheda(entry_id, "382", [("AUTHOR", [[("AUTN", author)]])]), triples,
+                                       vocabulary)
+            entry.parse()
+            index.add(index_record(entry, triples))
+        index.add_vocabulary(vocabulary.triples, complete=True)
+        index.close()
+        if writer is None:
+            return None
+        writer.close()
+        with open(os.path.join(self.directory, "fzeri.rdfp"), 'rb') as source:
+            return source.read().splitlines()
+
+    # the artwork author is shared: renaming it deletes the old label
+    def test_renamed_author(self):
+        self.convert(u"Girolamo di Benvenuto")
+        rows = self.convert(u"Renamed Author", patch=True)
+        self.assertTrue([row for row in rows if row.startswith("D ") and '"Girolamo di Benvenuto"' in row])
+        self.assertTrue([row for row in rows if row.startswith("A ") and '"Renamed Author"' in row])
+        self.assertFalse([row for row in rows if row.startswith("A ") and "Girolamo" in row])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+import unittest
+from rdflib import Literal, XSD
+from rdflib.namespace import RDFS
+from fzeri_parser_schedaF import FZeriParserSchedaF, DATES, TIME, CRM, FZERI_FENTRY, parse_dimension, inverse_axioms
+from tests.fixtures import scheda, parse_triples
+
+# paragraphs holding every date field, the dates being given by tag
+DATE_PARAGRAPHS = [
+    ("DATING", [("DTSI", "DTSI"), ("DTSF", "DTSF")]),
+    ("PROVENANCE", [[("PRDI", "PRDI"), ("PRDU", "PRDU")]]),
+    ("CATALOGUING", [("CMPD", "CMPD")]),
+    ("UPDATING", [[("AGGD", "AGGD")]]),
+]
+
+
+def date_paragraphs(dates):
+    paragraphs = []
+    for label, fields in DATE_PARAGRAPHS:
+        if isinstance(fields[0], list):
+            paragraphs.append((label, [[(tag, dates[tag]) for tag, _ in fields[0]]]))
+        else:
+            paragraphs.append((label, [(tag, dates[tag]) for tag, _ in fields]))
+    return paragraphs
+
+
+class DateTest(unittest.TestCase):
+    def test_normalize_empty(self):
+        self.assertIsNone(DATES.normalize(None))
+        self.assertIsNone(DATES.normalize(u""))
+        self.assertEqual(DATES.normalize(u"1947/ ca.")[0], Literal(u"1947", datatype=XSD.gYear))
+
+    def test_dates(self):
+        dates = dict((tag, u"1961") for tag in ("DTSI", "DTSF", "PRDI", "PRDU"))
+        dates.update(CMPD=u"10/10/2005 0.00.00", AGGD=u"09/10/2012")
+        triples = parse_triples(scheda("10000", paragraphs=date_paragraphs(dates)))
+        self.assertEqual(len([o for s, p, o in triples if p == TIME.inXSDgYear]), 4)
+        self.assertEqual(len([o for s, p, o in triples if p == CRM.P82_at_some_time_within]), 2)
+
+    # empty date fields are converted without instants nor typed values
+    def test_empty_dates(self):
+        dates = dict((tag, None) for tag in ("DTSI", "DTSF", "PRDI", "PRDU", "CMPD", "AGGD"))
+        triples = parse_triples(scheda("10000", paragraphs=date_paragraphs(dates)))
+        self.assertFalse([s for s, p, o in triples if o == TIME.Instant])
+        self.assertFalse([s for s, p, o in triples if p == CRM.P82_at_some_time_within])
+        # the rest of the paragraphs is still there
+        self.assertIn((FZERI_FENTRY["10000/cataloguing"], CRM.P94_created, FZERI_FENTRY["10000"]), triples)
+
+
+class DimensionTest(unittest.TestCase):
+    def test_measures(self):
+        paragraphs = [("OBJECT", [("MISA", u"240"), ("MISL", u"16,5 / 17"), ("MISU", u"mm")])]
+        triples = parse_triples(scheda("10000", paragraphs=paragraphs))
+        self.assertEqual([o for s, p, o in triples if p == CRM.P90_has_value], [Literal(u"240", datatype=XSD.decimal)])
+        self.assertEqual(len([o for s, p, o in triples if p == CRM.P90a_has_lower_value_limit]), 1)
+
+    # an empty measure keeps its dimension, without value nor label
+    def test_empty_measure(self):
+        self.assertIsNone(parse_dimension(None))
+        paragraphs = [("OBJECT", [("MISA", None), ("MISU", u"mm")])]
+        triples = parse_triples(scheda("10000", paragraphs=paragraphs))
+        dimensions = [s for s, p, o in triples if o == CRM.E54_Dimension]
+        self.assertEqual(len(dimensions), 1)
+        self.assertFalse([o for s, p, o in triples if s == dimensions[0] and p in (CRM.P90_has_value, RDFS.label)])
+
+
+# entry with properties of most of the pairs --canonical handles, the P14 pair of
+# the author, the photographer and the publisher included
+CANONICAL_PARAGRAPHS = [
+    ("AUTHOR", [[("AUTN", u"Raffaello Sanzio"), ("AUTR", u"pittore")]]),
+    ("OBJECT", [("MISA", u"240"), ("MISU", u"mm"), ("MTC", u"albumina")]),
+    ("DATING", [("DTSI", u"1880"), ("DTSF", u"1890")]),
+    ("PHOTOGRAPHER", [[("AUFN", u"Alinari"), ("AUFR", u"fotografo principale")]]),
+    ("PRODUCTION AND PUBLISHING", [[("PDFN", u"Brogi"), ("PDFB", u"Brogi"), ("PDFD", u"1890")]]),
+]
+
+
+class CanonicalTest(unittest.TestCase):
+    def parse_canonical(self, xmlentry):
+        FZeriParserSchedaF.canonical = True
+        try:
+            return parse_triples(xmlentry)
+        finally:
+            FZeriParserSchedaF.canonical = False
+
+    # the inverse axioms give back every triple --canonical leaves out
+    def test_inverse_axioms(self):
+        xmlentry = scheda("10000", paragraphs=CANONICAL_PARAGRAPHS)
+        triples = parse_triples(xmlentry)
+        canonical = self.parse_canonical(xmlentry)
+        self.assertEqual(len([p for s, p, o in triples if p == CRM.P14i_performed]), 3)
+        self.assertLess(len(canonical), len(triples))
+        derived = set(canonical)
+        for prop, _, inverse in inverse_axioms():
+            derived.update((o, inverse, s) for s, p, o in canonical if p == prop)
+        self.assertEqual(triples - derived, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+import time
+import unittest
+from fzeri_pipeline import Pipeline
+
+
+# converter stalling on the first task
+def stall_first(task):
+    if task == 0:
+        time.sleep(1)
+    return task * 2
+
+
+class PipelineTest(unittest.TestCase):
+    def test_results_in_task_order(self):
+        pipeline = Pipeline(stall_first, workers=3, queue_size=2)
+        self.assertEqual(list(pipeline.results(xrange(100))), [task * 2 for task in xrange(100)])
+
+    # while an entry stalls, the others converted meanwhile are bounded by the queue size
+    def test_stalled_task_bounds_held_back_results(self):
+        pipeline = Pipeline(stall_first, workers=2, queue_size=4)
+        self.assertEqual(list(pipeline.results(xrange(500))), [task * 2 for task in xrange(500)])
+        self.assertGreater(pipeline.max_reordered, 0)
+        self.assertLess(pipeline.max_reordered, pipeline.queue_size)
+        self.assertEqual(pipeline.metrics()['max_reordered'], pipeline.max_reordered)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+#!/usr/local/bin/python
+# -*- coding: utf-8 -*-
+
+__author__ = 'Ciro Mattia Gonano <ciromattia@gmail.com>'
+__license__ = 'ISC'
+__copyright__ = '2014, Ciro Mattia Gonano <ciromattia@gmail.com>'
+__docformat__ = 'restructuredtext en'
+
+import os
+import shutil
+import tempfile
+import unittest
+from fzeri_parser_schedaF import FZeriParserSchedaF
+from rdflib import Graph
+from fzeri_sink import NTriplesSink, VocabularySink, SingleEntryWriter
+from tests.fixtures import scheda, parse_triples
+
+AUTHOR = ("AUTHOR", [[("AUTN", u"Girolamo di Benvenuto"), ("AUTB", u"Scuola senese")]])
+
+
+class NTriplesSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def convert(self, entries):
+        path = os.path.join(self.directory, "out.nt")
+        sink = NTriplesSink(path)
+        vocabulary = VocabularySink()
+        for xmlentry in entries:
+            entry = FZeriParserSchedaF(xmlentry, sink, vocabulary)
+            entry.parse()
+            sink.commit(entry)
+        vocabulary.write_to(sink)
+        sink.close()
+        with open(path, 'rb') as source:
+            return [row for row in source.read().splitlines() if row]
+
+    # the artwork of a schedaOA, and its author, are written once for all its entries
+    def test_shared_artwork_rows_written_once(self):
+        entries = [scheda(entry_id, "382", [AUTHOR]) for entry_id in ("10000", "10001", "10002")]
+        rows = self.convert(entries)
+        self.assertEqual(len(rows), len(set(rows)))
+        author = "<http://fe.fondazionezeri.unibo.it/catalogo/schedaOA/382/artwork/production/1/author>"
+        self.assertEqual(len([row for row in rows if row.startswith(author)]), 4)
+
+    def test_same_triples_as_graph(self):
+        entries = [scheda(entry_id, "382", [AUTHOR]) for entry_id in ("10000", "10001")]
+        triples = set()
+        for xmlentry in entries:
+            triples.update(parse_triples(xmlentry))
+        self.assertEqual(len(self.convert(entries)), len(triples))
+
+
+
+class SingleEntryWriterTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, entry_ids, shard_depth=0, prune=True):
+        writer = SingleEntryWriter(self.directory, "nt", ".nt", Graph, shard_depth=shard_depth, prune=prune)
+        for entry_id in entry_ids:
+            graph = writer.new_graph()
+            graph.addN(triple + (graph,) for triple in parse_triples(scheda(entry_id)))
+            writer.write(entry_id, graph)
+        writer.close()
+
+    def files(self):
+        return sorted(os.path.relpath(os.path.join(directory, name), self.directory)
+                      for directory, _, names in os.walk(self.directory) for name in names)
+
+    # a full run leaves only its own entry files, whatever the previous layout
+    def test_prune(self):
+        self.write(["10000", "10001"], shard_depth=1)
+        open(os.path.join(self.directory, "README"), "w").close()
+        self.write(["10001", "10002"])
+        self.assertEqual(self.files(), ["10001.nt", "10002.nt", "README"])
+
+    def test_no_prune(self):
+        self.write(["10000"])
+        self.write(["10001"], prune=False)
+        self.assertEqual(self.files(), ["10000.nt", "10001.nt"])
+
+
+if __name__ == '__main__':
+    unittest.main()